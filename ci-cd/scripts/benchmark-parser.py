@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Tosca Results Parser Benchmark
+Times TestCase extraction, XML backends and the parser stages on synthetic
+Tosca exports
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import multiprocessing
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def load_script(name: str, filename: str):
+    """Import a sibling script whose file name is not importable by name"""
+    path = Path(__file__).with_name(filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+parser_module = load_script("parse_results", "parse-results.py")
+generator_module = load_script("generate_results", "generate-results.py")
+
+# Synthetic export shape and parser options of each stage benchmark scenario
+SUITE_SCENARIOS = {
+    "baseline": {},
+    "streaming": {"parser": {"streaming": True}},
+    "multi-file": {"generator": {"files": 16}},
+    "deep-steps": {"generator": {"depth": 6}},
+    "rich-failures": {
+        "generator": {"custom_fields": 12, "screenshots": 4, "error_size": 2048}
+    },
+}
+
+MB = 1024 * 1024
+
+
+def multi_scan_convert(parser, elements) -> List[Dict]:
+    """Reference extraction: one ".//" descendant search per record field"""
+    test_cases = []
+
+    for test_case in elements:
+        result_elem = test_case.find(".//Result")
+        status = None
+        if result_elem is not None:
+            status = parser_module.RESULT_STATUSES.get(
+                result_elem.get("Status", "").lower()
+            )
+        if status is None:
+            verification = test_case.find(".//VerificationStatus")
+            text = verification.text if verification is not None else None
+            status = "Passed" if text and "pass" in text.lower() else "Failed"
+
+        error_message = ""
+        for tag in parser_module.ERROR_TAGS:
+            elem = test_case.find(f".//{tag}")
+            if elem is not None and elem.text:
+                error_message = elem.text.strip()
+                break
+        else:
+            verification = test_case.find(".//VerificationResult")
+            if verification is not None and verification.get("Status") == "Failed":
+                error_message = verification.get("Message", "Verification failed")
+
+        xray_test_key = ""
+        custom_fields = test_case.find(".//CustomFields")
+        if custom_fields is not None:
+            for field in custom_fields.findall(".//Field"):
+                if field.get("Name") == "JIRA_Test_Key":
+                    xray_test_key = field.get("Value", "")
+                    break
+
+        test_cases.append(
+            {
+                "name": test_case.get("Name", "Unknown Test"),
+                "status": status,
+                "execution_time": test_case.get("ExecutionTime", "N/A"),
+                "start_time": test_case.get("StartTime", ""),
+                "end_time": test_case.get("EndTime", ""),
+                "duration": parser._calculate_test_duration(test_case),
+                "error_message": error_message,
+                "screenshots": [
+                    s.get("Path")
+                    for s in test_case.findall(".//Screenshot")
+                    if s.get("Path")
+                ],
+                "module": test_case.get("Module", "N/A"),
+                "suite": test_case.get("Suite", "N/A"),
+                "test_case_id": test_case.get("ID", ""),
+                "xray_test_key": xray_test_key,
+                "critical": parser._is_critical_test(test_case),
+            }
+        )
+
+    return test_cases
+
+
+# Edge cases both XML backends must turn into byte-identical JSON
+PARITY_FIXTURES = {
+    "nested.xml": """<ExecutionResults>
+  <TestCase Name="Outer" ID="1"><Result Status="Failed"/>
+    <TestCase Name="Inner" ID="2"><Result Status="Passed"/><Duration>9</Duration>
+    </TestCase>
+    <Error>outer failed</Error>
+  </TestCase>
+  <Duration>00:01:30</Duration>
+</ExecutionResults>""",
+    "root-testcase.xml": """<TestCase Name="Root" Tags="Smoke">
+  <TestCase Name="Child"><VerificationStatus>PASS</VerificationStatus></TestCase>
+</TestCase>""",
+    "comments.xml": """<?xml version="1.0"?>
+<?tosca-export version="16"?>
+<ExecutionResults><!-- agent 1 -->
+  <TestCase Name="Commented"><!-- before result --><?pi data?>
+    <Result Status="Blocked"/><Screenshot Path=""/><Screenshot Path="a.png"/>
+  </TestCase>
+</ExecutionResults>""",
+    "text.xml": """<?xml version="1.0" encoding="utf-8"?>
+<ExecutionResults>
+  <TestCase Name="Entities &amp; &#252;nicode" StartTime="2024-01-01T10:00:00Z"
+            EndTime="2024-01-01T10:02:05Z" ExecutionTime="12.5">
+    <ErrorMessage></ErrorMessage>
+    <Error><![CDATA[  <b>raw</b> & markup  ]]></Error>
+    <CustomFields><Group><Field Name="JIRA_Test_Key"/></Group></CustomFields>
+  </TestCase>
+  <TestCase Name="Verification">
+    <VerificationResult Status="Failed"/>
+    <CustomFields><Field Name="JIRA_Test_Key" Value="BANK-7"/></CustomFields>
+    <CustomFields><Field Name="JIRA_Test_Key" Value="BANK-8"/></CustomFields>
+  </TestCase>
+</ExecutionResults>""",
+    "malformed.xml": "<ExecutionResults><TestCase Name='cut'>",
+}
+
+
+def available_backends() -> List[str]:
+    """Backends that can run in this environment"""
+    names = ["stdlib"]
+    if parser_module.lxml_etree is not None:
+        names.append("lxml")
+    return names
+
+
+def parse_to_json(results_dir: Path, backend: str, streaming: bool):
+    """Parse a results directory and return (JSON bytes, elapsed seconds)"""
+    results_parser = parser_module.ToscaResultsParser(
+        results_dir, streaming=streaming, backend=backend
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        results = results_parser.parse_xml_results()
+        elapsed = time.perf_counter() - started
+
+    results["execution_date"] = "fixed"
+    output = json.dumps(results, indent=2)
+    return output.encode("utf-8"), elapsed
+
+
+def check_backend_parity(results_dir: Path) -> bool:
+    """Compare every backend and mode against stdlib DOM parsing"""
+    expected, _ = parse_to_json(results_dir, "stdlib", streaming=False)
+    identical = True
+
+    for backend in available_backends():
+        for streaming in (False, True):
+            output, _ = parse_to_json(results_dir, backend, streaming)
+            if output != expected:
+                mode = "streaming" if streaming else "dom"
+                print(f"❌ {backend}/{mode} output differs from stdlib/dom")
+                identical = False
+
+    return identical
+
+
+def time_extraction(convert: Callable, root: ET.Element, repeat: int):
+    """Best wall time of converting every TestCase under root"""
+    best = None
+    records = None
+
+    for _ in range(repeat):
+        test_cases = root.findall(".//TestCase")
+        started = time.perf_counter()
+        records = convert(test_cases)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, records
+
+
+def retained_record_memory(export: Path, convert: Callable) -> int:
+    """Bytes still held by converted records once the XML tree is released"""
+    gc.collect()
+    tracemalloc.start()
+
+    root = ET.parse(export).getroot()
+    records = convert(root.findall(".//TestCase"))
+    del root
+    gc.collect()
+
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return retained
+
+
+def reset_peak_rss() -> bool:
+    """Restart peak RSS tracking for this process, False if unsupported"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, None if unknown"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def time_stage(
+    run: Callable, repeat: int, setup: Optional[Callable] = None
+) -> Tuple[float, Optional[int]]:
+    """Best wall time and highest peak RSS of repeated calls to run"""
+    best = None
+    peak = None
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        reset_peak_rss()
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        rss = peak_rss()
+        if rss is not None:
+            peak = rss if peak is None else max(peak, rss)
+
+    return best, peak
+
+
+def stage_metrics(
+    elapsed: float, peak: Optional[int], tests: int, size_mb: Optional[float]
+) -> Dict:
+    return {
+        "seconds": round(elapsed, 6),
+        "tests_per_s": round(tests / elapsed, 1) if elapsed else None,
+        "mb_per_s": round(size_mb / elapsed, 2) if size_mb and elapsed else None,
+        "peak_rss_mb": round(peak / MB, 1) if peak is not None else None,
+    }
+
+
+def run_stage_benchmarks(results_dir: str, options: Dict, repeat: int) -> Dict:
+    """Time parse_xml_results, _calculate_summary and save_results.
+
+    Runs in a fresh process per scenario, so peak RSS is not inflated by
+    memory an earlier scenario left behind.
+    """
+    results_dir = Path(results_dir)
+    input_mb = sum(f.stat().st_size for f in results_dir.glob("**/*.xml")) / MB
+    output_file = results_dir.parent / "results.json"
+    state = {}
+
+    def parse():
+        state["parser"] = parser_module.ToscaResultsParser(results_dir, **options)
+        state["parser"].parse_records()
+
+    def reset_summary():
+        for key in ("total", "passed", "failed", "skipped", "blocked"):
+            state["parser"].summary[key] = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse_time, parse_peak = time_stage(parse, repeat, setup=state.clear)
+        tests = state["parser"].summary["total"]
+
+        summary_time, summary_peak = time_stage(
+            lambda: state["parser"]._calculate_summary(timedelta()),
+            repeat,
+            setup=reset_summary,
+        )
+        save_time, save_peak = time_stage(
+            lambda: state["parser"].save_results(str(output_file)), repeat
+        )
+
+    output_mb = output_file.stat().st_size / MB
+    return {
+        "tests": tests,
+        "input_mb": round(input_mb, 2),
+        "output_mb": round(output_mb, 2),
+        "stages": {
+            "parse_xml_results": stage_metrics(parse_time, parse_peak, tests, input_mb),
+            "_calculate_summary": stage_metrics(
+                summary_time, summary_peak, tests, None
+            ),
+            "save_results": stage_metrics(save_time, save_peak, tests, output_mb),
+        },
+    }
+
+
+def run_suite(args) -> Dict:
+    """Run the stage benchmarks for every selected scenario"""
+    backend = parser_module.get_backend(args.backend).name
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": backend,
+        "tests": args.tests,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "peak_rss_scope": "stage" if reset_peak_rss() else "process",
+        "scenarios": {},
+    }
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.scenario or list(SUITE_SCENARIOS):
+            scenario = SUITE_SCENARIOS[name]
+            results_dir = Path(tmp_dir) / name / "results"
+            generator_options = scenario.get("generator", {})
+            generator_module.write_synthetic_results(
+                results_dir, args.tests, seed=args.seed, **generator_options
+            )
+            options = {"backend": backend, **scenario.get("parser", {})}
+
+            print(f"⏱️ Benchmarking scenario: {name}")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(
+                    run_stage_benchmarks, str(results_dir), options, args.repeat
+                ).result()
+
+            result["generator"] = generator_options
+            result["parser"] = scenario.get("parser", {})
+            report["scenarios"][name] = result
+            shutil.rmtree(results_dir.parent)
+
+    return report
+
+
+def print_suite_report(report: Dict, baseline: Optional[Dict] = None):
+    """Print stage metrics, with the change against a baseline report if given"""
+    print("\n" + "=" * 60)
+    print(
+        f"  PARSER STAGE BENCHMARK ({report['backend']}, "
+        f"best of {report['repeat']})"
+    )
+    print("=" * 60)
+
+    baseline_scenarios = (baseline or {}).get("scenarios", {})
+    for name, scenario in report["scenarios"].items():
+        print(
+            f"{name}: {scenario['tests']:,} tests, {scenario['input_mb']:.1f} MB in, "
+            f"{scenario['output_mb']:.1f} MB out"
+        )
+        baseline_stages = baseline_scenarios.get(name, {}).get("stages", {})
+        for stage, metrics in scenario["stages"].items():
+            line = (
+                f"  {stage:<20}{metrics['seconds']:.3f}s "
+                f"({metrics['tests_per_s'] or 0:,.0f} tests/s"
+            )
+            if metrics["mb_per_s"] is not None:
+                line += f", {metrics['mb_per_s']:,.1f} MB/s"
+            line += ")"
+            if metrics["peak_rss_mb"] is not None:
+                line += f" peak {metrics['peak_rss_mb']:,.1f} MB"
+            previous = baseline_stages.get(stage)
+            if previous and previous.get("seconds"):
+                change = metrics["seconds"] / previous["seconds"] - 1
+                line += f" [{change:+.1%} time]"
+            print(line)
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Tosca results parsing")
+    parser.add_argument(
+        "--tests", type=int, default=20000, help="TestCases in the synthetic export"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions")
+    parser.add_argument("--seed", type=int, default=42, help="Generator seed")
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="Only check that all XML backends produce byte-identical JSON",
+    )
+    parser.add_argument(
+        "--suite",
+        action="store_true",
+        help="Benchmark parse_xml_results, _calculate_summary and save_results "
+        "across synthetic export scenarios",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SUITE_SCENARIOS),
+        help="Suite scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--backend",
+        default="auto",
+        choices=["auto", *parser_module.PARSER_BACKENDS],
+        help="XML parser backend for the suite",
+    )
+    parser.add_argument(
+        "--json-output", help="Write the suite results to this JSON file"
+    )
+    parser.add_argument(
+        "--baseline", help="Suite JSON from an earlier run to compare against"
+    )
+
+    args = parser.parse_args()
+
+    if args.suite:
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+
+        report = run_suite(args)
+        print_suite_report(report, baseline)
+
+        if args.json_output:
+            with open(args.json_output, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print(f"✅ Benchmark results saved to: {args.json_output}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixtures_dir = Path(tmp_dir) / "fixtures"
+        fixtures_dir.mkdir()
+        for name, content in PARITY_FIXTURES.items():
+            (fixtures_dir / name).write_text(content, encoding="utf-8")
+
+        export_dir = Path(tmp_dir) / "export"
+        export_dir.mkdir()
+        export = export_dir / "synthetic-results.xml"
+        generator_module.write_synthetic_export(export, args.tests, args.seed)
+        size_mb = export.stat().st_size / (1024 * 1024)
+
+        print(f"🔍 Checking parity of backends: {', '.join(available_backends())}")
+        if not check_backend_parity(fixtures_dir) or not check_backend_parity(
+            export_dir
+        ):
+            sys.exit(1)
+        print("✅ All backends produce byte-identical JSON")
+
+        if args.parity:
+            return
+
+        print(f"📄 Synthetic export: {args.tests} test cases, {size_mb:.1f} MB")
+
+        backend_times = {}
+        for backend in available_backends():
+            for streaming in (False, True):
+                mode = "streaming" if streaming else "dom"
+                backend_times[f"{backend}/{mode}"] = min(
+                    parse_to_json(export_dir, backend, streaming)[1]
+                    for _ in range(args.repeat)
+                )
+
+        root = ET.parse(export).getroot()
+        results_parser = parser_module.ToscaResultsParser(tmp_dir, backend="stdlib")
+
+        dict_memory = retained_record_memory(
+            export, lambda elements: multi_scan_convert(results_parser, elements)
+        )
+        slotted_memory = retained_record_memory(
+            export, results_parser._convert_test_cases
+        )
+
+    results_parser = parser_module.ToscaResultsParser(tmp_dir, backend="stdlib")
+
+    single_time, single_records = time_extraction(
+        results_parser._convert_test_cases, root, args.repeat
+    )
+    multi_time, multi_records = time_extraction(
+        lambda elements: multi_scan_convert(results_parser, elements),
+        root,
+        args.repeat,
+    )
+
+    if [test.to_dict() for test in single_records] != multi_records:
+        print("❌ Single-pass and multi-scan extraction produced different records")
+        sys.exit(1)
+
+    print("\n" + "=" * 60)
+    print("  TESTCASE EXTRACTION BENCHMARK")
+    print("=" * 60)
+    for label, elapsed in [("Multi-scan:", multi_time), ("Single-pass:", single_time)]:
+        print(f"{label:<20}{elapsed:.3f}s ({args.tests / elapsed:,.0f} tests/s)")
+    print(f"Speedup:            {multi_time / single_time:.2f}x")
+    print("=" * 60)
+    print("  BACKEND BENCHMARK (parse_xml_results)")
+    print("=" * 60)
+    for label, elapsed in backend_times.items():
+        print(f"{label:<20}{elapsed:.3f}s ({size_mb / elapsed:,.1f} MB/s)")
+    print("=" * 60)
+    print("  RECORD MEMORY BENCHMARK")
+    print("=" * 60)
+    memory = [("Dict records:", dict_memory), ("TestResult:", slotted_memory)]
+    for label, retained in memory:
+        per_test = retained / args.tests
+        print(f"{label:<20}{retained / 1024 / 1024:.1f} MB ({per_test:.0f} B/test)")
+    print(f"Reduction:          {1 - slotted_memory / dict_memory:.0%}")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Tosca Publishing Load Test
+Publishes synthetic result sets to an in-process mock of JIRA/Xray and qTest
+and reports request rate, end-to-end publish time and tail latencies
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+INTEGRATION_DIR = ROOT_DIR / "integration-scripts"
+
+# The integration scripts import their helper modules by plain name
+sys.path.insert(0, str(INTEGRATION_DIR))
+
+
+def load_script(name: str, path: Path):
+    """Import a script whose file name is not importable by name"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+mock_module = load_script("mock_trackers", Path(__file__).with_name("mock-trackers.py"))
+qtest_module = load_script(
+    "qtest_integration", INTEGRATION_DIR / "qtest-integration.py"
+)
+jira_module = load_script(
+    "jira_xray_integration", INTEGRATION_DIR / "jira-xray-integration.py"
+)
+
+from attachment_uploads import AttachmentCache, AttachmentUploader
+from http_session import DEFAULT_POOL_SIZE, create_session
+from request_scheduler import DEFAULT_MAX_RETRIES
+
+STATUSES = ["Passed", "Passed", "Passed", "Failed", "Skipped", "Blocked"]
+
+TARGETS = ("jira", "qtest")
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+def synthetic_results(test_count: int, seed: int = 42, screenshot: str = "") -> Dict:
+    """Parsed-results document with test_count deterministic test records"""
+    rng = random.Random(seed)
+    tests = []
+    for idx in range(test_count):
+        status = rng.choice(STATUSES)
+        failed = status == "Failed"
+        tests.append(
+            {
+                "name": f"TC_{idx:06d}",
+                "status": status,
+                "execution_time": "90",
+                "start_time": "2024-01-01T10:00:00Z",
+                "end_time": "2024-01-01T10:01:30Z",
+                "duration": 90,
+                "error_message": (
+                    f"Verification of Value_1 failed in step {rng.randint(0, 4)}"
+                    if failed
+                    else ""
+                ),
+                "screenshots": [screenshot] if failed and screenshot else [],
+                "module": f"Module_{idx % 25}",
+                "suite": "Regression",
+                "test_case_id": str(100000 + idx),
+                "xray_test_key": f"BANK-T{idx}",
+                "critical": idx % 10 == 0,
+            }
+        )
+
+    counts = Counter(test["status"].lower() for test in tests)
+    return {
+        "execution_date": "2024-01-01T10:00:00",
+        "total": test_count,
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "skipped": counts["skipped"],
+        "blocked": counts["blocked"],
+        "passRate": round(counts["passed"] / test_count * 100, 2) if test_count else 0,
+        "duration": "2:15:30",
+        "test_results": tests,
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def build_publisher(target: str, server, session, args, label: str) -> Callable:
+    """Callable publishing a results document to one mock tracker"""
+    uploader = AttachmentUploader(
+        session, AttachmentCache(), max_workers=args.upload_workers
+    )
+    if target == "jira":
+        jira = jira_module.JiraXrayIntegration(
+            server.url,
+            "load-test",
+            "load-test",
+            "BANK",
+            max_workers=args.concurrency,
+            session=session,
+            bulk=args.jira_bulk,
+            uploader=uploader,
+        )
+        return lambda results: jira.process_results(results, label)
+
+    qtest = qtest_module.QTestIntegration(
+        f"{server.url}/api/v3",
+        "load-test",
+        "1",
+        session=session,
+        batch=args.qtest_batch,
+        batch_size=args.qtest_batch_size,
+        max_in_flight=args.concurrency,
+        uploader=uploader,
+    )
+    return lambda results: qtest.publish_results(results, f"Load test {label}")
+
+
+def run_load_test(target: str, results: Dict, server, args) -> Dict:
+    """Publish results to one mock tracker and measure every HTTP exchange"""
+    server.trackers.reset()
+    latencies = []
+    statuses = Counter()
+
+    def record(response, *_args, **_kwargs):
+        # Called for every attempt, including throttled ones that are retried.
+        # elapsed stops at the headers; hooks run before the body is read.
+        started = time.perf_counter()
+        response.content
+        elapsed = response.elapsed.total_seconds() + time.perf_counter() - started
+        latencies.append(elapsed * 1000)
+        statuses[response.status_code] += 1
+
+    session = create_session(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    )
+    session.hooks["response"].append(record)
+    publish = build_publisher(target, server, session, args, str(results["total"]))
+
+    # Per-test progress lines would dominate the run; only the numbers matter
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        success = publish(results)
+        elapsed = time.perf_counter() - started
+    session.close()
+
+    latencies.sort()
+    requests_sent = len(latencies)
+    return {
+        "target": target,
+        "tests": results["total"],
+        "success": bool(success),
+        "seconds": round(elapsed, 3),
+        "tests_per_s": round(results["total"] / elapsed, 1),
+        "requests": requests_sent,
+        "requests_per_s": round(requests_sent / elapsed, 1),
+        "responses": {str(code): n for code, n in sorted(statuses.items())},
+        "latency_ms": {
+            **{
+                f"p{pct}": round(percentile(latencies, pct), 2)
+                for pct in LATENCY_PERCENTILES
+            },
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "tracker": server.trackers.summary(),
+    }
+
+
+def print_report(report: Dict):
+    server = report["server"]
+    print("\n" + "=" * 60)
+    print(
+        f"  PUBLISHING LOAD TEST (latency {server['latency_ms']:g}"
+        f"±{server['jitter_ms']:g} ms, errors {server['error_rate']:.1%}, "
+        f"429s {server['throttle_rate']:.1%})"
+    )
+    print("=" * 60)
+    for run in report["runs"]:
+        latency = run["latency_ms"]
+        print(
+            f"{run['target']:<6}{run['tests']:>7,} tests  {run['seconds']:>8.2f}s  "
+            f"{run['requests']:>7,} req  {run['requests_per_s']:>8,.1f} req/s"
+        )
+        print(
+            f"      latency p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+            f"p99 {latency['p99']:.1f}  max {latency['max']:.1f} ms  "
+            f"responses {run['responses']}"
+        )
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test JIRA/Xray and qTest publishing against mock trackers"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,50000",
+        help="Comma-separated result set sizes to publish",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        choices=TARGETS,
+        help="Tracker to publish to (repeatable, default: both)",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=10.0, help="Mock server delay per request"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=5.0, help="Random +/- spread of the delay"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 500",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=0.1,
+        help="Retry-After seconds sent with 429 responses",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="JIRA workers and qTest submissions in flight",
+    )
+    parser.add_argument(
+        "--jira-bulk",
+        action="store_true",
+        help="Import Xray statuses through the bulk execution import endpoint",
+    )
+    parser.add_argument(
+        "--qtest-batch",
+        action="store_true",
+        help="Submit qTest test runs through batch auto-test-log jobs",
+    )
+    parser.add_argument(
+        "--qtest-batch-size",
+        type=int,
+        default=qtest_module.QTEST_BATCH_SIZE,
+        help="Test logs per batch submission (with --qtest-batch)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Keep-alive connections per host",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=None,
+        help="Maximum requests per second per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Retries for throttled (429/503) requests",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=4,
+        help="Parallel attachment uploads per issue or test run",
+    )
+    parser.add_argument(
+        "--screenshot-kb",
+        type=int,
+        default=0,
+        help="Attach a screenshot of this size to every failed test (0 = none)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Data and fault seed")
+    parser.add_argument("--json-output", help="Write the results to this JSON file")
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    server_options = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "retry_after": args.retry_after,
+    }
+    report = {"server": server_options, "concurrency": args.concurrency, "runs": []}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        screenshot = ""
+        if args.screenshot_kb:
+            screenshot = str(Path(tmp_dir) / "screenshot.png")
+            with open(screenshot, "wb") as f:
+                f.write(random.Random(args.seed).randbytes(args.screenshot_kb * 1024))
+
+        with mock_module.MockTrackerServer(seed=args.seed, **server_options) as server:
+            for size in sizes:
+                results = synthetic_results(size, args.seed, screenshot)
+                for target in args.target or TARGETS:
+                    print(f"⏱️ Publishing {size:,} results to {target}...")
+                    report["runs"].append(run_load_test(target, results, server, args))
+
+    print_report(report)
+
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✅ Load test results saved to: {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
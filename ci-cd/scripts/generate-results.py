@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Synthetic Tosca Results Generator
+Writes deterministic Tosca-like XML result exports for benchmarks and load tests
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List
+
+STATUSES = ["Passed", "Passed", "Passed", "Failed", "Skipped", "Blocked"]
+
+# Frames appended to failure messages when a larger error text is requested
+STACK_FRAMES = [
+    "at Tricentis.Automation.Engines.{module}.Verify(Step_{step})",
+    "at Tricentis.Automation.Execution.TestStepRunner.Run(Value_{value})",
+    "at Tricentis.Automation.Execution.ExecutionListRunner.Execute({test})",
+]
+
+
+def write_synthetic_export(
+    output_file: Path,
+    test_count: int,
+    seed: int = 42,
+    first_index: int = 0,
+    depth: int = 1,
+    custom_fields: int = 1,
+    screenshots: int = 1,
+    error_size: int = 0,
+):
+    """Write a Tosca-like result export with deep TestCase subtrees.
+
+    depth nests the test steps of every TestCase in depth - 1 TestStepFolder
+    levels, custom_fields adds fields next to JIRA_Test_Key, screenshots and
+    error_size (characters) shape the payload of failed tests. The same
+    arguments always produce the same file.
+    """
+    rng = random.Random(seed)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<ExecutionResults>\n')
+        f.write("  <Duration>02:15:30</Duration>\n  <ExecutionEntries>\n")
+
+        for idx in range(first_index, first_index + test_count):
+            status = rng.choice(STATUSES)
+            f.write(
+                f'    <TestCase Name="TC_{idx:06d}" ID="TOSCA-{idx}" '
+                f'Module="Module_{idx % 25}" Suite="Regression" '
+                f'StartTime="2024-01-01T10:00:00Z" EndTime="2024-01-01T10:01:30Z" '
+                f'ExecutionTime="90" Priority="{rng.choice(["High", "Critical"])}">\n'
+            )
+            f.write("      <TestSteps>\n")
+            indent = "        "
+            for level in range(1, depth):
+                f.write(f'{indent}<TestStepFolder Name="Folder_{level}">\n')
+                indent += "  "
+            for step in range(rng.randint(5, 15)):
+                f.write(f'{indent}<TestStep Name="Step_{step}">\n')
+                for value in range(3):
+                    f.write(
+                        f'{indent}  <TestStepValue Name="Value_{value}" '
+                        f'ActionMode="Verify" Value="{rng.random():.6f}"/>\n'
+                    )
+                f.write(f'{indent}  <Result Status="{status}"/>\n')
+                f.write(f"{indent}</TestStep>\n")
+            for level in range(depth - 1, 0, -1):
+                indent = indent[:-2]
+                f.write(f"{indent}</TestStepFolder>\n")
+            f.write("      </TestSteps>\n")
+
+            if status == "Failed":
+                message = f"Verification of Value_1 failed in step {rng.randint(0, 4)}"
+                if error_size > len(message):
+                    message = _pad_error(rng, message, error_size, idx)
+                f.write(f"      <ErrorMessage>{message}</ErrorMessage>\n")
+                for shot in range(screenshots):
+                    suffix = f"_{shot}" if shot else ""
+                    f.write(
+                        "      <Screenshot "
+                        f'Path="screenshots/TC_{idx:06d}{suffix}.png"/>\n'
+                    )
+
+            f.write("      <CustomFields>\n")
+            for field in range(custom_fields):
+                if field == 0:
+                    name, value = "Owner", "QA"
+                else:
+                    name, value = f"Field_{field}", f"Value_{rng.randint(0, 99)}"
+                f.write(f'        <Field Name="{name}" Value="{value}"/>\n')
+            f.write(
+                f'        <Field Name="JIRA_Test_Key" Value="BANK-{idx}"/>\n'
+                "      </CustomFields>\n"
+                "    </TestCase>\n"
+            )
+
+        f.write("  </ExecutionEntries>\n</ExecutionResults>\n")
+
+
+def _pad_error(rng: random.Random, message: str, error_size: int, idx: int) -> str:
+    """Extend a failure message with stack frames to error_size characters"""
+    lines = [message]
+    size = len(message)
+    while size < error_size:
+        frame = rng.choice(STACK_FRAMES).format(
+            module=f"Module_{idx % 25}",
+            step=rng.randint(0, 14),
+            value=rng.randint(0, 2),
+            test=f"TC_{idx:06d}",
+        )
+        lines.append(f"   {frame}")
+        size += len(frame) + 4
+    return "\n".join(lines)[:error_size]
+
+
+def write_synthetic_results(
+    results_dir: Path, test_count: int, files: int = 1, seed: int = 42, **options
+) -> List[Path]:
+    """Spread test_count synthetic test cases over files export files.
+
+    File n is generated with seed + n and test names continue across files,
+    so a results directory is reproducible and free of duplicate names.
+    """
+    results_dir.mkdir(parents=True, exist_ok=True)
+    files = max(1, min(files, test_count or 1))
+    written = []
+    first_index = 0
+
+    for number in range(files):
+        count = test_count // files + (1 if number < test_count % files else 0)
+        output_file = results_dir / f"synthetic-results-{number:03d}.xml"
+        write_synthetic_export(
+            output_file, count, seed + number, first_index=first_index, **options
+        )
+        written.append(output_file)
+        first_index += count
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Tosca XML results")
+    parser.add_argument(
+        "--output-dir", required=True, help="Directory to write XML exports to"
+    )
+    parser.add_argument(
+        "--tests", type=int, default=1000, help="TestCases across all files"
+    )
+    parser.add_argument("--files", type=int, default=1, help="XML files to write")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=1,
+        help="Nesting levels of test steps in each TestCase",
+    )
+    parser.add_argument(
+        "--custom-fields",
+        type=int,
+        default=1,
+        help="Custom fields per TestCase besides JIRA_Test_Key",
+    )
+    parser.add_argument(
+        "--screenshots", type=int, default=1, help="Screenshots per failed test"
+    )
+    parser.add_argument(
+        "--error-size",
+        type=int,
+        default=0,
+        help="Characters of error text per failed test (0 = one short line)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Generator seed")
+
+    args = parser.parse_args()
+
+    written = write_synthetic_results(
+        Path(args.output_dir),
+        args.tests,
+        files=args.files,
+        seed=args.seed,
+        depth=args.depth,
+        custom_fields=args.custom_fields,
+        screenshots=args.screenshots,
+        error_size=args.error_size,
+    )
+    size_mb = sum(path.stat().st_size for path in written) / (1024 * 1024)
+    print(
+        f"✅ Wrote {args.tests} test cases to {len(written)} file(s) "
+        f"in {args.output_dir} ({size_mb:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
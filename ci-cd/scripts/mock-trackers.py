@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Mock Tracker Server
+In-process stand-in for the JIRA/Xray and qTest endpoints the integration
+scripts call, with configurable latency, error rate and 429 throttling
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# (method, path pattern, MockTrackers handler); qTest paths may carry a prefix
+ROUTES = [
+    ("POST", r"/rest/api/2/issue$", "create_issue"),
+    ("POST", r"/rest/api/2/issue/(?P<key>[^/]+)/comment$", "add_comment"),
+    ("POST", r"/rest/api/2/issue/(?P<key>[^/]+)/attachments$", "add_attachment"),
+    ("POST", r"/rest/api/2/search$", "search_issues"),
+    ("POST", r"/rest/raven/1\.0/api/testexec/(?P<key>[^/]+)/test$", "update_status"),
+    ("POST", r"/rest/raven/1\.0/import/execution$", "import_execution"),
+    ("GET", r"/projects/queue-processing/(?P<job>[^/]+)$", "queue_job"),
+    ("POST", r"/projects/(?P<project>[^/]+)/test-cycles$", "create_test_cycle"),
+    ("POST", r"/projects/(?P<project>[^/]+)/test-runs$", "create_test_run"),
+    (
+        "POST",
+        r"/projects/(?P<project>[^/]+)/test-runs/(?P<run>[^/]+)/auto-test-logs$",
+        "add_test_log",
+    ),
+    (
+        "POST",
+        r"/projects/(?P<project>[^/]+)/test-runs/(?P<run>[^/]+)/attachments$",
+        "add_attachment",
+    ),
+    ("POST", r"/projects/(?P<project>[^/]+)/auto-test-logs$", "submit_test_logs"),
+    ("GET", r"/projects/(?P<project>[^/]+)/test-cases$", "list_test_cases"),
+]
+
+Response = Tuple[int, Optional[object], List[Tuple[str, str]]]
+
+
+class MockTrackers:
+    """Tracker state and request handlers behind the mock server.
+
+    Issues, statuses, test runs and logs are kept in memory so a load test
+    can check what was published; summary() returns the counts.
+    """
+
+    def __init__(self, project_key: str = "BANK", queue_polls: int = 0):
+        self.project_key = project_key
+        # Polls a batch job stays queued for before it reports SUCCESS
+        self.queue_polls = queue_polls
+        self.test_cases = []
+        self.routes = [
+            (method, re.compile(pattern), getattr(self, name))
+            for method, pattern, name in ROUTES
+        ]
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything published so far (test cases are kept)"""
+        with self._lock:
+            self.issues = {}
+            self.comments = Counter()
+            self.attachments = Counter()
+            self.statuses = {}
+            self.test_cycles = {}
+            self.test_runs = {}
+            self.test_logs = {}
+            self.linked_cases = {}
+            self.queue_jobs = {}
+            self.requests = Counter()
+            self.responses = Counter()
+            self._ids = itertools.count(1)
+
+    def add_test_cases(self, cases: List[Dict]):
+        """Serve these {"id", "pid", "name"} entries from the test-case listing"""
+        with self._lock:
+            self.test_cases.extend(cases)
+
+    def dispatch(
+        self, method: str, path: str, query: Dict, body: bytes, headers
+    ) -> Response:
+        for route_method, pattern, handler in self.routes:
+            match = pattern.search(path)
+            if route_method == method and match:
+                with self._lock:
+                    self.requests[handler.__name__] += 1
+                try:
+                    return handler(match.groupdict(), query, body, headers)
+                except (ValueError, KeyError, TypeError) as e:
+                    return 400, {"errorMessages": [f"Bad request: {e}"]}, []
+        return 404, {"errorMessages": [f"No mock route for {method} {path}"]}, []
+
+    def record_response(self, status: int):
+        with self._lock:
+            self.responses[status] += 1
+
+    def _next_id(self) -> int:
+        with self._lock:
+            return self._next_id_locked()
+
+    def _next_id_locked(self) -> int:
+        return next(self._ids)
+
+    # JIRA / Xray
+
+    def create_issue(self, params, query, body, headers) -> Response:
+        fields = json.loads(body)["fields"]
+        key = f"{fields['project']['key']}-{self._next_id()}"
+        with self._lock:
+            self.issues[key] = {
+                "type": fields["issuetype"]["name"],
+                "summary": fields["summary"],
+                "labels": fields.get("labels", []),
+            }
+        return 201, {"id": key.rsplit("-", 1)[1], "key": key}, []
+
+    def add_comment(self, params, query, body, headers) -> Response:
+        json.loads(body)
+        with self._lock:
+            self.comments[params["key"]] += 1
+        return 201, {"id": str(self._next_id())}, []
+
+    def add_attachment(self, params, query, body, headers) -> Response:
+        if b'filename="' not in body:
+            raise ValueError("multipart body without a file")
+        target = params.get("key") or params["run"]
+        with self._lock:
+            self.attachments[target] += 1
+        return 200, [{"id": str(self._next_id())}], []
+
+    def search_issues(self, params, query, body, headers) -> Response:
+        search = json.loads(body)
+        start_at = search.get("startAt", 0)
+        max_results = search.get("maxResults", 50)
+        with self._lock:
+            issues = [
+                {"key": key, "fields": {"labels": issue["labels"]}}
+                for key, issue in self.issues.items()
+                if issue["type"] == "Bug" and "TestFailure" in issue["labels"]
+            ]
+        page = issues[start_at : start_at + max_results]
+        return 200, {"startAt": start_at, "total": len(issues), "issues": page}, []
+
+    def update_status(self, params, query, body, headers) -> Response:
+        update = json.loads(body)
+        with self._lock:
+            self.statuses[(params["key"], update["testKey"])] = update["status"]
+        return 200, {}, []
+
+    def import_execution(self, params, query, body, headers) -> Response:
+        execution = json.loads(body)
+        key = execution["testExecutionKey"]
+        with self._lock:
+            for test in execution["tests"]:
+                self.statuses[(key, test["testKey"])] = test["status"]
+        return 200, {"testExecIssue": {"key": key}}, []
+
+    # qTest
+
+    def create_test_cycle(self, params, query, body, headers) -> Response:
+        cycle_id = self._next_id()
+        with self._lock:
+            self.test_cycles[cycle_id] = json.loads(body)["name"]
+        return 200, {"id": cycle_id}, []
+
+    def create_test_run(self, params, query, body, headers) -> Response:
+        run = json.loads(body)
+        case_id = run["test_case"]["id"]
+        with self._lock:
+            known = {str(case["id"]) for case in self.test_cases}
+            if known and str(case_id) not in known:
+                return 404, {"message": f"Test case {case_id} not found"}, []
+            run_id = self._next_id_locked()
+            self.test_runs[str(run_id)] = run["name"]
+            self.linked_cases[run["name"]] = case_id
+        return 200, {"id": run_id}, []
+
+    def add_test_log(self, params, query, body, headers) -> Response:
+        log = json.loads(body)
+        with self._lock:
+            name = self.test_runs[params["run"]]
+            self.test_logs[name] = log["status"]
+        return 201, {"id": self._next_id()}, []
+
+    def submit_test_logs(self, params, query, body, headers) -> Response:
+        """Process a batch at once; the job reports an outcome per log.
+
+        With test cases loaded, logs for any other test case ID are rejected
+        while the job as a whole still succeeds.
+        """
+        batch = json.loads(body)
+        job_id = self._next_id()
+        outcomes = []
+        with self._lock:
+            known = {str(case["id"]) for case in self.test_cases}
+            for log in batch["test_logs"]:
+                case_id = log.get("test_case", {}).get("id")
+                if known and str(case_id) not in known:
+                    error = f"Test case {case_id} not found"
+                    outcomes.append({"name": log["name"], "error": error})
+                    continue
+                self.test_logs[log["name"]] = log["status"]
+                self.linked_cases[log["name"]] = case_id
+                outcomes.append({"name": log["name"], "id": self._next_id_locked()})
+            self.queue_jobs[str(job_id)] = (self.queue_polls, outcomes)
+        job = self._queue_job_state(job_id, self.queue_polls, outcomes, "IN_WAITING")
+        return 201, job, []
+
+    def queue_job(self, params, query, body, headers) -> Response:
+        with self._lock:
+            remaining, outcomes = self.queue_jobs[params["job"]]
+            self.queue_jobs[params["job"]] = (max(0, remaining - 1), outcomes)
+        return 200, self._queue_job_state(params["job"], remaining - 1, outcomes), []
+
+    @staticmethod
+    def _queue_job_state(
+        job_id, remaining: int, outcomes: List[Dict], pending="IN_PROCESSING"
+    ) -> Dict:
+        if remaining > 0:
+            return {"id": int(job_id), "state": pending}
+        content = json.dumps({"test_logs": outcomes})
+        return {"id": int(job_id), "state": "SUCCESS", "content": content}
+
+    def list_test_cases(self, params, query, body, headers) -> Response:
+        page = int(query.get("page", ["1"])[0])
+        size = int(query.get("size", ["100"])[0])
+        with self._lock:
+            cases = self.test_cases[(page - 1) * size : page * size]
+        etag = '"' + hashlib.sha1(json.dumps(cases).encode()).hexdigest() + '"'
+        if headers.get("If-None-Match") == etag:
+            return 304, None, [("ETag", etag)]
+        return 200, cases, [("ETag", etag)]
+
+    def summary(self) -> Dict:
+        """Counts of what was published, requested and answered"""
+        with self._lock:
+            issue_types = Counter(issue["type"] for issue in self.issues.values())
+            return {
+                "issues": dict(issue_types),
+                "comments": sum(self.comments.values()),
+                "attachments": sum(self.attachments.values()),
+                "xray_statuses": len(self.statuses),
+                "test_cycles": len(self.test_cycles),
+                "test_runs": len(self.test_runs),
+                "test_logs": len(self.test_logs),
+                "requests": dict(self.requests),
+                "responses": {str(k): v for k, v in sorted(self.responses.items())},
+            }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.mock.handle(self, "POST")
+
+    def read_body(self) -> bytes:
+        """Request body, sent with Content-Length or chunked encoding"""
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+            if size == 0:
+                # Skip trailers up to the blank line ending the body
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def send_json(self, status: int, payload, headers: List[Tuple[str, str]]):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockTrackerServer:
+    """Threaded HTTP server for MockTrackers with injected latency and faults.
+
+    Every request is delayed by latency_ms +/- jitter_ms, then answered with
+    429 (throttle_rate) or 500 (error_rate) at random, or handled normally.
+    Bodies are always read first so keep-alive connections stay usable.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+        queue_polls: int = 0,
+        project_key: str = "BANK",
+        seed: Optional[int] = None,
+    ):
+        self.trackers = MockTrackers(project_key, queue_polls)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockTrackerServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw(self) -> Tuple[float, float]:
+        """Seconds to delay this request and a number deciding its fault"""
+        with self._random_lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            return max(0.0, self.latency_ms + jitter) / 1000, self._random.random()
+
+    def handle(self, request: _RequestHandler, method: str):
+        body = request.read_body()
+        url = urlsplit(request.path)
+        delay, draw = self._draw()
+        if delay:
+            time.sleep(delay)
+
+        if draw < self.throttle_rate:
+            status, payload, headers = (
+                429,
+                {"errorMessages": ["Rate limit exceeded"]},
+                [("Retry-After", f"{self.retry_after:g}")],
+            )
+        elif draw < self.throttle_rate + self.error_rate:
+            status, payload, headers = (
+                500,
+                {"errorMessages": ["Injected server error"]},
+                [],
+            )
+        else:
+            status, payload, headers = self.trackers.dispatch(
+                method, url.path, parse_qs(url.query), body, request.headers
+            )
+
+        self.trackers.record_response(status)
+        request.send_json(status, payload, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve mock JIRA/Xray and qTest endpoints for load tests"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Delay added to every request"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Random +/- spread of the delay"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 500",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=0.1,
+        help="Retry-After seconds sent with 429 responses",
+    )
+    parser.add_argument(
+        "--queue-polls",
+        type=int,
+        default=0,
+        help="Polls a qTest batch job stays queued for",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Fault seed")
+
+    args = parser.parse_args()
+
+    server = MockTrackerServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        queue_polls=args.queue_polls,
+        seed=args.seed,
+    )
+    print(f"🧪 Mock trackers listening on {server.url}")
+    print(f"   JIRA/Xray: --jira-url {server.url}")
+    print(f"   qTest:     --api-url {server.url}/api/v3")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.trackers.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
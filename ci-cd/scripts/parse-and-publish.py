@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Tosca Parse and Publish
+Parses Tosca XML results once and publishes them to qTest and JIRA/Xray
+concurrently from a single process
+"""
+
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+INTEGRATION_DIR = ROOT_DIR / "integration-scripts"
+
+# The integration scripts import their helper modules by plain name
+sys.path.insert(0, str(INTEGRATION_DIR))
+
+
+def load_script(name: str, path: Path):
+    """Import a script whose file name is not importable by name"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+parser_module = load_script(
+    "parse_results", Path(__file__).with_name("parse-results.py")
+)
+qtest_module = load_script(
+    "qtest_integration", INTEGRATION_DIR / "qtest-integration.py"
+)
+jira_module = load_script(
+    "jira_xray_integration", INTEGRATION_DIR / "jira-xray-integration.py"
+)
+
+from attachment_uploads import (
+    DEFAULT_UPLOAD_BUDGET,
+    DEFAULT_UPLOAD_WORKERS,
+    AttachmentCache,
+    AttachmentUploader,
+)
+from defect_index import DefectIndex
+from http_session import DEFAULT_POOL_SIZE, get_shared_session
+from ordered_executor import run_ordered
+from pipeline_metrics import profiled, save_metrics
+from publish_checkpoint import PublishCheckpoint
+from qtest_case_index import QTestCaseIndex
+from request_scheduler import DEFAULT_MAX_RETRIES
+
+
+def parse_results(args) -> dict:
+    """Parse the XML results once, optionally saving them for later stages"""
+    print(f"📊 Parsing Tosca results from: {args.results_dir}")
+    tosca_parser = parser_module.ToscaResultsParser(
+        args.results_dir,
+        streaming=args.streaming,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        backend=args.backend,
+    )
+    tosca_parser.parse_records()
+    tosca_parser.print_summary()
+
+    if args.output_file:
+        tosca_parser.save_results(args.output_file)
+
+    # The integrations read the compact records in place, without a dict copy
+    return {**tosca_parser.summary, "test_results": tosca_parser.records}
+
+
+def build_integrations(args) -> tuple:
+    """(qTest, JIRA/Xray) clients for the configured trackers, None if unset"""
+    session = get_shared_session(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    )
+    # One cache and byte budget across both trackers
+    uploader = AttachmentUploader(
+        session,
+        AttachmentCache(args.attachment_cache),
+        max_workers=args.upload_workers,
+        max_bytes=args.upload_budget_mb * 1024 * 1024,
+    )
+    qtest = jira = None
+
+    if args.qtest_api_url:
+        checkpoint = None
+        if args.qtest_checkpoint:
+            scope = (
+                f"qtest|{args.qtest_api_url}|{args.qtest_project_id}"
+                f"|{args.qtest_test_cycle}"
+            )
+            checkpoint = PublishCheckpoint(args.qtest_checkpoint, scope)
+        qtest = qtest_module.QTestIntegration(
+            args.qtest_api_url,
+            args.qtest_token,
+            args.qtest_project_id,
+            session=session,
+            batch=args.qtest_batch,
+            batch_size=args.qtest_batch_size,
+            max_in_flight=args.qtest_max_in_flight,
+            checkpoint=checkpoint,
+            uploader=uploader,
+            case_index=(
+                QTestCaseIndex(args.qtest_case_index) if args.qtest_case_index else None
+            ),
+        )
+
+    if args.jira_url:
+        checkpoint = None
+        if args.jira_checkpoint:
+            scope = f"jira|{args.jira_url}|{args.jira_project}|{args.build_number}"
+            checkpoint = PublishCheckpoint(args.jira_checkpoint, scope)
+        jira = jira_module.JiraXrayIntegration(
+            args.jira_url,
+            args.jira_username,
+            args.jira_password,
+            args.jira_project,
+            max_workers=args.jira_concurrency,
+            session=session,
+            bulk=args.jira_bulk,
+            bulk_chunk_size=args.jira_bulk_chunk_size,
+            checkpoint=checkpoint,
+            defect_index=DefectIndex(args.defect_index) if args.defect_index else None,
+            uploader=uploader,
+        )
+
+    return qtest, jira
+
+
+def build_publishers(args, results: dict) -> list:
+    """One callable per configured tracker, each returning True on success"""
+    qtest, jira = build_integrations(args)
+    publishers = []
+    if qtest is not None:
+        publishers.append(lambda: qtest.publish_results(results, args.qtest_test_cycle))
+    if jira is not None:
+        publishers.append(lambda: jira.process_results(results, args.build_number))
+    return publishers
+
+
+class MicroBatchPublisher:
+    """Publishes test records to the configured trackers in small batches.
+
+    Records are queued with add() and sent by flush() once a full batch is
+    waiting, or when the oldest queued record has waited max_delay seconds.
+    The qTest test cycle and the Test Execution are opened with the first
+    batch and reused for every later one; finish() prints one summary per
+    tracker for the whole run.
+    """
+
+    def __init__(self, args, qtest=None, jira=None):
+        self.args = args
+        self.qtest = qtest
+        self.jira = jira
+        self.batch_size = max(1, args.watch_batch_size)
+        self.max_delay = args.watch_max_delay
+        self.pending = []
+        self.pending_since = None
+        self.batches = 0
+
+        self.cycle_id = None
+        self.qtest_stats = Counter()
+        self.jira_opened = False
+        self.execution_key = None
+        self.jira_stats = Counter()
+        self.tests_updated = 0
+        # Occurrence counts of test identities, so checkpoint keys stay
+        # distinct across batches
+        self.qtest_seen = Counter()
+        self.jira_seen = Counter()
+
+    def add(self, tests: list):
+        if tests and not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.extend(tests)
+
+    def flush(self, summary: dict, everything: bool = False) -> bool:
+        """Publish the batches that are due, True if every tracker took them"""
+        success = True
+        while self.pending:
+            overdue = time.monotonic() - self.pending_since >= self.max_delay
+            if len(self.pending) < self.batch_size and not (everything or overdue):
+                break
+            batch = self.pending[: self.batch_size]
+            del self.pending[: len(batch)]
+            success = self.publish(batch, summary) and success
+        return success
+
+    def publish(self, tests: list, summary: dict) -> bool:
+        """Publish one batch to every configured tracker"""
+        self.batches += 1
+        print(f"\n📦 Publishing batch {self.batches} ({len(tests)} tests)")
+
+        jobs = []
+        if self.qtest is not None:
+            jobs.append(lambda: self._publish_qtest(tests))
+        if self.jira is not None:
+            jobs.append(lambda: self._publish_jira(tests, summary))
+
+        # Each tracker's log is printed as one block, as in a one-shot run
+        return all(list(run_ordered(lambda job: job(), jobs, len(jobs))))
+
+    def _publish_qtest(self, tests: list) -> bool:
+        if not self.cycle_id:
+            self.cycle_id = self.qtest.open_test_cycle(self.args.qtest_test_cycle)
+        if not self.cycle_id:
+            print("❌ Cannot publish this batch without a test cycle")
+            self.qtest_stats["total"] += len(tests)
+            return False
+
+        stats = Counter()
+        self.qtest.publish_tests(
+            self.cycle_id, tests, len(tests), stats, self.qtest_seen
+        )
+        self.qtest_stats.update(stats)
+        return stats["published"] == stats["total"]
+
+    def _publish_jira(self, tests: list, summary: dict) -> bool:
+        if not self.jira_opened:
+            # The execution description shows the counts of the first batch
+            self.execution_key = self.jira.open_execution(
+                self.args.build_number, summary
+            )
+            self.jira_opened = True
+
+        # Bulk import figures are worked out per batch, so tally separately
+        stats = Counter()
+        self.tests_updated += self.jira.publish_tests(
+            self.execution_key, tests, self.args.build_number, stats, self.jira_seen
+        )
+        self.jira_stats.update(stats)
+        return not stats["unpublished"]
+
+    def finish(self) -> bool:
+        """Print the per-tracker summaries and settle the checkpoints"""
+        success = True
+        if self.qtest is not None and self.batches:
+            success = self.qtest.finish_publishing(self.qtest_stats) and success
+        if self.jira is not None and self.jira_opened:
+            success = (
+                self.jira.finish_publishing(
+                    self.execution_key, self.jira_stats, self.tests_updated
+                )
+                and success
+            )
+        return success
+
+
+def watch_finished(args, watcher) -> bool:
+    """True once the stop file exists or the results have been idle long enough"""
+    if args.watch_stop_file and os.path.exists(args.watch_stop_file):
+        print(f"🏁 Found {args.watch_stop_file} - finishing")
+        return True
+    idle = time.monotonic() - watcher.last_change
+    if args.watch_idle_timeout and idle >= args.watch_idle_timeout:
+        print(f"🏁 No result file changes for {idle:.0f}s - finishing")
+        return True
+    return False
+
+
+def watch_and_publish(args) -> bool:
+    """Parse and publish new test records while Tosca is still running.
+
+    Runs until --watch-stop-file appears, --watch-idle-timeout passes or
+    the process is interrupted; then reads the files one last time and
+    publishes everything still queued. Ctrl+C only asks for that finish, so
+    a poll or batch in progress is never cut short; a second Ctrl+C aborts.
+    """
+    tosca_parser = parser_module.ToscaResultsParser(
+        args.results_dir, backend=args.backend
+    )
+    results = tosca_parser.summary
+    watcher = parser_module.ResultsWatcher(tosca_parser, args.watch_interval)
+    publisher = MicroBatchPublisher(args, *build_integrations(args))
+    writer = None
+    if args.output_file:
+        writer = parser_module.JsonResultsWriter(
+            args.output_file, results["execution_date"]
+        )
+
+    success = True
+    stopping = False
+    interrupted = threading.Event()
+
+    def interrupt(signum, frame):
+        print("\n⚠️ Interrupted - publishing the results read so far")
+        interrupted.set()
+        watcher.wake()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # Signal handlers can only be installed from the main thread
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    if on_main_thread:
+        previous_handler = signal.signal(signal.SIGINT, interrupt)
+    watcher.start()
+    try:
+        while True:
+            new_tests = watcher.poll()
+            if new_tests:
+                if writer:
+                    for test in new_tests:
+                        writer.write(test)
+                publisher.add(new_tests)
+                print(
+                    f"📊 {results['total']} tests so far: {results['passed']} "
+                    f"passed, {results['failed']} failed, {results['skipped']} "
+                    f"skipped, {results['blocked']} blocked"
+                )
+            success = publisher.flush(results, everything=stopping) and success
+            if stopping:
+                break
+
+            if not interrupted.is_set():
+                watcher.wait()
+            stopping = interrupted.is_set() or watch_finished(args, watcher)
+    finally:
+        watcher.stop()
+        if on_main_thread:
+            signal.signal(signal.SIGINT, previous_handler)
+
+    for xml_file in watcher.incomplete_files():
+        print(f"⚠️ {xml_file} ended mid-document; its complete TestCases were kept")
+
+    tosca_parser.print_summary()
+    if writer:
+        writer.close(results)
+        print(f"✅ Results saved to: {args.output_file}")
+
+    return publisher.finish() and success
+
+
+def validate_args(parser: argparse.ArgumentParser, args):
+    """Require the full option set for every tracker that is configured"""
+    required = {
+        "qtest_api_url": ("qtest_token", "qtest_project_id", "qtest_test_cycle"),
+        "jira_url": (
+            "jira_username",
+            "jira_password",
+            "jira_project",
+            "build_number",
+        ),
+    }
+    for trigger, options in required.items():
+        if not getattr(args, trigger):
+            continue
+        missing = [name for name in options if not getattr(args, name)]
+        if missing:
+            flags = ", ".join("--" + name.replace("_", "-") for name in missing)
+            parser.error(f"--{trigger.replace('_', '-')} also requires {flags}")
+
+    if not args.qtest_api_url and not args.jira_url:
+        parser.error("configure at least one of --qtest-api-url or --jira-url")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse Tosca results once and publish to qTest and JIRA/Xray"
+    )
+
+    parser.add_argument(
+        "--results-dir", required=True, help="Directory containing XML results"
+    )
+    parser.add_argument(
+        "--output-file",
+        help="Also save the parsed results as JSON (e.g. for the dashboard)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Parse with iterparse to keep memory flat on very large XML files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse XML files across N processes (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--backend",
+        default="auto",
+        choices=["auto", *parser_module.PARSER_BACKENDS],
+        help="XML parser backend (auto prefers lxml when installed)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse per-file parse results stored here for unchanged XML files",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep watching --results-dir while Tosca runs and publish new "
+        "tests in micro-batches (ignores --workers, --cache-dir, --streaming)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=parser_module.WATCH_POLL_INTERVAL,
+        help="Seconds between directory scans in watch mode",
+    )
+    parser.add_argument(
+        "--watch-batch-size",
+        type=int,
+        default=100,
+        help="Tests per micro-batch in watch mode",
+    )
+    parser.add_argument(
+        "--watch-max-delay",
+        type=float,
+        default=30.0,
+        help="Seconds a test may wait for its micro-batch to fill up",
+    )
+    parser.add_argument(
+        "--watch-stop-file",
+        help="Finish watch mode once this file exists (e.g. touched after Tosca)",
+    )
+    parser.add_argument(
+        "--watch-idle-timeout",
+        type=float,
+        default=0,
+        help="Finish watch mode after this many seconds without result file "
+        "changes (0 = never)",
+    )
+
+    parser.add_argument("--qtest-api-url", help="qTest API URL")
+    parser.add_argument("--qtest-token", help="qTest API token")
+    parser.add_argument("--qtest-project-id", help="qTest project ID")
+    parser.add_argument("--qtest-test-cycle", help="Test cycle name")
+    parser.add_argument(
+        "--qtest-batch",
+        action="store_true",
+        help="Submit test runs through batch auto-test-log jobs",
+    )
+    parser.add_argument(
+        "--qtest-batch-size",
+        type=int,
+        default=qtest_module.QTEST_BATCH_SIZE,
+        help="Test logs per batch submission (with --qtest-batch)",
+    )
+    parser.add_argument(
+        "--qtest-max-in-flight",
+        type=int,
+        default=1,
+        help="Batch submissions processed at once (with --qtest-batch)",
+    )
+    parser.add_argument(
+        "--qtest-checkpoint",
+        help="Checkpoint file for resuming an interrupted qTest publish",
+    )
+    parser.add_argument(
+        "--qtest-case-index",
+        help="Local index of qTest test cases; map tests by qTest PID or name "
+        "unless their test case ID is marked qtest:<id>",
+    )
+
+    parser.add_argument("--jira-url", help="JIRA instance URL")
+    parser.add_argument("--jira-username", help="JIRA username")
+    parser.add_argument("--jira-password", help="JIRA password/token")
+    parser.add_argument("--jira-project", help="JIRA project key")
+    parser.add_argument("--build-number", help="Build number")
+    parser.add_argument(
+        "--jira-concurrency",
+        type=int,
+        default=1,
+        help="Failed tests published to JIRA/Xray in parallel",
+    )
+    parser.add_argument(
+        "--jira-bulk",
+        action="store_true",
+        help="Import Xray statuses through the bulk execution import endpoint",
+    )
+    parser.add_argument(
+        "--jira-bulk-chunk-size",
+        type=int,
+        default=jira_module.XRAY_IMPORT_CHUNK_SIZE,
+        help="Test runs per bulk import request (with --jira-bulk)",
+    )
+    parser.add_argument(
+        "--jira-checkpoint",
+        help="Checkpoint file for resuming an interrupted JIRA/Xray publish",
+    )
+    parser.add_argument(
+        "--defect-index",
+        help="File indexing open automation defects by failure fingerprint",
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Keep-alive connections per host",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=None,
+        help="Maximum requests per second per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Retries for throttled (429/503) requests",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=DEFAULT_UPLOAD_WORKERS,
+        help="Parallel attachment uploads per issue or test run",
+    )
+    parser.add_argument(
+        "--upload-budget-mb",
+        type=int,
+        default=DEFAULT_UPLOAD_BUDGET // (1024 * 1024),
+        help="Attachment bytes in flight at once across both trackers, in MB",
+    )
+    parser.add_argument(
+        "--attachment-cache",
+        help="File remembering attachments already uploaded to each target",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write parse and publish timings, retries and upload bytes here "
+        "(Prometheus text format for .prom/.txt, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write cProfile stats of the parsing stage to this file "
+        "(worker processes are not included)",
+    )
+
+    args = parser.parse_args()
+    validate_args(parser, args)
+
+    if args.watch:
+        try:
+            with profiled(args.profile):
+                success = watch_and_publish(args)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\n⚠️ Aborted - re-run with the same checkpoints to resume")
+            sys.exit(130)
+        finally:
+            save_metrics(args.metrics_file)
+        sys.exit(0 if success else 1)
+
+    try:
+        with profiled(args.profile):
+            results = parse_results(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    publishers = build_publishers(args, results)
+
+    # Each tracker's log is printed as one block, as if run one after the other
+    outcomes = list(run_ordered(lambda publish: publish(), publishers, len(publishers)))
+    save_metrics(args.metrics_file)
+
+    sys.exit(0 if all(outcomes) else 1)
+
+
+if __name__ == "__main__":
+    main()
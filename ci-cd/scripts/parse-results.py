@@ -5,20 +5,438 @@ Parses Tosca XML execution results and generates JSON summary
 """
 
 import argparse
+import hashlib
 import json
+import os
 import sys
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # watch mode falls back to polling
+    Observer = None
+
+# Timers and counters are shared with the integration scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "integration-scripts"))
+
+from pipeline_metrics import inc, observe, profiled, save_metrics, timed, timer
+
+# Result/@Status values (lower-cased) and the status they map to
+RESULT_STATUSES = {
+    "passed": "Passed",
+    "success": "Passed",
+    "failed": "Failed",
+    "failure": "Failed",
+    "skipped": "Skipped",
+    "notexecuted": "Skipped",
+    "blocked": "Blocked",
+}
+
+# Error message locations, in order of preference
+ERROR_TAGS = ("ErrorMessage", "Error", "FailureReason", "ExceptionMessage")
+
+# Descendant tags whose first occurrence feeds a test record
+INDEXED_TAGS = frozenset(
+    ERROR_TAGS + ("Result", "VerificationStatus", "VerificationResult", "CustomFields")
+)
+
+# Every descendant tag the single-pass TestCase walk looks at
+WALKED_TAGS = tuple(INDEXED_TAGS) + ("Screenshot",)
+
+# Columnar output formats and the pandas writer method for each
+COLUMNAR_FORMATS = {"parquet": "to_parquet", "feather": "to_feather"}
+
+# Low-cardinality record fields stored as categoricals in columnar output
+CATEGORICAL_FIELDS = ("status", "module", "suite")
+
+# Seconds between directory scans in watch mode, and the pause after a file
+# system event so a burst of writes is read once
+WATCH_POLL_INTERVAL = 5.0
+WATCH_SETTLE_TIME = 1.0
+
+# Bytes read at a time from a result file that is followed in watch mode
+WATCH_READ_SIZE = 1024 * 1024
+
+# Bump whenever parsed test records change shape or content, so parse cache
+# entries written by an older parser are re-parsed instead of reused
+PARSER_VERSION = "1"
+
+
+class TestResult:
+    """Compact record for one parsed TestCase.
+
+    Slots instead of a per-test dict, with the repetitive status, module,
+    suite and execution time strings interned. Records stay inside the
+    parser and the scripts that drive it in-process; to_dict() gives the
+    plain JSON shape that ToscaResultsParser.results and every output file
+    expose. get() and item access let the integrations read either form.
+    """
+
+    __slots__ = (
+        "name",
+        "status",
+        "execution_time",
+        "start_time",
+        "end_time",
+        "duration",
+        "error_message",
+        "screenshots",
+        "module",
+        "suite",
+        "test_case_id",
+        "xray_test_key",
+        "critical",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        execution_time: str,
+        start_time: str,
+        end_time: str,
+        duration: int,
+        error_message: str,
+        screenshots: Iterable[str],
+        module: str,
+        suite: str,
+        test_case_id: str,
+        xray_test_key: str,
+        critical: bool,
+    ):
+        self.name = name
+        self.status = sys.intern(status)
+        self.execution_time = sys.intern(execution_time)
+        self.start_time = start_time
+        self.end_time = end_time
+        self.duration = duration
+        self.error_message = error_message
+        self.screenshots = tuple(screenshots)
+        self.module = sys.intern(module)
+        self.suite = sys.intern(suite)
+        self.test_case_id = test_case_id
+        self.xray_test_key = xray_test_key
+        self.critical = critical
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TestResult":
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        """The record as a plain dict with the keys of the results JSON"""
+        data = {field: getattr(self, field) for field in self.__slots__}
+        data["screenshots"] = list(self.screenshots)
+        return data
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TestResult):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"TestResult(name={self.name!r}, status={self.status!r})"
+
+
+class ParseCache:
+    """On-disk cache of per-file parse results.
+
+    Entries are keyed by the resolved file path and validated against the
+    file's size, mtime and SHA-256 content hash plus PARSER_VERSION.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, xml_file: Path) -> Optional[Tuple[List[TestResult], timedelta]]:
+        """Return the cached parse result for xml_file if it is still valid"""
+        entry = self._read_entry(xml_file)
+        try:
+            current = entry is not None and self._is_current(entry, xml_file)
+        except OSError:
+            current = False
+
+        if not current:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        test_cases = [TestResult.from_dict(data) for data in entry["test_results"]]
+        return test_cases, timedelta(seconds=entry["duration_seconds"])
+
+    def fingerprint(self, xml_file: Path) -> Dict:
+        """Size, mtime and content hash of xml_file, to be taken before parsing.
+
+        The stat comes first: if the file grows while it is hashed or parsed,
+        the stored size no longer matches and the next run parses it again.
+        """
+        stat = xml_file.stat()
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self._file_digest(xml_file),
+        }
+
+    def store(
+        self,
+        xml_file: Path,
+        fingerprint: Dict,
+        test_cases: List[TestResult],
+        duration: timedelta,
+    ):
+        """Record the parse result for xml_file as read at fingerprint time"""
+        self._write_entry(
+            xml_file,
+            {
+                "parser_version": PARSER_VERSION,
+                "path": str(xml_file.resolve()),
+                **fingerprint,
+                "duration_seconds": duration.total_seconds(),
+                "test_results": [test.to_dict() for test in test_cases],
+            },
+        )
+
+    def _is_current(self, entry: Dict, xml_file: Path) -> bool:
+        """Check a cache entry against the file on disk"""
+        if entry.get("parser_version") != PARSER_VERSION:
+            return False
+        if entry.get("path") != str(xml_file.resolve()):
+            return False
+
+        stat = xml_file.stat()
+        if entry.get("size") != stat.st_size:
+            return False
+        if entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+
+        # Touched but possibly unchanged (e.g. re-copied by a retry stage)
+        if entry.get("sha256") != self._file_digest(xml_file):
+            return False
+
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._write_entry(xml_file, entry)
+        return True
+
+    def _entry_path(self, xml_file: Path) -> Path:
+        digest = hashlib.sha1(str(xml_file.resolve()).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_entry(self, xml_file: Path) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(xml_file), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, xml_file: Path, entry: Dict):
+        # Write then rename so an interrupted run never leaves a torn entry
+        entry_path = self._entry_path(xml_file)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+
+    @staticmethod
+    def _file_digest(xml_file: Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(xml_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+
+class ElementTreeBackend:
+    """XML backend built on xml.etree.ElementTree (always available)"""
+
+    name = "stdlib"
+
+    def parse(self, xml_file: Path) -> ET.Element:
+        """Parse a whole file and return its root element"""
+        return ET.parse(str(xml_file)).getroot()
+
+    def iterparse(self, xml_file: Path) -> Iterator[Tuple[str, ET.Element]]:
+        """Yield (event, element) pairs for start and end tags"""
+        return ET.iterparse(str(xml_file), events=("start", "end"))
+
+    def pull_parser(self):
+        """Parser fed bytes as they arrive, with iterparse's events"""
+        return ET.XMLPullParser(events=("start", "end"))
+
+    def find_test_cases(self, root: ET.Element) -> List[ET.Element]:
+        """All TestCase descendants of root, in document order"""
+        return root.findall(".//TestCase")
+
+    def find_duration(self, root: ET.Element) -> Optional[ET.Element]:
+        """First Duration descendant of root"""
+        return root.find(".//Duration")
+
+    def walk_test_case(self, test_case: ET.Element) -> Iterator[ET.Element]:
+        """Descendants of a TestCase that may carry record fields"""
+        descendants = test_case.iter()
+        next(descendants)  # ".//" lookups never match the TestCase itself
+        return descendants
+
+    def find_field(self, custom_fields: ET.Element, field_name: str):
+        """First Field descendant of custom_fields with the given Name"""
+        for field in custom_fields.iter("Field"):
+            if field.get("Name") == field_name:
+                return field
+        return None
+
+
+class LxmlBackend(ElementTreeBackend):
+    """XML backend built on lxml: C-level parsing and compiled XPath"""
+
+    name = "lxml"
+
+    # huge_tree lifts libxml2's depth and text-node size safety limits.
+    # Entities are never loaded from disk or the network (lxml 4.x resolves
+    # external entities by default)
+    PARSER_OPTIONS = {"huge_tree": True, "resolve_entities": False, "no_network": True}
+
+    def __init__(self):
+        self._parser = lxml_etree.XMLParser(**self.PARSER_OPTIONS)
+        self._test_cases = lxml_etree.XPath("descendant::TestCase")
+        self._duration = lxml_etree.XPath("(descendant::Duration)[1]")
+        self._field = lxml_etree.XPath("descendant::Field[@Name = $name][1]")
+
+    def parse(self, xml_file: Path):
+        try:
+            root = lxml_etree.parse(str(xml_file), self._parser).getroot()
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from None
+        reject_external_entities(root)
+        return root
+
+    def iterparse(self, xml_file: Path):
+        events = lxml_etree.iterparse(
+            str(xml_file), events=("start", "end"), **self.PARSER_OPTIONS
+        )
+        try:
+            # The first event opens the root, after the DOCTYPE has been read
+            for event, root in events:
+                reject_external_entities(root)
+                yield event, root
+                break
+            yield from events
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from None
+
+    def pull_parser(self):
+        return LxmlPullParser(
+            lxml_etree.XMLPullParser(events=("start", "end"), **self.PARSER_OPTIONS)
+        )
+
+    def find_test_cases(self, root):
+        return self._test_cases(root)
+
+    def find_duration(self, root):
+        matches = self._duration(root)
+        return matches[0] if matches else None
+
+    def walk_test_case(self, test_case):
+        # Tag filtering happens in C; TestCase itself is not a walked tag
+        return test_case.iter(*WALKED_TAGS)
+
+    def find_field(self, custom_fields, field_name: str):
+        matches = self._field(custom_fields, name=field_name)
+        return matches[0] if matches else None
+
+
+def reject_external_entities(root):
+    """Raise ET.ParseError if the document declares an external entity.
+
+    lxml leaves such entities unresolved, which would silently drop their
+    references from the text; the stdlib backend rejects these files, so
+    lxml does too.
+    """
+    dtd = root.getroottree().docinfo.internalDTD
+    if dtd is None:
+        return
+    for entity in dtd.iterentities():
+        if entity.system_url is not None:
+            raise ET.ParseError(f"external entity {entity.name!r} is not allowed")
+
+
+class LxmlPullParser:
+    """lxml XMLPullParser that rejects documents declaring external entities"""
+
+    def __init__(self, pull_parser):
+        self._pull_parser = pull_parser
+        self._root_checked = False
+
+    def feed(self, data: bytes):
+        self._pull_parser.feed(data)
+
+    def read_events(self):
+        events = self._pull_parser.read_events()
+        if not self._root_checked:
+            for event, root in events:
+                reject_external_entities(root)
+                self._root_checked = True
+                yield event, root
+                break
+        yield from events
+
+    def close(self):
+        return self._pull_parser.close()
+
+
+PARSER_BACKENDS = {"stdlib": ElementTreeBackend, "lxml": LxmlBackend}
+
+
+def get_backend(name: str = "auto") -> ElementTreeBackend:
+    """Return an XML backend by name; "auto" prefers lxml when installed"""
+    if name == "auto":
+        name = "lxml" if lxml_etree is not None else "stdlib"
+    if name == "lxml" and lxml_etree is None:
+        raise ValueError("lxml backend requested but lxml is not installed")
+    return PARSER_BACKENDS[name]()
 
 
 class ToscaResultsParser:
     """Parser for Tosca execution results"""
 
-    def __init__(self, results_dir: str):
+    def __init__(
+        self,
+        results_dir: str,
+        streaming: bool = False,
+        workers: int = 1,
+        cache_dir: Optional[str] = None,
+        backend: str = "auto",
+    ):
         self.results_dir = Path(results_dir)
-        self.results = {
+        self.streaming = streaming
+        self.backend = get_backend(backend)
+        # 0 asks for one worker process per CPU core, as --workers documents
+        if workers < 0:
+            raise ValueError(f"workers must be 0 or more, got {workers}")
+        self.workers = workers if workers > 0 else os.cpu_count() or 1
+        self.cache = ParseCache(cache_dir) if cache_dir else None
+        self.records: List[TestResult] = []
+        self.summary = {
             "execution_date": datetime.now().isoformat(),
             "total": 0,
             "passed": 0,
@@ -27,76 +445,269 @@ class ToscaResultsParser:
             "blocked": 0,
             "passRate": 0.0,
             "duration": "0:00:00",
-            "test_results": [],
         }
 
-    def parse_xml_results(self) -> Dict:
-        """Parse Tosca XML result files"""
-        xml_files = list(self.results_dir.glob("**/*.xml"))
+    @property
+    def results(self) -> Dict:
+        """The results document: summary plus every record as a plain dict.
+
+        Built on each access. In-process callers that only read the records
+        should use self.records and self.summary instead.
+        """
+        return {
+            **self.summary,
+            "test_results": [test.to_dict() for test in self.records],
+        }
+
+    def parse_xml_results(
+        self, record_sink: Optional[Callable[[TestResult], None]] = None
+    ) -> Dict:
+        """Parse Tosca XML result files and return the results document"""
+        self.parse_records(record_sink)
+        return self.results
+
+    @timed("tosca_parse_seconds")
+    def parse_records(
+        self, record_sink: Optional[Callable[[TestResult], None]] = None
+    ) -> List[TestResult]:
+        """Parse Tosca XML result files into self.records and self.summary
+
+        With a record_sink only the summary counters are kept. Streaming
+        parses without workers or a cache hand each record to the sink as its
+        TestCase closes, so records read before a file turns out to be
+        malformed have already been emitted; otherwise a file's records are
+        handed over once the file is parsed.
+        """
+        xml_files = sorted(self.results_dir.glob("**/*.xml"))
 
         if not xml_files:
             print(f"⚠️ No XML result files found in {self.results_dir}")
-            return self.results
+            return self.records
 
         print(f"📄 Found {len(xml_files)} XML result file(s)")
 
         total_duration = timedelta()
 
-        for xml_file in xml_files:
-            try:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
+        if record_sink is None:
+            parse_jobs = self._parse_jobs(xml_files)
+        elif self.streaming and self.cache is None and self.workers <= 1:
+            parse_jobs = (
+                partial(self._stream_file, xml_file, record_sink)
+                for xml_file in xml_files
+            )
+        else:
+            parse_jobs = (
+                partial(self._sink_records, parse_job, record_sink)
+                for parse_job in self._parse_jobs(xml_files)
+            )
 
-                # Parse test cases from XML
-                test_cases = self._parse_test_cases(root)
-                self.results["test_results"].extend(test_cases)
+        # Files are merged in sorted path order whatever the worker count
+        for xml_file, parse_job in zip(xml_files, parse_jobs):
+            try:
+                if record_sink is None:
+                    test_cases, duration = parse_job()
+                    self.records.extend(test_cases)
+                    count = len(test_cases)
+                else:
+                    count, duration = parse_job()
 
-                # Calculate duration
-                duration = self._extract_duration(root)
                 if duration:
                     total_duration += duration
 
+                inc("tosca_parsed_files_total", outcome="ok")
+                inc("tosca_parsed_tests_total", count)
             except ET.ParseError as e:
                 print(f"⚠️ Failed to parse {xml_file}: {e}")
+                inc("tosca_parsed_files_total", outcome="failed")
                 continue
             except Exception as e:
                 print(f"⚠️ Error processing {xml_file}: {e}")
+                inc("tosca_parsed_files_total", outcome="failed")
                 continue
 
+        if self.cache is not None:
+            inc("tosca_parse_cache_hits_total", self.cache.hits)
+            print(
+                f"♻️ Parse cache: {self.cache.hits} reused, "
+                f"{self.cache.misses} parsed"
+            )
+
         # Calculate summary statistics
         self._calculate_summary(total_duration)
 
-        return self.results
+        return self.records
 
-    def _parse_test_cases(self, root: ET.Element) -> List[Dict]:
-        """Extract test case results from XML"""
+    def _sink_records(
+        self, parse_job: Callable, record_sink: Callable[[TestResult], None]
+    ) -> Tuple[int, timedelta]:
+        """Run a parse job and hand its records to the sink"""
+        test_cases, duration = parse_job()
+        for test in test_cases:
+            record_sink(test)
+            self._count_result(test)
+        return len(test_cases), duration
+
+    def _stream_file(
+        self, xml_file: Path, record_sink: Callable[[TestResult], None]
+    ) -> Tuple[int, timedelta]:
+        """Hand each record of a file to the sink as its TestCase closes"""
+        count = 0
+        records = self._iterparse_test_cases(xml_file)
+
+        with timer("tosca_parse_file_seconds"):
+            try:
+                while True:
+                    test = next(records)
+                    record_sink(test)
+                    self._count_result(test)
+                    count += 1
+            except StopIteration as done:
+                duration = done.value
+
+        return count, duration
+
+    def _parse_jobs(self, xml_files: List[Path]) -> Iterator[Callable]:
+        """Yield one callable per file returning its parse result, in file order"""
+        if self.cache is None:
+            yield from self._submit_parse_jobs(xml_files)
+            return
+
+        cached = {}
+        fingerprints = {}
+        for xml_file in xml_files:
+            hit = self.cache.load(xml_file)
+            if hit is not None:
+                cached[xml_file] = hit
+                continue
+            # Fingerprinted before any worker starts parsing the file
+            try:
+                fingerprints[xml_file] = self.cache.fingerprint(xml_file)
+            except OSError:
+                fingerprints[xml_file] = None
+
+        pending = self._submit_parse_jobs([f for f in xml_files if f not in cached])
+        for xml_file in xml_files:
+            if xml_file in cached:
+                yield partial(cached.pop, xml_file)
+            else:
+                yield partial(
+                    self._parse_and_cache,
+                    xml_file,
+                    fingerprints[xml_file],
+                    next(pending),
+                )
+
+    def _parse_and_cache(
+        self, xml_file: Path, fingerprint: Optional[Dict], parse_job: Callable
+    ) -> Tuple[List[TestResult], timedelta]:
+        """Run a parse job and store its result in the parse cache"""
+        test_cases, duration = parse_job()
+        if fingerprint is None:
+            return test_cases, duration
+
+        # A cache that cannot be written only costs a re-parse next time
+        try:
+            self.cache.store(xml_file, fingerprint, test_cases, duration)
+        except OSError as e:
+            print(f"⚠️ Failed to update parse cache for {xml_file}: {e}")
+        return test_cases, duration
+
+    def _submit_parse_jobs(self, xml_files: List[Path]) -> Iterator[Callable]:
+        """Yield one parse job per file, in process workers when configured"""
+        if self.workers <= 1 or len(xml_files) <= 1:
+            for xml_file in xml_files:
+                yield partial(self._parse_file, xml_file)
+            return
+
+        workers = min(self.workers, len(xml_files))
+        print(f"⚙️ Parsing across {workers} worker process(es)")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_parse_file_worker, xml_file, self._worker_options())
+                for xml_file in xml_files
+            ]
+            for future in futures:
+                yield partial(_worker_result, future)
+
+    def _worker_options(self) -> Dict:
+        """Constructor options a worker process needs to parse like this one"""
+        return {"streaming": self.streaming, "backend": self.backend.name}
+
+    @timed("tosca_parse_file_seconds")
+    def _parse_file(self, xml_file: Path) -> Tuple[List[TestResult], timedelta]:
+        """Parse a single XML result file into test records and its duration"""
+        if self.streaming:
+            return self._parse_file_streaming(xml_file)
+
+        root = self.backend.parse(xml_file)
+
+        # Parse test cases from XML
+        test_cases = self._parse_test_cases(root)
+
+        # Calculate duration
+        duration = self._extract_duration(root)
+
+        return test_cases, duration
+
+    def _parse_file_streaming(
+        self, xml_file: Path
+    ) -> Tuple[List[TestResult], timedelta]:
+        """Parse a single XML result file with iterparse"""
         test_cases = []
+        records = self._iterparse_test_cases(xml_file)
+
+        try:
+            while True:
+                test_cases.append(next(records))
+        except StopIteration as done:
+            duration = done.value
+
+        return test_cases, duration
+
+    def _iterparse_test_cases(self, xml_file: Path) -> Iterator[TestResult]:
+        """Yield test records as each top-level TestCase closes.
+
+        The generator's return value is the execution duration.
+        """
+        events = TestCaseEvents(self)
+        yield from events.records(self.backend.iterparse(xml_file))
+        return events.duration()
 
+    def _parse_test_cases(self, root: ET.Element) -> List[TestResult]:
+        """Extract test case results from XML"""
         # Tosca XML structure varies, adapt as needed
         # This is a generic parser - adjust based on your Tosca version
 
-        for test_case in root.findall(".//TestCase"):
+        return self._convert_test_cases(self.backend.find_test_cases(root))
+
+    def _convert_test_cases(self, elements: Iterable[ET.Element]) -> List[TestResult]:
+        """Convert TestCase elements into test records"""
+        test_cases = []
+
+        for test_case in elements:
             try:
                 name = test_case.get("Name", "Unknown Test")
-                status = self._determine_status(test_case)
-
-                test_data = {
-                    "name": name,
-                    "status": status,
-                    "execution_time": test_case.get("ExecutionTime", "N/A"),
-                    "start_time": test_case.get("StartTime", ""),
-                    "end_time": test_case.get("EndTime", ""),
-                    "duration": self._calculate_test_duration(test_case),
-                    "error_message": self._extract_error_message(test_case),
-                    "screenshots": self._find_screenshots(test_case),
-                    "module": test_case.get("Module", "N/A"),
-                    "suite": test_case.get("Suite", "N/A"),
-                    "test_case_id": test_case.get("ID", ""),
-                    "xray_test_key": self._extract_custom_field(
-                        test_case, "JIRA_Test_Key"
+                found, screenshots = self._index_test_case(test_case)
+                status = self._determine_status(found)
+
+                test_data = TestResult(
+                    name=name,
+                    status=status,
+                    execution_time=test_case.get("ExecutionTime", "N/A"),
+                    start_time=test_case.get("StartTime", ""),
+                    end_time=test_case.get("EndTime", ""),
+                    duration=self._calculate_test_duration(test_case),
+                    error_message=self._extract_error_message(found),
+                    screenshots=screenshots,
+                    module=test_case.get("Module", "N/A"),
+                    suite=test_case.get("Suite", "N/A"),
+                    test_case_id=test_case.get("ID", ""),
+                    xray_test_key=self._extract_custom_field(
+                        found.get("CustomFields"), "JIRA_Test_Key"
                     ),
-                    "critical": self._is_critical_test(test_case),
-                }
+                    critical=self._is_critical_test(test_case),
+                )
 
                 test_cases.append(test_data)
 
@@ -106,24 +717,40 @@ class ToscaResultsParser:
 
         return test_cases
 
-    def _determine_status(self, test_case: ET.Element) -> str:
+    def _index_test_case(
+        self, test_case: ET.Element
+    ) -> Tuple[Dict[str, ET.Element], List[str]]:
+        """Walk a TestCase subtree once, collecting what the record needs.
+
+        Returns the first descendant for each tag in INDEXED_TAGS (the
+        element ``test_case.find(".//<tag>")`` would return) and the
+        non-empty screenshot paths in document order.
+        """
+        found = {}
+        screenshots = []
+
+        for elem in self.backend.walk_test_case(test_case):
+            tag = elem.tag
+            if tag == "Screenshot":
+                path = elem.get("Path", "")
+                if path:
+                    screenshots.append(path)
+            elif tag in INDEXED_TAGS and tag not in found:
+                found[tag] = elem
+
+        return found, screenshots
+
+    def _determine_status(self, found: Dict[str, ET.Element]) -> str:
         """Determine test execution status"""
         # Check Result element
-        result_elem = test_case.find(".//Result")
+        result_elem = found.get("Result")
         if result_elem is not None:
-            status = result_elem.get("Status", "").lower()
-
-            if status in ["passed", "success"]:
-                return "Passed"
-            elif status in ["failed", "failure"]:
-                return "Failed"
-            elif status in ["skipped", "notexecuted"]:
-                return "Skipped"
-            elif status in ["blocked"]:
-                return "Blocked"
+            status = RESULT_STATUSES.get(result_elem.get("Status", "").lower())
+            if status:
+                return status
 
         # Check VerificationStatus
-        verification = test_case.find(".//VerificationStatus")
+        verification = found.get("VerificationStatus")
         if verification is not None:
             if verification.text and "pass" in verification.text.lower():
                 return "Passed"
@@ -133,46 +760,29 @@ class ToscaResultsParser:
         # Default to Failed if unclear
         return "Failed"
 
-    def _extract_error_message(self, test_case: ET.Element) -> str:
+    def _extract_error_message(self, found: Dict[str, ET.Element]) -> str:
         """Extract error message from failed test"""
         # Check various possible error locations
-        error_locations = [
-            ".//ErrorMessage",
-            ".//Error",
-            ".//FailureReason",
-            ".//ExceptionMessage",
-        ]
-
-        for location in error_locations:
-            elem = test_case.find(location)
+        for tag in ERROR_TAGS:
+            elem = found.get(tag)
             if elem is not None and elem.text:
                 return elem.text.strip()
 
         # Check for verification failures
-        verification = test_case.find(".//VerificationResult")
+        verification = found.get("VerificationResult")
         if verification is not None and verification.get("Status") == "Failed":
             return verification.get("Message", "Verification failed")
 
         return ""
 
-    def _find_screenshots(self, test_case: ET.Element) -> List[str]:
-        """Find screenshot file paths"""
-        screenshots = []
-
-        for screenshot in test_case.findall(".//Screenshot"):
-            path = screenshot.get("Path", "")
-            if path:
-                screenshots.append(path)
-
-        return screenshots
-
-    def _extract_custom_field(self, test_case: ET.Element, field_name: str) -> str:
+    def _extract_custom_field(
+        self, custom_fields: Optional[ET.Element], field_name: str
+    ) -> str:
         """Extract custom field value"""
-        custom_fields = test_case.find(".//CustomFields")
         if custom_fields is not None:
-            for field in custom_fields.findall(".//Field"):
-                if field.get("Name") == field_name:
-                    return field.get("Value", "")
+            field = self.backend.find_field(custom_fields, field_name)
+            if field is not None:
+                return field.get("Value", "")
         return ""
 
     def _is_critical_test(self, test_case: ET.Element) -> bool:
@@ -204,51 +814,60 @@ class ToscaResultsParser:
 
     def _extract_duration(self, root: ET.Element) -> timedelta:
         """Extract total execution duration"""
-        duration_elem = root.find(".//Duration")
+        duration_elem = self.backend.find_duration(root)
         if duration_elem is not None:
-            try:
-                # Parse duration string (format: HH:MM:SS or seconds)
-                duration_str = duration_elem.text
-                if ":" in duration_str:
-                    parts = duration_str.split(":")
-                    hours = int(parts[0])
-                    minutes = int(parts[1])
-                    seconds = int(float(parts[2]))
-                    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
-                else:
-                    return timedelta(seconds=float(duration_str))
-            except:
-                pass
+            return self._parse_duration(duration_elem.text)
+
+        return timedelta()
+
+    def _parse_duration(self, duration_str: str) -> timedelta:
+        """Parse duration string (format: HH:MM:SS or seconds)"""
+        try:
+            if ":" in duration_str:
+                parts = duration_str.split(":")
+                hours = int(parts[0])
+                minutes = int(parts[1])
+                seconds = int(float(parts[2]))
+                return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+            else:
+                return timedelta(seconds=float(duration_str))
+        except:
+            pass
 
         return timedelta()
 
     def _calculate_summary(self, total_duration: timedelta):
         """Calculate summary statistics"""
-        for test in self.results["test_results"]:
-            self.results["total"] += 1
-            status = test["status"]
-
-            if status == "Passed":
-                self.results["passed"] += 1
-            elif status == "Failed":
-                self.results["failed"] += 1
-            elif status == "Skipped":
-                self.results["skipped"] += 1
-            elif status == "Blocked":
-                self.results["blocked"] += 1
+        for test in self.records:
+            self._count_result(test)
 
         # Calculate pass rate
-        if self.results["total"] > 0:
-            self.results["passRate"] = round(
-                (self.results["passed"] / self.results["total"]) * 100, 2
+        if self.summary["total"] > 0:
+            self.summary["passRate"] = round(
+                (self.summary["passed"] / self.summary["total"]) * 100, 2
             )
 
         # Format duration
         hours = int(total_duration.total_seconds() // 3600)
         minutes = int((total_duration.total_seconds() % 3600) // 60)
         seconds = int(total_duration.total_seconds() % 60)
-        self.results["duration"] = f"{hours}:{minutes:02d}:{seconds:02d}"
+        self.summary["duration"] = f"{hours}:{minutes:02d}:{seconds:02d}"
 
+    def _count_result(self, test: TestResult):
+        """Add one test record to the summary counters"""
+        self.summary["total"] += 1
+        status = test.status
+
+        if status == "Passed":
+            self.summary["passed"] += 1
+        elif status == "Failed":
+            self.summary["failed"] += 1
+        elif status == "Skipped":
+            self.summary["skipped"] += 1
+        elif status == "Blocked":
+            self.summary["blocked"] += 1
+
+    @timed("tosca_save_seconds")
     def save_results(self, output_file: str, output_format: str = "json"):
         """Save parsed results to file"""
         output_path = Path(output_file)
@@ -256,51 +875,480 @@ class ToscaResultsParser:
 
         if output_format == "json":
             with open(output_path, "w") as f:
-                json.dump(self.results, f, indent=2)
+                document = {**self.summary, "test_results": self.records}
+                json.dump(document, f, indent=2, default=TestResult.to_dict)
             print(f"✅ Results saved to: {output_path}")
+        elif output_format == "ndjson":
+            writer = NdjsonResultsWriter(output_path)
+            for test in self.records:
+                writer.write(test)
+            writer.close(self.summary)
+            print(f"✅ Results saved to: {output_path}")
+            print(f"✅ Summary saved to: {writer.summary_path}")
+        elif output_format in COLUMNAR_FORMATS:
+            self._save_columnar(output_path, output_format)
         else:
             print(f"❌ Unsupported format: {output_format}")
 
+        record_saved(output_path)
+
+    def _save_columnar(self, output_path: Path, output_format: str):
+        """Save test results as a typed table plus a summary sidecar"""
+        try:
+            frame = self.results_frame()
+        except ImportError:
+            print(f"❌ pandas is required for {output_format} output")
+            return
+
+        try:
+            getattr(frame, COLUMNAR_FORMATS[output_format])(output_path)
+        except ImportError as e:
+            print(f"❌ Cannot write {output_format}: {e}")
+            return
+
+        summary_path = summary_path_for(output_path)
+        with open(summary_path, "w") as f:
+            json.dump(self.summary, f, indent=2)
+
+        print(f"✅ Results saved to: {output_path} ({len(frame)} rows)")
+        print(f"✅ Summary saved to: {summary_path}")
+
+    def results_frame(self) -> "pandas.DataFrame":
+        """Test results as a pandas DataFrame with analytics-friendly dtypes"""
+        # Imported on first use: pandas adds ~0.4s to every run otherwise
+        import pandas as pd
+
+        tests = self.records
+        columns = {
+            field: [getattr(test, field) for test in tests]
+            for field in TestResult.__slots__
+        }
+        columns["screenshots"] = [list(paths) for paths in columns["screenshots"]]
+
+        frame = pd.DataFrame(columns)
+        for field in CATEGORICAL_FIELDS:
+            frame[field] = frame[field].astype("category")
+
+        # Timestamps and numbers are parsed once here, not on every query
+        frame["duration"] = frame["duration"].astype("int64")
+        frame["execution_time"] = pd.to_numeric(
+            frame["execution_time"], errors="coerce"
+        )
+        for field in ("start_time", "end_time"):
+            frame[field] = pd.to_datetime(
+                frame[field], utc=True, format="ISO8601", errors="coerce"
+            )
+        frame.insert(0, "execution_date", pd.Timestamp(self.summary["execution_date"]))
+
+        return frame
+
     def print_summary(self):
         """Print execution summary to console"""
         print("\n" + "=" * 60)
         print("  TOSCA EXECUTION SUMMARY")
         print("=" * 60)
-        print(f"Total Tests:   {self.results['total']}")
-        print(f"Passed:        {self.results['passed']} ({self.results['passRate']}%)")
-        print(f"Failed:        {self.results['failed']}")
-        print(f"Skipped:       {self.results['skipped']}")
-        print(f"Blocked:       {self.results['blocked']}")
-        print(f"Duration:      {self.results['duration']}")
+        print(f"Total Tests:   {self.summary['total']}")
+        print(f"Passed:        {self.summary['passed']} ({self.summary['passRate']}%)")
+        print(f"Failed:        {self.summary['failed']}")
+        print(f"Skipped:       {self.summary['skipped']}")
+        print(f"Blocked:       {self.summary['blocked']}")
+        print(f"Duration:      {self.summary['duration']}")
         print("=" * 60 + "\n")
 
 
+class TestCaseEvents:
+    """Turns start/end parse events into test records as TestCases close.
+
+    Keeps its place between calls to records(), so a document can be fed
+    in pieces as it is written. Only the open ancestor chain and the current
+    TestCase stay in memory. Nested TestCases are converted with their
+    outermost TestCase so the records keep the document order of
+    root.findall(".//TestCase").
+    """
+
+    def __init__(self, parser: ToscaResultsParser):
+        self.parser = parser
+        self.ancestors = []
+        self.test_case_depth = 0
+        self.duration_elem = None
+        self.duration_text = None
+        # True once the root element has closed
+        self.complete = False
+
+    def records(self, events) -> Iterator[TestResult]:
+        """Yield the records of the TestCases the events close"""
+        ancestors = self.ancestors
+
+        for event, elem in events:
+            if event == "start":
+                if elem.tag == "TestCase":
+                    self.test_case_depth += 1
+                elif (
+                    elem.tag == "Duration" and self.duration_elem is None and ancestors
+                ):
+                    self.duration_elem = elem
+                ancestors.append(elem)
+                continue
+
+            ancestors.pop()
+            if not ancestors:
+                self.complete = True
+
+            if elem is self.duration_elem:
+                self.duration_text = elem.text
+
+            if elem.tag != "TestCase":
+                continue
+
+            self.test_case_depth -= 1
+            if self.test_case_depth > 0:
+                continue
+
+            # The root element is not matched by ".//TestCase"
+            if ancestors:
+                yield from self.parser._convert_test_cases(elem.iter("TestCase"))
+            else:
+                yield from self.parser._parse_test_cases(elem)
+
+            elem.clear()
+            if ancestors:
+                ancestors[-1].remove(elem)
+
+    def duration(self) -> timedelta:
+        """Execution duration read so far"""
+        if self.duration_elem is None:
+            return timedelta()
+        return self.parser._parse_duration(self.duration_text)
+
+
+def summary_path_for(results_file: str) -> Path:
+    """Sidecar summary file written next to an NDJSON results file"""
+    return Path(results_file).with_suffix(".summary.json")
+
+
+class NdjsonResultsWriter:
+    """Writes one test record per line and the summary to a sidecar file"""
+
+    def __init__(self, output_file: str):
+        self.output_path = Path(output_file)
+        self.summary_path = summary_path_for(output_file)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_path, "w", encoding="utf-8")
+
+    def write(self, test: TestResult):
+        self._file.write(json.dumps(test.to_dict(), separators=(",", ":")))
+        self._file.write("\n")
+
+    def close(self, summary: Dict):
+        self._file.close()
+        counters = {k: v for k, v in summary.items() if k != "test_results"}
+        with open(self.summary_path, "w") as f:
+            json.dump(counters, f, indent=2)
+
+
+class JsonResultsWriter:
+    """Streams a results JSON document with the summary after the records.
+
+    Each test record sits on its own line, so the file can be read back
+    incrementally as well as with a plain json.load.
+    """
+
+    def __init__(self, output_file: str, execution_date: str):
+        self.output_path = Path(output_file)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_path, "w", encoding="utf-8")
+        self._file.write(f'{{"execution_date": {json.dumps(execution_date)},\n')
+        self._file.write('"test_results": [')
+        self._separator = "\n"
+
+    def write(self, test: TestResult):
+        self._file.write(self._separator)
+        self._file.write(json.dumps(test.to_dict(), separators=(",", ":")))
+        self._separator = ",\n"
+
+    def close(self, summary: Dict):
+        self._file.write("\n]")
+        for key, value in summary.items():
+            if key not in ("execution_date", "test_results"):
+                self._file.write(f",\n{json.dumps(key)}: {json.dumps(value)}")
+        self._file.write("}\n")
+        self._file.close()
+
+
+class ResultsWatcher:
+    """Follows a results directory while Tosca is still writing to it.
+
+    poll() reads on from where it stopped in every XML file whose size or
+    modification time changed, feeding the new bytes to that file's pull
+    parser, and returns the test records of the TestCases closed since. A
+    file that shrank was replaced, so it is parsed again from the start and
+    the records already taken from it are skipped. Returned records are
+    added to the parser's summary counters.
+
+    With watchdog installed, file system events (inotify on Linux) end the
+    wait between scans early; otherwise the directory is polled every
+    poll_interval seconds.
+    """
+
+    def __init__(
+        self, parser: ToscaResultsParser, poll_interval: float = WATCH_POLL_INTERVAL
+    ):
+        self.parser = parser
+        self.poll_interval = poll_interval
+        self.files: Dict[Path, Dict] = {}
+        self.last_change = time.monotonic()
+        self._wakeup = threading.Event()
+        self._observer = None
+
+    def start(self):
+        """Listen for file system events, or announce polling without watchdog"""
+        results_dir = self.parser.results_dir
+        if Observer is not None:
+            try:
+                observer = Observer()
+                observer.schedule(
+                    _WakeOnXmlChange(self._wakeup), str(results_dir), recursive=True
+                )
+                observer.start()
+            except OSError as e:
+                print(f"⚠️ File system events unavailable ({e}), polling instead")
+            else:
+                self._observer = observer
+                print(f"👀 Watching {results_dir} for result files")
+                return
+        print(f"👀 Polling {results_dir} every {self.poll_interval:g}s")
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def wake(self):
+        """End the current or next wait() early"""
+        self._wakeup.set()
+
+    def wait(self):
+        """Sleep until a result file changes or the poll interval has passed"""
+        if self._wakeup.wait(self.poll_interval):
+            time.sleep(WATCH_SETTLE_TIME)
+        self._wakeup.clear()
+
+    def poll(self) -> List[TestResult]:
+        """Test records added to the result files since the last poll"""
+        new_tests = []
+        for xml_file in sorted(self.parser.results_dir.glob("**/*.xml")):
+            try:
+                stat = xml_file.stat()
+            except OSError:
+                # Removed or renamed since the directory was listed
+                continue
+
+            state = self.files.setdefault(
+                xml_file,
+                {"signature": None, "taken": 0, "duration": None, "events": None},
+            )
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if state["signature"] == signature:
+                continue
+            state["signature"] = signature
+            self.last_change = time.monotonic()
+            if state["events"] is None or stat.st_size < state["offset"]:
+                self._restart(state)
+            new_tests.extend(self._read_new(xml_file, state))
+
+        for test in new_tests:
+            self.parser._count_result(test)
+        durations = (state["duration"] or timedelta() for state in self.files.values())
+        self.parser._calculate_summary(sum(durations, timedelta()))
+        return new_tests
+
+    def _restart(self, state: Dict):
+        """Parse a file from its first byte, skipping the records already taken"""
+        state.update(
+            offset=0,
+            skip=state["taken"],
+            pull_parser=self.parser.backend.pull_parser(),
+            events=TestCaseEvents(self.parser),
+            duration=None,
+        )
+
+    def _read_new(self, xml_file: Path, state: Dict) -> List[TestResult]:
+        """Records of the TestCases closed in the bytes added to a file"""
+        pull_parser, events = state["pull_parser"], state["events"]
+        new_tests = []
+
+        with timer("tosca_parse_file_seconds"):
+            try:
+                with open(xml_file, "rb") as f:
+                    f.seek(state["offset"])
+                    for chunk in iter(lambda: f.read(WATCH_READ_SIZE), b""):
+                        pull_parser.feed(chunk)
+                        state["offset"] += len(chunk)
+                        for test in events.records(pull_parser.read_events()):
+                            if state["skip"]:
+                                state["skip"] -= 1
+                            else:
+                                new_tests.append(test)
+            except SyntaxError as e:
+                # Not well-formed XML; parsed again once the file changes
+                print(f"⚠️ Cannot parse {xml_file} yet: {e}")
+                state["events"] = None
+            except OSError:
+                # Locked by the writer or replaced mid-read; retry next poll
+                state["signature"] = None
+
+        if events.complete:
+            state["duration"] = events.duration()
+            # Done with the file; a later change means it was rewritten
+            state["events"] = state["pull_parser"] = None
+        state["taken"] += len(new_tests)
+        inc("tosca_parsed_tests_total", len(new_tests))
+        return new_tests
+
+    def incomplete_files(self) -> List[Path]:
+        """Files whose last read stopped before the end of the document"""
+        return [
+            xml_file
+            for xml_file, state in self.files.items()
+            if state["duration"] is None
+        ]
+
+
+class _WakeOnXmlChange:
+    """watchdog event handler that ends a ResultsWatcher's wait on XML changes"""
+
+    def __init__(self, wakeup: threading.Event):
+        self.wakeup = wakeup
+
+    def dispatch(self, event):
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if any(str(path).endswith(".xml") for path in paths):
+            self.wakeup.set()
+
+
+def record_saved(output_path: Path):
+    """Count the bytes of a written results file"""
+    if output_path.exists():
+        inc("tosca_saved_bytes_total", output_path.stat().st_size)
+
+
+def _parse_file_worker(
+    xml_file: Path, options: Dict
+) -> Tuple[Tuple[List[TestResult], timedelta], float]:
+    """Process pool entry point: parse one file with a fresh parser.
+
+    The parse time is returned with the result, because metrics recorded in
+    the worker process never reach the parent.
+    """
+    started = time.perf_counter()
+    result = ToscaResultsParser(xml_file.parent, **options)._parse_file(xml_file)
+    return result, time.perf_counter() - started
+
+
+def _worker_result(future) -> Tuple[List[TestResult], timedelta]:
+    """Parse result of a _parse_file_worker job, recording its parse time"""
+    result, seconds = future.result()
+    observe("tosca_parse_file_seconds", seconds)
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse Tosca execution results")
     parser.add_argument(
         "--results-dir", required=True, help="Directory containing XML results"
     )
     parser.add_argument(
-        "--output-format", default="json", choices=["json"], help="Output format"
+        "--output-format",
+        default="json",
+        choices=["json", "ndjson", *COLUMNAR_FORMATS],
+        help="Output format (all but json write a .summary.json sidecar)",
     )
     parser.add_argument("--output-file", required=True, help="Output file path")
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Write test records while parsing instead of holding them in memory",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Parse with iterparse to keep memory flat on very large XML files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse XML files across N processes (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--backend",
+        default="auto",
+        choices=["auto", *PARSER_BACKENDS],
+        help="XML parser backend (auto prefers lxml when installed)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse per-file parse results stored here for unchanged XML files",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write parse and save timings here "
+        "(Prometheus text format for .prom/.txt, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write cProfile stats of the parsing stage to this file "
+        "(worker processes are not included)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
 
     args = parser.parse_args()
 
     # Parse results
     print(f"📊 Parsing Tosca results from: {args.results_dir}")
-    parser_obj = ToscaResultsParser(args.results_dir)
-    results = parser_obj.parse_xml_results()
+    try:
+        parser_obj = ToscaResultsParser(
+            args.results_dir,
+            streaming=args.streaming,
+            workers=args.workers,
+            cache_dir=args.cache_dir,
+            backend=args.backend,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    # NDJSON is always streamed; JSON only when asked to
+    writer = None
+    if args.output_format == "ndjson":
+        writer = NdjsonResultsWriter(args.output_file)
+    elif args.stream_output and args.output_format == "json":
+        writer = JsonResultsWriter(
+            args.output_file, parser_obj.summary["execution_date"]
+        )
+
+    with profiled(args.profile):
+        parser_obj.parse_records(record_sink=writer.write if writer else None)
 
     # Print summary
     parser_obj.print_summary()
 
     # Save results
-    parser_obj.save_results(args.output_file, args.output_format)
+    if writer:
+        with timer("tosca_save_seconds"):
+            writer.close(parser_obj.summary)
+        record_saved(Path(args.output_file))
+        print(f"✅ Results saved to: {args.output_file}")
+        if args.output_format == "ndjson":
+            print(f"✅ Summary saved to: {writer.summary_path}")
+    else:
+        parser_obj.save_results(args.output_file, args.output_format)
+
+    save_metrics(args.metrics_file)
 
     # Exit with appropriate code
-    if results["failed"] > 0:
+    if parser_obj.summary["failed"] > 0:
         sys.exit(1)
     else:
         sys.exit(0)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Tosca Execution History Store
+Keeps parsed results of every build in SQLite for flaky and slow test analysis
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Results files are read with the integration scripts' streaming reader
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "integration-scripts"))
+
+from results_stream import load_results
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    build_id     INTEGER PRIMARY KEY,
+    build        TEXT NOT NULL UNIQUE,
+    executed_at  TEXT NOT NULL,
+    total        INTEGER NOT NULL DEFAULT 0,
+    passed       INTEGER NOT NULL DEFAULT 0,
+    failed       INTEGER NOT NULL DEFAULT 0,
+    skipped      INTEGER NOT NULL DEFAULT 0,
+    blocked      INTEGER NOT NULL DEFAULT 0,
+    pass_rate    REAL NOT NULL DEFAULT 0,
+    duration     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS test_results (
+    build_id     INTEGER NOT NULL REFERENCES builds(build_id) ON DELETE CASCADE,
+    test_key     TEXT NOT NULL,
+    name         TEXT NOT NULL,
+    module       TEXT NOT NULL,
+    suite        TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    duration     INTEGER NOT NULL,
+    critical     INTEGER NOT NULL
+);
+
+-- "Last N builds" windows
+CREATE INDEX IF NOT EXISTS idx_builds_executed_at
+    ON builds(executed_at, build_id);
+
+-- Per-test history (failure rates, newly failing)
+CREATE INDEX IF NOT EXISTS idx_results_test_build
+    ON test_results(test_key, build_id, status);
+
+-- Per-build scans by status
+CREATE INDEX IF NOT EXISTS idx_results_build_status
+    ON test_results(build_id, status, test_key);
+
+-- Per-module duration percentiles
+CREATE INDEX IF NOT EXISTS idx_results_module_build
+    ON test_results(module, build_id, duration);
+"""
+
+RECENT_BUILDS = """
+    SELECT build_id FROM builds
+    ORDER BY executed_at DESC, build_id DESC
+    LIMIT ?
+"""
+
+LATEST_BUILD = """
+    SELECT build_id FROM builds
+    ORDER BY executed_at DESC, build_id DESC
+    LIMIT 1
+"""
+
+
+class ResultsHistory:
+    """SQLite-backed history of Tosca test results across builds"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(
+        self,
+        summary: Dict,
+        test_results: Iterable[Dict],
+        build: str,
+        executed_at: Optional[str] = None,
+    ) -> int:
+        """Store one build's results, replacing any earlier ingest of it"""
+        executed_at = executed_at or summary.get("execution_date")
+        executed_at = executed_at or datetime.now().isoformat()
+
+        with self.conn:
+            self.conn.execute("DELETE FROM builds WHERE build = ?", (build,))
+            cursor = self.conn.execute(
+                """
+                INSERT INTO builds (build, executed_at, total, passed, failed,
+                                    skipped, blocked, pass_rate, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    build,
+                    executed_at,
+                    summary.get("total", 0),
+                    summary.get("passed", 0),
+                    summary.get("failed", 0),
+                    summary.get("skipped", 0),
+                    summary.get("blocked", 0),
+                    summary.get("passRate", 0.0),
+                    summary.get("duration"),
+                ),
+            )
+            build_id = cursor.lastrowid
+            self.conn.executemany(
+                """
+                INSERT INTO test_results (build_id, test_key, name, module, suite,
+                                          status, duration, critical)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (self._result_row(build_id, test) for test in test_results),
+            )
+
+        return build_id
+
+    def failure_rates(self, last_builds: int = 20, limit: int = 50) -> List[Dict]:
+        """Tests that failed in the last N builds, highest failure rate first.
+
+        Tests that also passed in the window are flagged as flaky.
+        """
+        rows = self.conn.execute(
+            f"""
+            SELECT test_key,
+                   MAX(name) AS name,
+                   MAX(module) AS module,
+                   COUNT(*) AS runs,
+                   SUM(status = 'Failed') AS failures,
+                   SUM(status = 'Passed') AS passes,
+                   ROUND(100.0 * SUM(status = 'Failed') / COUNT(*), 2)
+                       AS failure_rate
+            FROM test_results
+            WHERE build_id IN ({RECENT_BUILDS})
+            GROUP BY test_key
+            HAVING failures > 0
+            ORDER BY failure_rate DESC, failures DESC, test_key
+            LIMIT ?
+            """,
+            (last_builds, limit),
+        )
+        return [dict(row, flaky=row["passes"] > 0) for row in rows]
+
+    def duration_percentiles(
+        self, percentile: float = 0.95, last_builds: int = 20
+    ) -> List[Dict]:
+        """Nearest-rank duration percentile per module over the last N builds"""
+        rows = self.conn.execute(
+            f"""
+            WITH ranked AS (
+                SELECT module,
+                       duration,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY module ORDER BY duration
+                       ) AS rank,
+                       COUNT(*) OVER (PARTITION BY module) AS runs
+                FROM test_results
+                WHERE build_id IN ({RECENT_BUILDS})
+            )
+            SELECT module, runs, MIN(duration) AS duration
+            FROM ranked
+            WHERE rank >= ? * runs
+            GROUP BY module, runs
+            ORDER BY duration DESC, module
+            """,
+            (last_builds, percentile),
+        )
+        return [dict(row) for row in rows]
+
+    def newly_failing(self, since_build: str) -> List[Dict]:
+        """Tests failing in the latest build that were not failing in since_build"""
+        since = self.conn.execute(
+            "SELECT build_id, executed_at FROM builds WHERE build = ?",
+            (since_build,),
+        ).fetchone()
+        if since is None:
+            raise KeyError(f"Build {since_build} is not in the history store")
+
+        rows = self.conn.execute(
+            f"""
+            SELECT r.test_key,
+                   r.name,
+                   r.module,
+                   (SELECT COUNT(*)
+                    FROM test_results h JOIN builds b ON b.build_id = h.build_id
+                    WHERE h.test_key = r.test_key
+                      AND h.status = 'Failed'
+                      AND b.executed_at > :since_at) AS failing_builds
+            FROM test_results r
+            WHERE r.build_id = ({LATEST_BUILD})
+              AND r.status = 'Failed'
+              AND NOT EXISTS (
+                  SELECT 1 FROM test_results p
+                  WHERE p.build_id = :since_id
+                    AND p.test_key = r.test_key
+                    AND p.status = 'Failed'
+              )
+            ORDER BY failing_builds DESC, r.test_key
+            """,
+            {"since_id": since["build_id"], "since_at": since["executed_at"]},
+        )
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _result_row(build_id: int, test: Dict) -> tuple:
+        name = test.get("name", "Unknown Test")
+        return (
+            build_id,
+            test.get("test_case_id") or name,
+            name,
+            test.get("module", "N/A"),
+            test.get("suite", "N/A"),
+            test.get("status", "Failed"),
+            int(test.get("duration") or 0),
+            1 if test.get("critical") else 0,
+        )
+
+
+def ingest_results_file(history, results_file, build, executed_at=None):
+    """Load a results file into the history store"""
+    results = load_results(results_file)
+    test_results = results.pop("test_results")
+    try:
+        history.ingest(results, test_results, build, executed_at)
+    except (OSError, ValueError) as e:
+        print(f"❌ Failed to load results file: {e}")
+        sys.exit(1)
+
+    print(f"✅ Stored build {build} in {history.db_path}")
+
+
+def print_rows(title: str, rows: List[Dict], as_json: bool):
+    """Print query results as a table or as JSON"""
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+    if not rows:
+        print("No matching tests")
+    for row in rows:
+        print("  ".join(f"{key}={value}" for key, value in row.items()))
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query Tosca execution history")
+    parser.add_argument("--db", required=True, help="SQLite history database")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Store a parsed results file")
+    ingest.add_argument("--results", required=True, help="Results JSON/NDJSON file")
+    ingest.add_argument("--build-number", required=True, help="Build number")
+    ingest.add_argument("--executed-at", help="ISO timestamp (default: from results)")
+
+    failure_rate = commands.add_parser(
+        "failure-rate", help="Failure rate per test over the last N builds"
+    )
+    failure_rate.add_argument("--last", type=int, default=20, help="Builds to scan")
+    failure_rate.add_argument("--limit", type=int, default=50, help="Rows to show")
+
+    percentile = commands.add_parser(
+        "duration-percentile", help="Duration percentile per module"
+    )
+    percentile.add_argument("--last", type=int, default=20, help="Builds to scan")
+    percentile.add_argument(
+        "--percentile", type=float, default=0.95, help="Percentile (0-1)"
+    )
+
+    newly_failing = commands.add_parser(
+        "newly-failing", help="Tests failing now that were not failing in a build"
+    )
+    newly_failing.add_argument("--since", required=True, help="Baseline build")
+
+    args = parser.parse_args()
+
+    history = ResultsHistory(args.db)
+    try:
+        if args.command == "ingest":
+            ingest_results_file(
+                history, args.results, args.build_number, args.executed_at
+            )
+        elif args.command == "failure-rate":
+            rows = history.failure_rates(args.last, args.limit)
+            print_rows(f"FAILURE RATE (last {args.last} builds)", rows, args.json)
+        elif args.command == "duration-percentile":
+            rows = history.duration_percentiles(args.percentile, args.last)
+            title = f"P{args.percentile * 100:g} DURATION BY MODULE"
+            print_rows(f"{title} (last {args.last} builds)", rows, args.json)
+        elif args.command == "newly-failing":
+            rows = history.newly_failing(args.since)
+            print_rows(f"NEWLY FAILING SINCE BUILD {args.since}", rows, args.json)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
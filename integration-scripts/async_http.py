@@ -0,0 +1,166 @@
+"""
+Async HTTP Layer for Integration Scripts
+aiohttp client with a bounded connection pool, per-host pacing and retries,
+used by the asyncio variants of the JIRA/Xray and qTest clients
+"""
+
+import asyncio
+import json
+import mimetypes
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+try:
+    import aiohttp
+except ImportError:  # asyncio clients are optional
+    aiohttp = None
+
+from http_session import DEFAULT_POOL_SIZE
+from request_scheduler import (
+    DEFAULT_MAX_RETRIES,
+    IDEMPOTENT_METHODS,
+    RequestScheduler,
+)
+
+
+class ApiError(Exception):
+    """Non-success HTTP response from an async request"""
+
+    def __init__(self, response):
+        super().__init__(
+            f"{response.status_code} Error: {response.reason} for url: {response.url}"
+        )
+        self.response = response
+
+
+class ApiResponse:
+    """Fully read response, with the parts of requests.Response the clients use"""
+
+    def __init__(self, status_code, reason, headers, content, url):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ApiError(self)
+
+
+def request_errors():
+    """Exceptions a failed async request can raise"""
+    return (ApiError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+@contextmanager
+def multipart_form(file_path, field_name="file"):
+    """Multipart form that aiohttp streams from the file as it is sent.
+
+    The file is closed on leaving the block, whether or not the request
+    got as far as sending it.
+    """
+    filename = Path(file_path).name
+    with open(file_path, "rb") as f:
+        form = aiohttp.FormData()
+        form.add_field(
+            field_name,
+            f,
+            filename=filename,
+            content_type=mimetypes.guess_type(filename)[0]
+            or "application/octet-stream",
+        )
+        yield form
+
+
+class AsyncHttpClient:
+    """Shared aiohttp session multiplexing requests over a few connections.
+
+    max_connections bounds both the connection pool and the number of
+    requests in flight; 429/503 responses are retried like the sync session.
+    """
+
+    def __init__(
+        self,
+        max_connections=DEFAULT_POOL_SIZE,
+        max_rps=None,
+        max_retries=DEFAULT_MAX_RETRIES,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the asyncio clients")
+        self.max_connections = max_connections
+        self.scheduler = RequestScheduler(max_rps, max_retries)
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        # Shielded so a cancelled run still releases its connections
+        if self._session is not None:
+            session, self._session = self._session, None
+            await asyncio.shield(session.close())
+
+    async def request(self, method, url, data=None, **kwargs):
+        """Send a request, retrying throttled responses; return an ApiResponse.
+
+        data may be a callable returning a context manager around a fresh
+        body for every attempt, e.g. multipart_form() for a file upload.
+        """
+        scheduler = self.scheduler
+        bucket = scheduler.bucket(url)
+        attempt = 0
+
+        while True:
+            await bucket.acquire_async()
+            try:
+                async with self.semaphore:
+                    with data() if callable(data) else nullcontext(data) as body:
+                        async with self._session.request(
+                            method, url, data=body, **kwargs
+                        ) as response:
+                            result = ApiResponse(
+                                response.status,
+                                response.reason,
+                                response.headers,
+                                await response.read(),
+                                str(response.url),
+                            )
+            except aiohttp.ClientConnectionError as e:
+                # Resent only if that cannot duplicate work; see
+                # RequestScheduler.send
+                resendable = method.upper() in IDEMPOTENT_METHODS or isinstance(
+                    e, aiohttp.ClientConnectorError
+                )
+                if attempt >= scheduler.max_retries or not resendable:
+                    raise
+                delay = scheduler.backoff(attempt)
+            else:
+                delay = scheduler.retry_delay(result, attempt)
+                if delay is None:
+                    return result
+                bucket.pause(delay)
+
+            attempt += 1
+            scheduler.count_retry(url)
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
@@ -0,0 +1,341 @@
+"""
+Attachment Uploads for Integration Scripts
+Parallel, streaming attachment uploads with a content-addressed upload cache
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from async_http import multipart_form, request_errors
+from ordered_executor import gather_ordered, run_ordered
+
+DEFAULT_UPLOAD_WORKERS = 4
+
+# Bytes of attachment bodies allowed in flight at once
+DEFAULT_UPLOAD_BUDGET = 64 * 1024 * 1024
+
+# Read size when hashing and streaming files
+CHUNK_SIZE = 1024 * 1024
+
+# Cached targets not attached to for this long are forgotten on save
+DEFAULT_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Most recently used targets kept in the saved cache
+DEFAULT_CACHE_MAX_TARGETS = 10000
+
+
+def file_digest(path):
+    """sha256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentCache:
+    """Which content hashes were already uploaded to which issue or test run.
+
+    Persisted as JSON when a path is given, so repeated builds that attach
+    the same screenshot to the same target skip the upload. Targets unused
+    for max_age seconds, and all but the max_targets most recently used,
+    are dropped when the cache is loaded or saved.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        max_age=DEFAULT_CACHE_MAX_AGE,
+        max_targets=DEFAULT_CACHE_MAX_TARGETS,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.max_targets = max_targets
+        self.uploaded = {}
+        # Last time each target was claimed against, in epoch seconds
+        self.used = {}
+        # Claimed blobs still uploading -> asyncio.Event for async waiters
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._settled = threading.Condition(self._lock)
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for target, entry in json.load(f).items():
+                        self.uploaded[target] = set(entry["digests"])
+                        self.used[target] = entry["used"]
+            except (OSError, ValueError, TypeError, KeyError):
+                self.uploaded, self.used = {}, {}
+            self._prune()
+
+    def claim(self, target, digest):
+        """Reserve a blob for upload, False if it is already uploaded.
+
+        While another caller holds the claim this waits for its outcome: a
+        completed upload returns False, a released one is claimed here.
+        """
+        with self._settled:
+            while (target, digest) in self._pending:
+                self._settled.wait()
+            return self._reserve(target, digest)
+
+    async def claim_async(self, target, digest):
+        """claim() for tasks on one event loop"""
+        while True:
+            with self._lock:
+                if (target, digest) not in self._pending:
+                    return self._reserve(target, digest)
+                event = self._pending[(target, digest)]
+                if event is None:
+                    event = self._pending[(target, digest)] = asyncio.Event()
+            await event.wait()
+
+    def _reserve(self, target, digest):
+        self.used[target] = time.time()
+        if digest in self.uploaded.get(target, ()):
+            return False
+        self._pending[(target, digest)] = None
+        return True
+
+    def complete(self, target, digest):
+        """Record a claimed blob as uploaded"""
+        with self._lock:
+            self.uploaded.setdefault(target, set()).add(digest)
+            self._settle(target, digest)
+
+    def release(self, target, digest):
+        """Give up a claimed blob whose upload failed"""
+        with self._lock:
+            self._settle(target, digest)
+
+    def _settle(self, target, digest):
+        event = self._pending.pop((target, digest), None)
+        if event is not None:
+            event.set()
+        self._settled.notify_all()
+
+    def _prune(self):
+        """Drop expired targets and all but the max_targets newest"""
+        cutoff = time.time() - self.max_age
+        recent = sorted(
+            (target for target in self.uploaded if self.used.get(target, 0) > cutoff),
+            key=lambda target: self.used[target],
+            reverse=True,
+        )[: self.max_targets]
+        self.uploaded = {target: self.uploaded[target] for target in recent}
+        self.used = {target: self.used[target] for target in recent}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            self._prune()
+            data = {
+                target: {"used": self.used[target], "digests": sorted(digests)}
+                for target, digests in self.uploaded.items()
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+class StreamingMultipartBody(io.RawIOBase):
+    """multipart/form-data body for one file, read from disk as it is sent.
+
+    Has a length so requests sends Content-Length instead of chunked
+    encoding, and supports seek/tell so a retried request can be rewound.
+    """
+
+    def __init__(self, field_name, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.boundary = uuid.uuid4().hex
+        filename = Path(file_path).name
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._file_size = os.path.getsize(file_path)
+        self._file = open(file_path, "rb")
+        self._position = 0
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self)
+        self._position = max(0, min(offset, len(self)))
+        return self._position
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self) - self._position
+
+        parts = []
+        while size > 0 and self._position < len(self):
+            chunk = self._read_segment(size)
+            parts.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        return b"".join(parts)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def _read_segment(self, size):
+        head_end = len(self._head)
+        file_end = head_end + self._file_size
+        if self._position < head_end:
+            return self._head[self._position : self._position + size]
+        if self._position < file_end:
+            self._file.seek(self._position - head_end)
+            return self._file.read(min(size, file_end - self._position))
+        offset = self._position - file_end
+        return self._tail[offset : offset + size]
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class ByteBudget:
+    """Caps the total size of request bodies in flight across threads"""
+
+    def __init__(self, max_bytes=DEFAULT_UPLOAD_BUDGET):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        # A file larger than the whole budget is sent on its own
+        size = min(size, self.max_bytes)
+        with self._condition:
+            while self.in_flight + size > self.max_bytes:
+                self._condition.wait()
+            self.in_flight += size
+        return size
+
+    def release(self, size):
+        with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
+
+class AttachmentUploader:
+    """Uploads files to an attachment endpoint in parallel, skipping cached blobs"""
+
+    def __init__(
+        self,
+        session,
+        cache=None,
+        max_workers=DEFAULT_UPLOAD_WORKERS,
+        max_bytes=DEFAULT_UPLOAD_BUDGET,
+    ):
+        self.session = session
+        self.cache = cache or AttachmentCache()
+        self.max_workers = max_workers
+        self.budget = ByteBudget(max_bytes)
+
+    def upload(self, target, endpoint, file_paths, headers=None, auth=None):
+        """Yield (file_path, outcome, error) per file, in order.
+
+        outcome is "uploaded", "cached", "missing" or "failed"; target names
+        the issue or run for the upload cache.
+        """
+
+        def upload_one(file_path):
+            if not Path(file_path).exists():
+                return file_path, "missing", None
+            digest = None
+            try:
+                digest = file_digest(file_path)
+                if not self.cache.claim(target, digest):
+                    return file_path, "cached", None
+
+                body = StreamingMultipartBody("file", file_path)
+                reserved = self.budget.acquire(len(body))
+                try:
+                    request_headers = dict(headers or {})
+                    request_headers["Content-Type"] = body.content_type
+                    response = self.session.post(
+                        endpoint, headers=request_headers, auth=auth, data=body
+                    )
+                    response.raise_for_status()
+                finally:
+                    self.budget.release(reserved)
+                    body.close()
+
+                self.cache.complete(target, digest)
+                return file_path, "uploaded", None
+            except Exception as e:
+                if digest is not None:
+                    self.cache.release(target, digest)
+                return file_path, "failed", e
+
+        return run_ordered(upload_one, file_paths, self.max_workers)
+
+    async def upload_async(self, client, target, endpoint, file_paths, headers=None):
+        """upload() through an AsyncHttpClient, as an async iterator"""
+        errors = request_errors()
+
+        async def upload_one(file_path):
+            if not Path(file_path).exists():
+                return file_path, "missing", None
+            try:
+                digest = file_digest(file_path)
+            except OSError as e:
+                return file_path, "failed", e
+            if not await self.cache.claim_async(target, digest):
+                return file_path, "cached", None
+
+            try:
+                response = await client.post(
+                    endpoint, headers=headers, data=lambda: multipart_form(file_path)
+                )
+                response.raise_for_status()
+            except errors + (OSError,) as e:
+                self.cache.release(target, digest)
+                return file_path, "failed", e
+            except BaseException:
+                # Cancelled: let tasks waiting on this blob claim it instead
+                self.cache.release(target, digest)
+                raise
+
+            self.cache.complete(target, digest)
+            return file_path, "uploaded", None
+
+        async for result in gather_ordered(upload_one, file_paths, self.max_workers):
+            yield result
@@ -0,0 +1,167 @@
+"""
+Defect Index for Integration Scripts
+Local index of open automation defects so recurring failures are not re-filed
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+
+import requests
+
+from io_flow import run_flow, run_flow_async
+
+# Label prefix carrying a failure fingerprint on automation defects
+FINGERPRINT_LABEL = "tosca-fp-"
+
+# Issues fetched per page of the open-defect JQL search
+SEARCH_PAGE_SIZE = 500
+
+# Volatile parts of error messages that differ between runs of one failure
+_VOLATILE_PATTERNS = [
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(\.\d+)?(z|[+-][\d:]{4,5})?"
+        ),
+        "<ts>",
+    ),
+    (re.compile(r"\b[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}\b"), "<id>"),
+    (re.compile(r"\b0x[0-9a-f]+\b"), "<hex>"),
+    (re.compile(r"\d+"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_error(message):
+    """Lower-case an error message and mask timestamps, ids and numbers"""
+    message = (message or "").strip().lower()
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+def failure_fingerprint(test):
+    """Fingerprint label for a failed test: its identity plus normalized error"""
+    identity = (
+        test.get("xray_test_key") or test.get("test_case_id") or test.get("name", "")
+    )
+    source = f"{identity}|{normalize_error(test.get('error_message'))}"
+    return FINGERPRINT_LABEL + hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+class DefectIndex:
+    """Fingerprint -> open defect key, persisted to a local JSON file.
+
+    refresh() rebuilds the index from one paged JQL search, so defects closed
+    since the last run drop out. If the search fails, the last saved index
+    is used as is. Concurrent publishers hold lock(fingerprint) from get()
+    to add(), so two failures with one fingerprint file a single defect.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.defects = {}
+        self._lock = threading.Lock()
+        self._fingerprint_locks = {}
+        self._fingerprint_async_locks = {}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.defects = json.load(f)
+            except (OSError, ValueError):
+                self.defects = {}
+
+    def refresh(self, session, jira_url, auth, project_key):
+        """Reload open automation defects from JIRA, return True on success"""
+        errors = (requests.exceptions.RequestException,)
+        return run_flow(
+            self._refresh_flow(session.post, jira_url, project_key, errors, auth=auth)
+        )
+
+    def refresh_async(self, client, jira_url, headers, project_key, errors):
+        """refresh() for an AsyncHttpClient; errors are its request exceptions"""
+        return run_flow_async(
+            self._refresh_flow(
+                client.post, jira_url, project_key, errors, headers=headers
+            )
+        )
+
+    def _refresh_flow(self, post, jira_url, project_key, errors, **options):
+        """Page through the search, yielding each post() for the client to run"""
+        endpoint = f"{jira_url}/rest/api/2/search"
+        defects = {}
+        start_at = 0
+        try:
+            while start_at is not None:
+                response = yield post(
+                    endpoint, json=self._search_query(project_key, start_at), **options
+                )
+                response.raise_for_status()
+                start_at = self._collect_page(response.json(), start_at, defects)
+        except errors + (ValueError, KeyError) as e:
+            print(f"⚠️ Failed to refresh defect index, using cached copy: {e}")
+            return False
+
+        self._replace(defects)
+        return True
+
+    @staticmethod
+    def _search_query(project_key, start_at):
+        jql = (
+            f'project = "{project_key}" AND labels = Automation '
+            "AND labels = TestFailure AND statusCategory != Done"
+        )
+        return {
+            "jql": jql,
+            "fields": ["labels"],
+            "startAt": start_at,
+            "maxResults": SEARCH_PAGE_SIZE,
+        }
+
+    @staticmethod
+    def _collect_page(page, start_at, defects):
+        """Add one search page to defects, return the next startAt or None"""
+        issues = page.get("issues", [])
+        for issue in issues:
+            for label in issue.get("fields", {}).get("labels", []):
+                if label.startswith(FINGERPRINT_LABEL):
+                    defects[label] = issue["key"]
+        start_at += len(issues)
+        if not issues or start_at >= page.get("total", 0):
+            return None
+        return start_at
+
+    def _replace(self, defects):
+        with self._lock:
+            self.defects = defects
+        self.save()
+
+    def lock(self, fingerprint):
+        """Lock serializing get-or-create of one fingerprint across threads"""
+        with self._lock:
+            return self._fingerprint_locks.setdefault(fingerprint, threading.Lock())
+
+    def async_lock(self, fingerprint):
+        """lock() for tasks on one event loop"""
+        with self._lock:
+            return self._fingerprint_async_locks.setdefault(fingerprint, asyncio.Lock())
+
+    def get(self, fingerprint):
+        return self.defects.get(fingerprint)
+
+    def add(self, fingerprint, defect_key):
+        with self._lock:
+            self.defects[fingerprint] = defect_key
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.defects, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
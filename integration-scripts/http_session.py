@@ -0,0 +1,99 @@
+"""
+Shared HTTP Session Layer for Integration Scripts
+Pooled keep-alive sessions reused by the JIRA/Xray and qTest clients, with
+rate limiting and retries for throttled requests
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from request_scheduler import DEFAULT_MAX_RETRIES, RequestScheduler
+
+# Connections kept open per host
+DEFAULT_POOL_SIZE = 10
+
+# Distinct hosts whose connection pools are kept
+DEFAULT_POOL_HOSTS = 4
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class ScheduledSession(requests.Session):
+    """Session whose requests are paced and retried by a RequestScheduler"""
+
+    def __init__(self, scheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def request(self, method, url, **kwargs):
+        send = super().request
+        return self.scheduler.send(
+            method, url, lambda: send(method, url, **kwargs), _rewinder(kwargs)
+        )
+
+
+def _rewinder(kwargs):
+    """Return a callable restoring file bodies to their starting offsets"""
+    bodies = [kwargs.get("data")]
+    files = kwargs.get("files")
+    if isinstance(files, dict):
+        files = files.values()
+    for value in files or ():
+        bodies.append(value[1] if isinstance(value, (tuple, list)) else value)
+
+    offsets = [(body, body.tell()) for body in bodies if hasattr(body, "seek")]
+    if not offsets:
+        return None
+
+    def rewind():
+        for body, offset in offsets:
+            body.seek(offset)
+
+    return rewind
+
+
+def create_session(
+    pool_size=DEFAULT_POOL_SIZE,
+    pool_hosts=DEFAULT_POOL_HOSTS,
+    max_rps=None,
+    max_retries=DEFAULT_MAX_RETRIES,
+):
+    """Create a keep-alive session with a bounded connection pool per host.
+
+    pool_block makes callers wait for a free connection instead of opening
+    extra ones, so pool_size is also the per-host concurrency limit. Requests
+    are capped at max_rps per host and 429/503 responses are retried up to
+    max_retries times.
+    """
+    session = ScheduledSession(RequestScheduler(max_rps, max_retries))
+    adapter = HTTPAdapter(
+        pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session(
+    pool_size=DEFAULT_POOL_SIZE,
+    pool_hosts=DEFAULT_POOL_HOSTS,
+    max_rps=None,
+    max_retries=DEFAULT_MAX_RETRIES,
+):
+    """Return the process-wide session for this pool and rate configuration"""
+    key = (pool_size, pool_hosts, max_rps, max_retries)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = create_session(*key)
+        return _sessions[key]
+
+
+def close_shared_sessions():
+    """Close every shared session and its pooled connections"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,42 @@
+"""
+I/O Flows for Integration Scripts
+Runs control flow written once as a generator with a sync or an asyncio client,
+so the two differ only in how each request is made
+"""
+
+
+def run_flow(flow):
+    """Run a flow with a sync client and return its result.
+
+    A flow is a generator that yields the return value of every client call
+    and is sent it straight back; with a sync client that value is already
+    the call's result, so yield simply passes it through.
+    """
+    result = None
+    while True:
+        try:
+            result = flow.send(result)
+        except StopIteration as done:
+            return done.value
+
+
+async def run_flow_async(flow):
+    """Run a flow with an asyncio client and return its result.
+
+    Every yielded value is an awaitable; its result is sent back into the
+    flow, and an exception it raises is thrown into the flow at the yield.
+    Cancellation is thrown in too, so the flow's finally blocks still run.
+    """
+    result, error = None, None
+    while True:
+        try:
+            if error is None:
+                step = flow.send(result)
+            else:
+                step = flow.throw(error)
+        except StopIteration as done:
+            return done.value
+        try:
+            result, error = await step, None
+        except BaseException as e:
+            result, error = None, e
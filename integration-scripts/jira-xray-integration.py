@@ -5,38 +5,122 @@ Auto-creates defects for failed tests and updates test execution status
 """
 
 import argparse
-import json
+import asyncio
+import base64
 import requests
 import sys
+import threading
+from collections import Counter
 from datetime import datetime
 from requests.auth import HTTPBasicAuth
 
+from async_http import AsyncHttpClient, request_errors
+from attachment_uploads import (
+    DEFAULT_UPLOAD_BUDGET,
+    DEFAULT_UPLOAD_WORKERS,
+    AttachmentCache,
+    AttachmentUploader,
+)
+from defect_index import DefectIndex, failure_fingerprint
+from http_session import DEFAULT_POOL_SIZE, get_shared_session
+from io_flow import run_flow, run_flow_async
+from ordered_executor import gather_ordered, run_ordered
+from pipeline_metrics import api_timer, profiled, record_attachment, save_metrics, timer
+from publish_checkpoint import PublishCheckpoint, stream_test_keys
+from request_scheduler import DEFAULT_MAX_RETRIES
+from results_stream import ResultsFileError, load_results, summary_count
+
+# Tosca result status -> Xray test run status
+XRAY_STATUSES = {
+    "Passed": "PASS",
+    "Failed": "FAIL",
+    "Skipped": "TODO",
+    "Blocked": "ABORTED",
+}
+
+# Test runs sent per Xray execution-results import request
+XRAY_IMPORT_CHUNK_SIZE = 500
+
 
 class JiraXrayIntegration:
     """Handler for JIRA and Xray API integration"""
 
-    def __init__(self, jira_url, username, password, project_key):
+    def __init__(
+        self,
+        jira_url,
+        username,
+        password,
+        project_key,
+        max_workers=1,
+        session=None,
+        bulk=False,
+        bulk_chunk_size=XRAY_IMPORT_CHUNK_SIZE,
+        checkpoint=None,
+        defect_index=None,
+        uploader=None,
+    ):
         self.jira_url = jira_url.rstrip("/")
         self.auth = HTTPBasicAuth(username, password)
         self.project_key = project_key
         self.headers = {"Content-Type": "application/json"}
+        # Upper bound on concurrent JIRA/Xray requests made by process_results
+        self.max_workers = max_workers
+        # Keep-alive connection pool shared with other clients in this process
+        self.session = session or get_shared_session()
+        # Publish Xray statuses through chunked execution-results imports
+        self.bulk = bulk
+        self.bulk_chunk_size = bulk_chunk_size
+        # Completed operations, so a re-run skips what is already published
+        self.checkpoint = checkpoint or PublishCheckpoint(None, None)
+        self._test_keys = {}
+        # Open automation defects by failure fingerprint; None files every failure
+        self.defect_index = defect_index
+        self.known_failures = 0
+        self._known_lock = threading.Lock()
+        # Parallel streaming screenshot uploads, skipping blobs already attached
+        self.uploader = uploader or AttachmentUploader(self.session)
+        self.errors = requests.exceptions.RequestException
+
+    # The publishing control flow is written once, as generator flows that
+    # yield every client call (see io_flow); these hooks are the only part
+    # AsyncJiraXrayIntegration replaces, so its methods return coroutines
+    _run = staticmethod(run_flow)
+    _map = staticmethod(run_ordered)
+
+    def _ordered(self, flow, items):
+        """Results of flow(item) for every item in order, max_workers at a time"""
+        run = self._run
+        return self._map(lambda item: run(flow(item)), items, self.max_workers)
+
+    @staticmethod
+    def _drain(results, consume):
+        """Pass every result of an _ordered() stream to consume"""
+        for result in results:
+            consume(result)
+
+    def _post(self, endpoint, payload):
+        response = self.session.post(
+            endpoint, headers=self.headers, auth=self.auth, json=payload
+        )
+        response.raise_for_status()
+        return response
 
+    def _fingerprint_lock(self, fingerprint):
+        return self.defect_index.lock(fingerprint)
+
+    def _refresh_defect_index(self):
+        return self.defect_index.refresh(
+            self.session, self.jira_url, self.auth, self.project_key
+        )
+
+    @api_timer("jira")
     def create_test_execution(self, build_number, summary_data):
         """Create Xray Test Execution"""
         endpoint = f"{self.jira_url}/rest/api/2/issue"
-
-        payload = {
-            "fields": {
-                "project": {"key": self.project_key},
-                "summary": f"Tosca Test Execution - Build {build_number}",
-                "description": self._format_execution_description(summary_data),
-                "issuetype": {"name": "Test Execution"},
-                "labels": ["Automation", "Tosca", f"Build-{build_number}"],
-            }
-        }
+        payload = self._execution_payload(build_number, summary_data)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 endpoint, headers=self.headers, auth=self.auth, json=payload
             )
             response.raise_for_status()
@@ -49,38 +133,17 @@ class JiraXrayIntegration:
                 print(f"Response: {e.response.text}")
             return None
 
+    @api_timer("jira")
     def create_defect(self, test_result, build_number):
         """Create a defect for a failed test"""
         endpoint = f"{self.jira_url}/rest/api/2/issue"
 
         test_name = test_result.get("name", "Unknown Test")
-        error_msg = test_result.get("error_message", "No error details")
         screenshots = test_result.get("screenshots", [])
-
-        # Determine priority based on test criticality
-        priority = self._determine_priority(test_result)
-
-        payload = {
-            "fields": {
-                "project": {"key": self.project_key},
-                "summary": f"[Automation] {test_name} - Failed",
-                "description": self._format_defect_description(
-                    test_result, build_number
-                ),
-                "issuetype": {"name": "Bug"},
-                "priority": {"name": priority},
-                "labels": [
-                    "Automation",
-                    "Tosca",
-                    "TestFailure",
-                    f"Build-{build_number}",
-                ],
-                "components": [{"name": test_result.get("component", "General")}],
-            }
-        }
+        payload = self._defect_payload(test_result, build_number)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 endpoint, headers=self.headers, auth=self.auth, json=payload
             )
             response.raise_for_status()
@@ -96,23 +159,48 @@ class JiraXrayIntegration:
             print(f"  ❌ Failed to create defect for {test_name}: {e}")
             return None
 
+    @api_timer("jira")
+    def comment_known_failure(self, defect_key, test_result, build_number):
+        """Note a recurring failure on its open defect instead of filing a new one"""
+        endpoint = f"{self.jira_url}/rest/api/2/issue/{defect_key}/comment"
+        test_name = test_result.get("name", "Unknown Test")
+        payload = self._comment_payload(test_result, build_number)
+
+        try:
+            response = self.session.post(
+                endpoint, headers=self.headers, auth=self.auth, json=payload
+            )
+            response.raise_for_status()
+            print(f"  🔁 Known failure: commented on {defect_key} for {test_name}")
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠️ Failed to comment on {defect_key} for {test_name}: {e}")
+            return False
+
+    @api_timer("jira")
     def attach_files(self, issue_key, file_paths):
         """Attach files to JIRA issue"""
         endpoint = f"{self.jira_url}/rest/api/2/issue/{issue_key}/attachments"
         headers = {"X-Atlassian-Token": "no-check"}
-
-        for file_path in file_paths:
-            try:
-                with open(file_path, "rb") as f:
-                    files = {"file": f}
-                    response = requests.post(
-                        endpoint, headers=headers, auth=self.auth, files=files
-                    )
-                    response.raise_for_status()
-                    print(f"    📎 Attached: {file_path}")
-            except Exception as e:
-                print(f"    ⚠️ Failed to attach {file_path}: {e}")
-
+        target = f"jira:{self.jira_url}:{issue_key}"
+
+        for file_path, outcome, error in self.uploader.upload(
+            target, endpoint, file_paths, headers=headers, auth=self.auth
+        ):
+            self._report_attachment(file_path, outcome, error)
+
+    def _report_attachment(self, file_path, outcome, error):
+        record_attachment("jira", file_path, outcome)
+        if outcome == "uploaded":
+            print(f"    📎 Attached: {file_path}")
+        elif outcome == "cached":
+            print(f"    ♻️ Already attached: {file_path}")
+        elif outcome == "missing":
+            print(f"    ⚠️ Failed to attach {file_path}: file not found")
+        else:
+            print(f"    ⚠️ Failed to attach {file_path}: {error}")
+
+    @api_timer("jira")
     def update_test_status(self, test_execution_key, test_key, status):
         """Update test status in Xray"""
         # Xray REST API endpoint for updating test status
@@ -120,17 +208,10 @@ class JiraXrayIntegration:
             f"{self.jira_url}/rest/raven/1.0/api/testexec/{test_execution_key}/test"
         )
 
-        status_mapping = {
-            "Passed": "PASS",
-            "Failed": "FAIL",
-            "Skipped": "TODO",
-            "Blocked": "ABORTED",
-        }
-
-        payload = {"testKey": test_key, "status": status_mapping.get(status, "FAIL")}
+        payload = {"testKey": test_key, "status": XRAY_STATUSES.get(status, "FAIL")}
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 endpoint, headers=self.headers, auth=self.auth, json=payload
             )
             response.raise_for_status()
@@ -139,6 +220,108 @@ class JiraXrayIntegration:
             print(f"  ⚠️ Failed to update status for {test_key}: {e}")
             return False
 
+    def import_execution_results(self, test_execution_key, test_runs, run_keys=None):
+        """Import test run statuses into Xray in chunks, return the number updated.
+
+        run_keys, parallel to test_runs, are checkpointed as each chunk lands.
+        """
+        pairs = list(zip(test_runs, run_keys or [None] * len(test_runs)))
+        chunks = (
+            pairs[i : i + self.bulk_chunk_size]
+            for i in range(0, len(pairs), self.bulk_chunk_size)
+        )
+        return self._run(self._import_chunks_flow(test_execution_key, chunks))
+
+    def _import_chunks_flow(self, test_execution_key, chunks):
+        """Import chunks of (test_run, run_key) pairs, return the number updated"""
+        imported = []
+        yield self._drain(
+            self._ordered(
+                lambda chunk: self._import_chunk_flow(test_execution_key, chunk),
+                chunks,
+            ),
+            imported.append,
+        )
+        return sum(imported)
+
+    def _import_chunk_flow(self, test_execution_key, chunk):
+        endpoint = f"{self.jira_url}/rest/raven/1.0/import/execution"
+        test_runs = [test_run for test_run, _ in chunk]
+        payload = {"testExecutionKey": test_execution_key, "tests": test_runs}
+        with timer("tracker_api_seconds", tracker="jira", method="import_execution"):
+            try:
+                yield self._post(endpoint, payload)
+            except self.errors as e:
+                first, last = test_runs[0]["testKey"], test_runs[-1]["testKey"]
+                print(f"  ⚠️ Failed to import statuses for {first}..{last}: {e}")
+                return 0
+        self._record_imported(chunk)
+        return len(chunk)
+
+    def _record_imported(self, chunk):
+        run_keys = [run_key for _, run_key in chunk if run_key is not None]
+        if run_keys:
+            self.checkpoint.record_many("status", run_keys)
+
+    def _execution_payload(self, build_number, summary_data):
+        return {
+            "fields": {
+                "project": {"key": self.project_key},
+                "summary": f"Tosca Test Execution - Build {build_number}",
+                "description": self._format_execution_description(summary_data),
+                "issuetype": {"name": "Test Execution"},
+                "labels": ["Automation", "Tosca", f"Build-{build_number}"],
+            }
+        }
+
+    def _defect_payload(self, test_result, build_number):
+        test_name = test_result.get("name", "Unknown Test")
+
+        # Determine priority based on test criticality
+        priority = self._determine_priority(test_result)
+
+        return {
+            "fields": {
+                "project": {"key": self.project_key},
+                "summary": f"[Automation] {test_name} - Failed",
+                "description": self._format_defect_description(
+                    test_result, build_number
+                ),
+                "issuetype": {"name": "Bug"},
+                "priority": {"name": priority},
+                "labels": [
+                    "Automation",
+                    "Tosca",
+                    "TestFailure",
+                    f"Build-{build_number}",
+                    failure_fingerprint(test_result),
+                ],
+                "components": [{"name": test_result.get("component", "General")}],
+            }
+        }
+
+    def _comment_payload(self, test_result, build_number):
+        return {
+            "body": (
+                f"Failed again in build {build_number} "
+                f"(executed {test_result.get('execution_time', 'N/A')}).\n"
+                f"{{code}}\n{test_result.get('error_message', '')}\n{{code}}"
+            )
+        }
+
+    def _xray_test_run(self, test, defect_key=None):
+        """Build one Xray import entry for a test result"""
+        status = test.get("status")
+        test_run = {
+            "testKey": test["xray_test_key"],
+            "status": XRAY_STATUSES.get(status, "FAIL"),
+        }
+        if status == "Failed" and test.get("error_message"):
+            test_run["comment"] = test["error_message"]
+        if defect_key:
+            test_run["defects"] = [defect_key]
+        return test_run
+
     def _format_execution_description(self, summary):
         """Format test execution description"""
         return f"""
@@ -203,97 +386,633 @@ _This defect was automatically created by Tosca automation_
 
         return "Medium"
 
+    def _file_defect_flow(self, test, build_number):
+        """Create a defect for a failed test unless an earlier run already did"""
+        key = self._test_keys[id(test)]
+        defect_key = self.checkpoint.get("defect", key)
+        if defect_key:
+            print(f"  ⏭️ Defect {defect_key} already filed for {test.get('name')}")
+            return defect_key
+
+        if self.defect_index is None:
+            return (yield from self._new_defect_flow(test, build_number, key))
+
+        fingerprint = failure_fingerprint(test)
+        lock = self._fingerprint_lock(fingerprint)
+        yield lock.acquire()
+        try:
+            known_key = self.defect_index.get(fingerprint)
+            # Falls through to a new defect if the known one cannot be updated
+            if known_key and (
+                yield self.comment_known_failure(known_key, test, build_number)
+            ):
+                with self._known_lock:
+                    self.known_failures += 1
+                self.checkpoint.record("defect", key, known_key)
+                return known_key
+
+            defect_key = yield from self._new_defect_flow(test, build_number, key)
+            if defect_key:
+                self.defect_index.add(fingerprint, defect_key)
+            return defect_key
+        finally:
+            lock.release()
+
+    def _new_defect_flow(self, test, build_number, key):
+        defect_key = yield self.create_defect(test, build_number)
+        if defect_key:
+            self.checkpoint.record("defect", key, defect_key)
+        return defect_key
+
+    def _update_status_flow(self, execution_key, test, status):
+        """Update a test's Xray status unless an earlier run already did"""
+        key = self._test_keys[id(test)]
+        if self.checkpoint.done("status", key):
+            return True
+        if (
+            yield self.update_test_status(execution_key, test["xray_test_key"], status)
+        ):
+            self.checkpoint.record("status", key)
+            return True
+        return False
+
+    def _publish_failure_flow(self, test, build_number, execution_key):
+        """Create a defect for a failed test and mark it failed in Xray"""
+        defect_key = yield from self._file_defect_flow(test, build_number)
+
+        # Update test status in Xray if execution exists
+        if execution_key:
+            if test.get("xray_test_key"):
+                yield from self._update_status_flow(
+                    execution_key, test, test.get("status")
+                )
+
+        return defect_key
+
+    def _start_execution_flow(self, build_number, results_data):
+        """Create the Test Execution, or reuse the one a previous run created"""
+        execution_key = self.checkpoint.get("execution", build_number)
+        if execution_key:
+            print(f"♻️ Resuming Test Execution: {execution_key}")
+            return execution_key
+
+        execution_key = yield self.create_test_execution(build_number, results_data)
+        if execution_key:
+            self.checkpoint.record("execution", build_number, execution_key)
+        return execution_key
+
     def process_results(self, results_data, build_number):
-        """Main method to process all test results"""
-        print("\n" + "=" * 60)
-        print("  Processing Results for JIRA/Xray")
-        print("=" * 60)
+        """Main method to process all test results.
+
+        test_results may be a list or a one-pass iterator; records are
+        partitioned by status as they stream past and are not kept.
+        """
+        return self._run(self._process_results_flow(results_data, build_number))
+
+    def _process_results_flow(self, results_data, build_number):
+        with timer("tracker_publish_seconds", tracker="jira"):
+            print("\n" + "=" * 60)
+            print("  Processing Results for JIRA/Xray")
+            print("=" * 60)
+
+            execution_key = yield from self._open_execution_flow(
+                build_number, results_data
+            )
+
+            failed = summary_count(results_data, "failed")
+            print(f"\n🐛 Creating defects for {failed} failed tests...")
+
+            if execution_key and not self.bulk:
+                passed = summary_count(results_data, "passed")
+                print(f"✅ Updating {passed} passed tests in Xray...")
+
+            stats = Counter()
+            try:
+                tests_updated = yield from self._publish_tests_flow(
+                    execution_key,
+                    results_data.get("test_results", []),
+                    build_number,
+                    stats,
+                )
+            except ResultsFileError as e:
+                return self.abandon_publishing(e)
+
+            return self.finish_publishing(execution_key, stats, tests_updated)
+
+    def finish_publishing(self, execution_key, stats, tests_updated):
+        """Print the summary and settle the checkpoint"""
+        self._print_summary(
+            execution_key,
+            stats["defects"] - self.known_failures,
+            stats["Failed"],
+            tests_updated,
+        )
+        self._finish_checkpoint(execution_key and not stats["unpublished"])
+
+        return True
+
+    def open_execution(self, build_number, results_data):
+        """Get ready to publish a build, return its Test Execution key or None.
+
+        Refreshes the defect index and creates the Test Execution, unless the
+        checkpoint holds the one a previous run created.
+        """
+        return self._run(self._open_execution_flow(build_number, results_data))
+
+    def _open_execution_flow(self, build_number, results_data):
+        self.known_failures = 0
+        if self.checkpoint.resumed:
+            print(
+                f"♻️ Checkpoint has {self.checkpoint.resumed} completed operations "
+                "- publishing the remainder"
+            )
+
+        if self.defect_index is not None and (yield self._refresh_defect_index()):
+            print(
+                f"🗂️ Defect index: {len(self.defect_index.defects)} "
+                "open automation defects"
+            )
 
         # Create Test Execution
-        execution_key = self.create_test_execution(build_number, results_data)
+        execution_key = yield from self._start_execution_flow(
+            build_number, results_data
+        )
 
         if not execution_key:
             print("⚠️ Continuing without test execution...")
+        return execution_key
 
-        # Process failed tests
-        failed_tests = [
-            t
-            for t in results_data.get("test_results", [])
-            if t.get("status") == "Failed"
-        ]
-
-        print(f"\n🐛 Creating defects for {len(failed_tests)} failed tests...")
-
-        defects_created = 0
-        for test in failed_tests:
-            if self.create_defect(test, build_number):
-                defects_created += 1
-
-            # Update test status in Xray if execution exists
-            if execution_key:
-                test_key = test.get("xray_test_key")
-                if test_key:
-                    self.update_test_status(execution_key, test_key, test.get("status"))
-
-        # Update passed tests
-        passed_tests = [
-            t
-            for t in results_data.get("test_results", [])
-            if t.get("status") == "Passed"
-        ]
+    def publish_tests(self, execution_key, tests, build_number, stats, seen=None):
+        """File defects and publish Xray statuses for a stream of test records.
 
-        if execution_key:
-            print(f"\n✅ Updating {len(passed_tests)} passed tests in Xray...")
-            for test in passed_tests:
-                test_key = test.get("xray_test_key")
-                if test_key:
-                    self.update_test_status(execution_key, test_key, "Passed")
+        Tallies the tests in stats and returns the number of tests updated in
+        Xray. seen carries key occurrence counts from earlier calls, so
+        records published over several calls keep distinct checkpoint keys.
+        """
+        return self._run(
+            self._publish_tests_flow(execution_key, tests, build_number, stats, seen)
+        )
 
-        # Summary
+    def _publish_tests_flow(self, execution_key, tests, build_number, stats, seen=None):
+        self._test_keys = {}
+        tests = stream_test_keys(tests, self._test_keys, seen)
+
+        if self.bulk:
+            # Statuses for failed tests go out with the bulk import below
+            def file_defect(test):
+                defect_key = None
+                if test.get("status") == "Failed":
+                    defect_key = yield from self._file_defect_flow(test, build_number)
+                return test, defect_key
+
+            published = self._ordered(file_defect, tests)
+            chunks = self._pending_import_chunks(published, stats)
+            if not execution_key:
+                yield self._drain(chunks, lambda chunk: None)
+                return 0
+            print("\n✅ Importing test statuses into Xray...")
+            imported = yield from self._import_chunks_flow(execution_key, chunks)
+            return self._report_import(stats, imported)
+
+        def publish(test):
+            if test.get("status") == "Failed":
+                defect_key = yield from self._publish_failure_flow(
+                    test, build_number, execution_key
+                )
+                return test, defect_key
+            if execution_key and test.get("xray_test_key"):
+                yield from self._update_status_flow(execution_key, test, "Passed")
+            return test, None
+
+        yield self._drain(
+            self._ordered(publish, self._failed_or_passed(tests)),
+            lambda published: self._tally(stats, *published, statuses=True),
+        )
+        return stats["Passed"] + stats["Failed"]
+
+    @staticmethod
+    def _failed_or_passed(tests):
+        return (test for test in tests if test.get("status") in ("Failed", "Passed"))
+
+    def _tally(self, stats, test, defect_key, statuses=False):
+        """Count a processed test, and whether it still has work left to publish"""
+        key = self._test_keys[id(test)]
+        status = test.get("status")
+        stats[status] += 1
+        if status == "Failed":
+            if defect_key:
+                stats["defects"] += 1
+            if not self.checkpoint.done("defect", key):
+                stats["unpublished"] += 1
+        if (
+            statuses
+            and test.get("xray_test_key")
+            and not self.checkpoint.done("status", key)
+        ):
+            stats["unpublished"] += 1
+
+    def _pending_import_chunks(self, published, stats):
+        """Chunk Xray test runs still to import from (test, defect_key) pairs"""
+        chunk = []
+        for test, defect_key in published:
+            entry = self._import_entry(stats, test, defect_key)
+            if entry is None:
+                continue
+            chunk.append(entry)
+            if len(chunk) == self.bulk_chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _import_entry(self, stats, test, defect_key):
+        """Tally a test, return its (test_run, key) if Xray still needs its status"""
+        self._tally(stats, test, defect_key)
+        if not test.get("xray_test_key"):
+            return None
+        stats["with_keys"] += 1
+        key = self._test_keys[id(test)]
+        if self.checkpoint.done("status", key):
+            return None
+        stats["pending"] += 1
+        return self._xray_test_run(test, defect_key), key
+
+    def _report_import(self, stats, imported):
+        """Print what the bulk import sent, return the number of tests updated"""
+        pending = stats["pending"]
+        stats["unpublished"] += pending - imported
+        chunks = -(-pending // self.bulk_chunk_size)
+        print(
+            f"✅ Imported {imported}/{pending} test statuses "
+            f"({chunks} request{'s' if chunks != 1 else ''})"
+        )
+        return imported + stats["with_keys"] - pending
+
+    def abandon_publishing(self, error):
+        """Stop at an unreadable test record, keeping what was published"""
+        print(f"\n❌ Failed to read test results: {error}")
+        self._finish_checkpoint(False)
+        return False
+
+    def _finish_checkpoint(self, complete):
+        """Drop the checkpoint if everything was published, otherwise keep it"""
+        if self.defect_index is not None:
+            self.defect_index.save()
+        self.uploader.cache.save()
+
+        checkpoint = self.checkpoint
+        if complete:
+            checkpoint.finish()
+        else:
+            checkpoint.close()
+            if checkpoint.path:
+                print(
+                    f"💾 Checkpoint kept at {checkpoint.path} "
+                    "- re-run to publish the remainder"
+                )
+
+    def _print_summary(self, execution_key, defects_created, failed, tests_updated):
         print("\n" + "=" * 60)
         print(f"  SUMMARY")
         print("=" * 60)
         print(f"Test Execution: {execution_key if execution_key else 'Not created'}")
-        print(f"Defects Created: {defects_created}/{len(failed_tests)}")
-        print(f"Tests Updated in Xray: {len(passed_tests) + len(failed_tests)}")
+        print(f"Defects Created: {defects_created}/{failed}")
+        if self.defect_index is not None:
+            print(f"Known Failures Commented: {self.known_failures}")
+        print(f"Tests Updated in Xray: {tests_updated}")
         print("=" * 60 + "\n")
 
-        return True
 
+class AsyncJiraXrayIntegration(JiraXrayIntegration):
+    """asyncio variant of JiraXrayIntegration.
+
+    Runs the sync client's publishing flows; only the network methods and
+    the I/O hooks differ, so process_results, open_execution, publish_tests
+    and import_execution_results return coroutines. Requests go through an
+    AsyncHttpClient, with max_workers bounding concurrent publishing tasks.
+    """
+
+    def __init__(
+        self,
+        jira_url,
+        username,
+        password,
+        project_key,
+        client,
+        max_workers=1,
+        bulk=False,
+        bulk_chunk_size=XRAY_IMPORT_CHUNK_SIZE,
+        checkpoint=None,
+        defect_index=None,
+        attachment_cache=None,
+        upload_workers=DEFAULT_UPLOAD_WORKERS,
+    ):
+        super().__init__(
+            jira_url,
+            username,
+            password,
+            project_key,
+            max_workers=max_workers,
+            bulk=bulk,
+            bulk_chunk_size=bulk_chunk_size,
+            checkpoint=checkpoint,
+            defect_index=defect_index,
+            uploader=AttachmentUploader(None, attachment_cache, upload_workers),
+        )
+        self.client = client
+        # Basic auth sent as a header; aiohttp.BasicAuth is deprecated
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.auth = None
+        self.headers = dict(self.headers, Authorization=f"Basic {credentials}")
+        self.errors = request_errors()
+
+    _run = staticmethod(run_flow_async)
+    _map = staticmethod(gather_ordered)
+
+    async def _post(self, endpoint, payload):
+        response = await self.client.post(endpoint, headers=self.headers, json=payload)
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    async def _drain(results, consume):
+        async for result in results:
+            consume(result)
+
+    def _fingerprint_lock(self, fingerprint):
+        return self.defect_index.async_lock(fingerprint)
+
+    def _refresh_defect_index(self):
+        return self.defect_index.refresh_async(
+            self.client, self.jira_url, self.headers, self.project_key, self.errors
+        )
+
+    async def _pending_import_chunks(self, published, stats):
+        """_pending_import_chunks for an async stream of (test, defect_key)"""
+        chunk = []
+        async for test, defect_key in published:
+            entry = self._import_entry(stats, test, defect_key)
+            if entry is None:
+                continue
+            chunk.append(entry)
+            if len(chunk) == self.bulk_chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @api_timer("jira")
+    async def create_test_execution(self, build_number, summary_data):
+        """Create Xray Test Execution"""
+        endpoint = f"{self.jira_url}/rest/api/2/issue"
+        payload = self._execution_payload(build_number, summary_data)
+
+        try:
+            response = await self._post(endpoint, payload)
+            execution_key = response.json()["key"]
+            print(f"✅ Created Test Execution: {execution_key}")
+            return execution_key
+        except self.errors as e:
+            print(f"❌ Failed to create test execution: {e}")
+            if hasattr(e, "response"):
+                print(f"Response: {e.response.text}")
+            return None
 
-def load_results(results_file):
-    """Load test results from JSON file"""
-    try:
-        with open(results_file, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"❌ Failed to load results file: {e}")
-        sys.exit(1)
+    @api_timer("jira")
+    async def create_defect(self, test_result, build_number):
+        """Create a defect for a failed test"""
+        endpoint = f"{self.jira_url}/rest/api/2/issue"
+        test_name = test_result.get("name", "Unknown Test")
+        screenshots = test_result.get("screenshots", [])
+        payload = self._defect_payload(test_result, build_number)
+
+        try:
+            response = await self._post(endpoint, payload)
+            defect_key = response.json()["key"]
+            print(f"  🐛 Created defect: {defect_key} for {test_name}")
+
+            # Attach screenshots
+            if screenshots:
+                await self.attach_files(defect_key, screenshots)
+
+            return defect_key
+        except self.errors as e:
+            print(f"  ❌ Failed to create defect for {test_name}: {e}")
+            return None
+
+    @api_timer("jira")
+    async def comment_known_failure(self, defect_key, test_result, build_number):
+        """Note a recurring failure on its open defect instead of filing a new one"""
+        endpoint = f"{self.jira_url}/rest/api/2/issue/{defect_key}/comment"
+        test_name = test_result.get("name", "Unknown Test")
+        payload = self._comment_payload(test_result, build_number)
+
+        try:
+            await self._post(endpoint, payload)
+            print(f"  🔁 Known failure: commented on {defect_key} for {test_name}")
+            return True
+        except self.errors as e:
+            print(f"  ⚠️ Failed to comment on {defect_key} for {test_name}: {e}")
+            return False
+
+    @api_timer("jira")
+    async def attach_files(self, issue_key, file_paths):
+        """Attach files to JIRA issue"""
+        endpoint = f"{self.jira_url}/rest/api/2/issue/{issue_key}/attachments"
+        headers = {
+            "X-Atlassian-Token": "no-check",
+            "Authorization": self.headers["Authorization"],
+        }
+        target = f"jira:{self.jira_url}:{issue_key}"
+        async for file_path, outcome, error in self.uploader.upload_async(
+            self.client, target, endpoint, file_paths, headers
+        ):
+            self._report_attachment(file_path, outcome, error)
+
+    @api_timer("jira")
+    async def update_test_status(self, test_execution_key, test_key, status):
+        """Update test status in Xray"""
+        endpoint = (
+            f"{self.jira_url}/rest/raven/1.0/api/testexec/{test_execution_key}/test"
+        )
+        payload = {"testKey": test_key, "status": XRAY_STATUSES.get(status, "FAIL")}
+
+        try:
+            await self._post(endpoint, payload)
+            return True
+        except self.errors as e:
+            print(f"  ⚠️ Failed to update status for {test_key}: {e}")
+            return False
+
+
+async def process_results_async(args, results, checkpoint, defect_index):
+    """Run AsyncJiraXrayIntegration.process_results with a scoped HTTP client"""
+    async with AsyncHttpClient(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    ) as client:
+        jira = AsyncJiraXrayIntegration(
+            args.jira_url,
+            args.username,
+            args.password,
+            args.project,
+            client,
+            max_workers=args.concurrency,
+            bulk=args.bulk,
+            bulk_chunk_size=args.bulk_chunk_size,
+            checkpoint=checkpoint,
+            defect_index=defect_index,
+            attachment_cache=AttachmentCache(args.attachment_cache),
+            upload_workers=args.upload_workers,
+        )
+        try:
+            return await jira.process_results(results, args.build_number)
+        finally:
+            # Everything recorded so far stays on disk for a resumed run
+            jira.checkpoint.close()
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Integrate Tosca results with JIRA/Xray"
     )
-    parser.add_argument("--results", required=True, help="Path to results JSON file")
+    parser.add_argument(
+        "--results", required=True, help="Path to results JSON/NDJSON file"
+    )
     parser.add_argument("--jira-url", required=True, help="JIRA instance URL")
     parser.add_argument("--username", required=True, help="JIRA username")
     parser.add_argument("--password", required=True, help="JIRA password/token")
     parser.add_argument("--project", required=True, help="JIRA project key")
     parser.add_argument("--build-number", required=True, help="Build number")
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Keep-alive connections per host",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=None,
+        help="Maximum requests per second per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Retries for throttled (429/503) requests",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum JIRA/Xray requests in flight at once",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Publish Xray statuses with chunked execution-results imports",
+    )
+    parser.add_argument(
+        "--bulk-chunk-size",
+        type=int,
+        default=XRAY_IMPORT_CHUNK_SIZE,
+        help="Test runs per Xray import request (with --bulk)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for resuming an interrupted run",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=DEFAULT_UPLOAD_WORKERS,
+        help="Parallel attachment uploads per issue",
+    )
+    parser.add_argument(
+        "--upload-budget-mb",
+        type=int,
+        default=DEFAULT_UPLOAD_BUDGET // (1024 * 1024),
+        help="Attachment bytes in flight at once, in MB",
+    )
+    parser.add_argument(
+        "--attachment-cache",
+        help="File remembering attachments already uploaded to each issue",
+    )
+    parser.add_argument(
+        "--defect-index",
+        help="Local index of open defects; comment on known failures "
+        "instead of filing duplicates",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Publish with the asyncio client (requires aiohttp)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write timings, retries and upload bytes here "
+        "(Prometheus text format for .prom/.txt, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write cProfile stats of the publishing stage to this file "
+        "(worker threads included)",
+    )
 
     args = parser.parse_args()
 
     # Load results
     results = load_results(args.results)
 
+    checkpoint = None
+    if args.checkpoint:
+        scope = f"jira|{args.jira_url}|{args.project}|{args.build_number}"
+        checkpoint = PublishCheckpoint(args.checkpoint, scope)
+    defect_index = DefectIndex(args.defect_index) if args.defect_index else None
+
+    if args.use_async:
+        try:
+            with profiled(args.profile):
+                success = asyncio.run(
+                    process_results_async(args, results, checkpoint, defect_index)
+                )
+        except KeyboardInterrupt:
+            print("\n⚠️ Interrupted - re-run with the same checkpoint to resume")
+            sys.exit(130)
+        finally:
+            save_metrics(args.metrics_file)
+        sys.exit(0 if success else 1)
+
+    session = get_shared_session(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    )
+    uploader = AttachmentUploader(
+        session,
+        AttachmentCache(args.attachment_cache),
+        max_workers=args.upload_workers,
+        max_bytes=args.upload_budget_mb * 1024 * 1024,
+    )
+
     # Initialize JIRA integration
     jira = JiraXrayIntegration(
-        args.jira_url, args.username, args.password, args.project
+        args.jira_url,
+        args.username,
+        args.password,
+        args.project,
+        max_workers=args.concurrency,
+        session=session,
+        bulk=args.bulk,
+        bulk_chunk_size=args.bulk_chunk_size,
+        checkpoint=checkpoint,
+        defect_index=defect_index,
+        uploader=uploader,
     )
 
     # Process results
-    success = jira.process_results(results, args.build_number)
+    with profiled(args.profile):
+        success = jira.process_results(results, args.build_number)
+    save_metrics(args.metrics_file)
 
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,223 @@
+"""
+Ordered Executor for Integration Scripts
+Runs API calls on a bounded thread pool while keeping results and console
+output in submission order
+"""
+
+import asyncio
+import contextvars
+import io
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+_install_lock = threading.Lock()
+
+# Proxy installed on sys.stdout, and the number of runs currently using it
+_proxy = None
+_proxy_users = 0
+
+# Capture buffer of the current asyncio task, if it is being captured
+_task_buffer = contextvars.ContextVar("task_buffer", default=None)
+
+
+class _ThreadBufferedStdout:
+    """sys.stdout proxy that buffers writes made by pool threads and tasks"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def start_capture(self):
+        self._local.buffer = io.StringIO()
+
+    def end_capture(self):
+        output = self._local.buffer.getvalue()
+        self._local.buffer = None
+        return output
+
+    def _buffer(self):
+        buffer = _task_buffer.get()
+        if buffer is None:
+            buffer = getattr(self._local, "buffer", None)
+        return buffer
+
+    def write(self, text):
+        buffer = self._buffer()
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        if self._buffer() is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+@contextmanager
+def _buffered_stdout():
+    """Install the buffering proxy on sys.stdout for the duration of a run.
+
+    Nested and concurrent runs share one proxy; the stream it wraps is put
+    back when the last of them finishes.
+    """
+    global _proxy, _proxy_users
+    with _install_lock:
+        if _proxy is None:
+            _proxy = _ThreadBufferedStdout(sys.stdout)
+            sys.stdout = _proxy
+        _proxy_users += 1
+        proxy = _proxy
+
+    try:
+        yield proxy
+    finally:
+        with _install_lock:
+            _proxy_users -= 1
+            if _proxy_users == 0:
+                # Unless something replaced sys.stdout again in the meantime
+                if sys.stdout is _proxy:
+                    sys.stdout = _proxy.stream
+                _proxy = None
+
+
+def run_ordered(func, items, max_workers=1):
+    """Yield func(item) for every item, in order, using up to max_workers threads.
+
+    Whatever a call prints is held back and written out in item order, so the
+    console log reads the same as a sequential run. Items may be a lazy
+    iterable; only a bounded window of calls is queued at any time. If the
+    iterable raises, calls already queued are still finished and yielded
+    before the error is raised.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with _buffered_stdout() as stdout:
+        yield from _run_captured(func, items, max_workers, stdout)
+
+
+def _run_captured(func, items, max_workers, stdout):
+    """run_ordered's thread pool loop, with stdout buffering installed"""
+
+    def call(item):
+        stdout.start_capture()
+        try:
+            result, error = func(item), None
+        except Exception as e:
+            result, error = None, e
+        return stdout.end_capture(), result, error
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        items = iter(items)
+        source_error = None
+
+        def submit_next():
+            nonlocal source_error
+            if source_error is not None:
+                return False
+            try:
+                for item in items:
+                    pending.append(executor.submit(call, item))
+                    return True
+            except Exception as e:
+                source_error = e
+            return False
+
+        for _ in range(max_workers * 4):
+            if not submit_next():
+                break
+
+        while pending:
+            output, result, error = pending.popleft().result()
+            # Goes to the caller's own capture buffer when nested
+            stdout.write(output)
+            submit_next()
+            if error is not None:
+                raise error
+            yield result
+
+        if source_error is not None:
+            raise source_error
+
+
+async def gather_ordered(func, items, max_concurrency=1):
+    """Async counterpart of run_ordered for coroutine functions.
+
+    Yields await func(item) in item order with at most max_concurrency calls
+    running, and writes each call's output in item order. Items may be a
+    lazy iterable or an async iterable; if it raises, calls already started
+    are finished and yielded first. Calls still pending when the
+    consumer stops or is cancelled are cancelled and awaited, so nothing
+    keeps running after shutdown.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def call(item):
+        # Tasks run in a copy of the caller's context, so this stays local
+        buffer = io.StringIO()
+        _task_buffer.set(buffer)
+        try:
+            async with semaphore:
+                result, error = await func(item), None
+        except Exception as e:
+            result, error = None, e
+        return buffer.getvalue(), result, error
+
+    pending = deque()
+    if hasattr(items, "__aiter__"):
+        items = items.__aiter__()
+    else:
+        items = _as_async_iterator(items)
+
+    source_error = None
+
+    async def submit_next():
+        nonlocal source_error
+        if source_error is not None:
+            return False
+        try:
+            async for item in items:
+                pending.append(asyncio.ensure_future(call(item)))
+                return True
+        except Exception as e:
+            source_error = e
+        return False
+
+    with _buffered_stdout() as stdout:
+        try:
+            for _ in range(max(1, max_concurrency) * 4):
+                if not await submit_next():
+                    break
+
+            while pending:
+                output, result, error = await pending[0]
+                pending.popleft()
+                stdout.write(output)
+                await submit_next()
+                if error is not None:
+                    raise error
+                yield result
+
+            if source_error is not None:
+                raise source_error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            # Lets an async source shut down whatever it is still running
+            if hasattr(items, "aclose"):
+                await items.aclose()
+
+
+async def _as_async_iterator(items):
+    for item in items:
+        yield item
@@ -0,0 +1,310 @@
+"""
+Pipeline Metrics for Integration Scripts
+Timers and counters around the parse and publish stages, exported as JSON or
+Prometheus text format so a slow run shows where its time went
+"""
+
+import bisect
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Metrics files with these extensions are written in Prometheus text format
+PROMETHEUS_EXTENSIONS = (".prom", ".txt")
+
+# Help text of every metric the scripts record
+METRIC_HELP = {
+    "tosca_parse_seconds": "Time spent parsing all XML result files",
+    "tosca_parse_file_seconds": "Time spent parsing one XML result file",
+    "tosca_parsed_files_total": "XML result files by outcome",
+    "tosca_parsed_tests_total": "Test records read from XML result files",
+    "tosca_parse_cache_hits_total": "XML result files reused from the parse cache",
+    "tosca_save_seconds": "Time spent writing the parsed results",
+    "tosca_saved_bytes_total": "Bytes of parsed results written",
+    "tracker_publish_seconds": "Time spent publishing a result set to a tracker",
+    "tracker_api_seconds": "Duration of tracker API methods, retries included",
+    "tracker_http_retries_total": "Throttled or unreachable requests retried",
+    "tracker_attachments_total": "Attachments by outcome",
+    "tracker_upload_bytes_total": "Attachment bytes uploaded to trackers",
+}
+
+
+class Histogram:
+    """Count, sum and bucket counts of observed durations"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus one for values above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        bounds = [_format_bound(bound) for bound in self.buckets] + ["+Inf"]
+        total = 0
+        pairs = []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by name and labels"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe how long the block takes, whether or not it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_dict(self):
+        """Metrics as {"counters": {...}, "histograms": {...}} by metric name"""
+        data = {"counters": {}, "histograms": {}}
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                data["counters"].setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+            for (name, labels), histogram in sorted(
+                self.histograms.items(), key=lambda item: item[0]
+            ):
+                data["histograms"].setdefault(name, []).append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "max": round(histogram.max, 6),
+                        "buckets": dict(histogram.cumulative()),
+                    }
+                )
+        return data
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = []
+
+        for name, samples in data["counters"].items():
+            lines.extend(_prometheus_header(name, "counter"))
+            for sample in samples:
+                labels = _prometheus_labels(sample["labels"])
+                lines.append(f"{name}{labels} {sample['value']}")
+
+        for name, samples in data["histograms"].items():
+            lines.extend(_prometheus_header(name, "histogram"))
+            for sample in samples:
+                for bound, count in sample["buckets"].items():
+                    labels = _prometheus_labels({**sample["labels"], "le": bound})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = _prometheus_labels(sample["labels"])
+                lines.append(f"{name}_sum{labels} {sample['sum']}")
+                lines.append(f"{name}_count{labels} {sample['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """Write the metrics to path, in Prometheus format for .prom/.txt files"""
+        if path.endswith(PROMETHEUS_EXTENSIONS):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n"
+
+        # Written atomically so a node_exporter textfile collector never sees
+        # a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_bound(bound):
+    return f"{bound:g}"
+
+
+def _prometheus_header(name, metric_type):
+    help_text = METRIC_HELP.get(name)
+    if help_text:
+        yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {metric_type}"
+
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide registry the scripts record into
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+def timed(name, **labels):
+    """Decorator recording the duration of every call of a function or coroutine"""
+
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with timer(name, **labels):
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with timer(name, **labels):
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def api_timer(tracker):
+    """timed() for a tracker API method, labelled with the method's name"""
+
+    def decorate(func):
+        return timed("tracker_api_seconds", tracker=tracker, method=func.__name__)(func)
+
+    return decorate
+
+
+def record_attachment(tracker, file_path, outcome, size=None):
+    """Count an attachment outcome, and its size once it was uploaded.
+
+    size defaults to the size of the file at file_path.
+    """
+    inc("tracker_attachments_total", tracker=tracker, outcome=outcome)
+    if outcome == "uploaded":
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                return
+        inc("tracker_upload_bytes_total", size, tracker=tracker)
+
+
+def save_metrics(path):
+    """Write the process-wide metrics to path if one is given"""
+    if not path:
+        return
+    try:
+        REGISTRY.save(path)
+        print(f"📈 Metrics saved to: {path}")
+    except OSError as e:
+        print(f"⚠️ Failed to save metrics to {path}: {e}")
+
+
+@contextmanager
+def profiled(path):
+    """Run the block under cProfile and dump the stats to path, if one is given.
+
+    Threads started inside the block, such as the publishing worker pools,
+    are profiled too and merged into the same dump; worker processes are
+    not. Read the dump with `python -m pstats <path>` or a viewer such as
+    snakeviz.
+    """
+    if not path:
+        yield
+        return
+
+    profilers = [cProfile.Profile()]
+    lock = threading.Lock()
+
+    def profile_thread(frame, event, arg):
+        # Called on a new thread's first event; enable() replaces this hook
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler, which already sees all threads
+            sys.setprofile(None)
+            return
+        with lock:
+            profilers.append(profiler)
+
+    threading.setprofile(profile_thread)
+    profilers[0].enable()
+    try:
+        yield
+    finally:
+        profilers[0].disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(profilers[0])
+        with lock:
+            for profiler in profilers[1:]:
+                stats.add(profiler)
+        stats.dump_stats(path)
+        print(f"🔬 Profile saved to: {path}")
@@ -0,0 +1,140 @@
+"""
+Publish Checkpoint for Integration Scripts
+Write-ahead log of completed publishing operations so an interrupted run can
+resume with only the unfinished remainder
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+
+
+class PublishCheckpoint:
+    """Append-only JSONL log of completed operations for one publishing scope.
+
+    Each line records one finished operation, e.g. ("defect", test) -> key.
+    A log written for a different scope (another build or cycle) is ignored
+    and replaced. With path=None the checkpoint is kept in memory only.
+    """
+
+    def __init__(self, path, scope):
+        self.path = path
+        self.scope = scope
+        self.state = {}
+        self.resumed = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is None:
+            return
+
+        if os.path.exists(path) and self._replay():
+            self._file = open(path, "a", encoding="utf-8")
+        else:
+            self.state.clear()
+            self._file = open(path, "w", encoding="utf-8")
+            self._append({"scope": scope})
+
+        self.resumed = len(self.state)
+
+    def _replay(self):
+        """Load completed operations, return False if the log is for another scope.
+
+        Lines that do not decode are skipped, and the file is cut back to the
+        end of the last line that did, so a line torn by a crash mid-write
+        cannot swallow the entries appended after it on resume.
+        """
+        with open(self.path, "r+b") as f:
+            lines = iter(f)
+            try:
+                line = next(lines)
+                header = json.loads(line)
+            except (StopIteration, ValueError):
+                return False
+            if header.get("scope") != self.scope:
+                return False
+
+            offset = good_end = len(line)
+            for line in lines:
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                for key in entry["keys"]:
+                    self.state[(entry["op"], key)] = entry.get("value")
+                good_end = offset
+
+            f.seek(good_end)
+            f.truncate()
+            if not line.endswith(b"\n") and good_end == offset:
+                # The last entry decoded but its newline never made it out
+                f.write(b"\n")
+        return True
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def get(self, op, key, default=None):
+        """Value recorded for a completed operation, or default"""
+        return self.state.get((op, key), default)
+
+    def done(self, op, key):
+        return (op, key) in self.state
+
+    def record(self, op, key, value=True):
+        """Mark one operation as completed"""
+        self.record_many(op, [key], value)
+
+    def record_many(self, op, keys, value=True):
+        """Mark a batch of operations that completed together"""
+        with self._lock:
+            for key in keys:
+                self.state[(op, key)] = value
+            if self._file:
+                self._append({"op": op, "keys": list(keys), "value": value})
+
+    def finish(self):
+        """Remove the log once the whole run has been published"""
+        self.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def test_keys(tests):
+    """Stable checkpoint key per test record, keyed by id(test).
+
+    Repeated identities (data-driven runs of one test case) get an
+    occurrence suffix so each run is tracked separately.
+    """
+    keys = {}
+    for _ in stream_test_keys(tests, keys):
+        pass
+    return keys
+
+
+def stream_test_keys(tests, keys, seen=None):
+    """Yield tests one at a time, storing each one's key in keys[id(test)].
+
+    Keys are assigned as records stream past, so a one-pass iterator can be
+    published without holding every record; an entry is overwritten only
+    once its record is gone and its id is reused. Passing the same seen
+    Counter to several calls numbers repeated identities across all of them.
+    """
+    if seen is None:
+        seen = Counter()
+    for test in tests:
+        identity = "|".join(
+            str(test.get(field) or "")
+            for field in ("test_case_id", "xray_test_key", "name", "module", "suite")
+        )
+        seen[identity] += 1
+        keys[id(test)] = f"{identity}#{seen[identity]}"
+        yield test
@@ -5,17 +5,74 @@ Publishes test execution results to qTest Manager
 """
 
 import argparse
+import asyncio
+import base64
 import json
+import mimetypes
 import requests
 import sys
+import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
+from async_http import AsyncHttpClient, request_errors
+from attachment_uploads import (
+    DEFAULT_UPLOAD_BUDGET,
+    DEFAULT_UPLOAD_WORKERS,
+    AttachmentCache,
+    AttachmentUploader,
+)
+from http_session import DEFAULT_POOL_SIZE, get_shared_session
+from io_flow import run_flow, run_flow_async
+from ordered_executor import gather_ordered, run_ordered
+from pipeline_metrics import api_timer, profiled, record_attachment, save_metrics, timer
+from publish_checkpoint import PublishCheckpoint, stream_test_keys
+from qtest_case_index import QTestCaseIndex
+from request_scheduler import DEFAULT_MAX_RETRIES
+from results_stream import ResultsFileError, load_results, summary_count
+
+# Tosca result status -> qTest test run status
+QTEST_STATUSES = {
+    "Passed": "PASSED",
+    "Failed": "FAILED",
+    "Skipped": "INCOMPLETE",
+    "Blocked": "BLOCKED",
+}
+
+# Test logs per batch auto-test-log submission
+QTEST_BATCH_SIZE = 100
+
+# Records per batch segment at most, in batch sizes, when few need publishing
+SEGMENT_SPAN = 10
+
+# Seconds between polls of a queued batch, and before giving up on it
+QUEUE_POLL_INTERVAL = 2
+QUEUE_TIMEOUT = 600
+
+# Attachment bytes inlined into one batch log at most; base64 adds a third
+MAX_INLINE_BYTES = 8 * 1024 * 1024
+
+# Read size when base64-encoding an attachment, a multiple of 3
+INLINE_READ_SIZE = 3 * 256 * 1024
+
 
 class QTestIntegration:
     """Handler for qTest API integration"""
 
-    def __init__(self, api_url, token, project_id):
+    def __init__(
+        self,
+        api_url,
+        token,
+        project_id,
+        session=None,
+        batch=False,
+        batch_size=QTEST_BATCH_SIZE,
+        max_in_flight=1,
+        checkpoint=None,
+        uploader=None,
+        case_index=None,
+    ):
         self.api_url = api_url.rstrip("/")
         self.token = token
         self.project_id = project_id
@@ -23,20 +80,54 @@ class QTestIntegration:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
+        # Keep-alive connection pool shared with other clients in this process
+        self.session = session or get_shared_session()
+        # Submit test runs and logs through batch auto-test-log jobs
+        self.batch = batch
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        # Completed operations, so a re-run skips what is already published
+        self.checkpoint = checkpoint or PublishCheckpoint(None, None)
+        self._test_keys = {}
+        # Parallel streaming screenshot uploads, skipping blobs already attached
+        self.uploader = uploader or AttachmentUploader(self.session)
+        # Maps tests without a qTest ID to test cases by PID or name
+        self.case_index = case_index
+        self.errors = (requests.exceptions.RequestException,)
+
+    # The publishing control flow is written once, as generator flows that
+    # yield every client call (see io_flow); these hooks are the only part
+    # AsyncQTestIntegration replaces, so its methods return coroutines
+    _run = staticmethod(run_flow)
+    _map = staticmethod(run_ordered)
+    # Without --batch, test runs are published one at a time; the asyncio
+    # client overlaps up to max_in_flight of them
+    _concurrent_runs = False
+
+    def _ordered(self, flow, items, limit):
+        """Results of flow(item) for every item in order, limit at a time"""
+        run = self._run
+        return self._map(lambda item: run(flow(item)), items, limit)
+
+    @staticmethod
+    def _drain(results, consume):
+        """Pass every result of an _ordered() stream to consume"""
+        for result in results:
+            consume(result)
+
+    def _refresh_case_index(self):
+        return self.case_index.refresh(
+            self.session, self.api_url, self.headers, self.project_id
+        )
 
+    @api_timer("qtest")
     def create_test_cycle(self, cycle_name, description=""):
         """Create a new test cycle in qTest"""
         endpoint = f"{self.api_url}/projects/{self.project_id}/test-cycles"
-
-        payload = {
-            "name": cycle_name,
-            "description": description,
-            "start_date": datetime.now().isoformat(),
-            "end_date": datetime.now().isoformat(),
-        }
+        payload = self._test_cycle_payload(cycle_name, description)
 
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = self.session.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             cycle_data = response.json()
             print(f"✅ Created test cycle: {cycle_name} (ID: {cycle_data['id']})")
@@ -45,50 +136,32 @@ class QTestIntegration:
             print(f"❌ Failed to create test cycle: {e}")
             return None
 
+    @api_timer("qtest")
     def create_test_run(self, cycle_id, test_case_id, test_name):
         """Create a test run within a cycle"""
         endpoint = f"{self.api_url}/projects/{self.project_id}/test-runs"
-
-        payload = {
-            "name": test_name,
-            "test_case": {"id": test_case_id},
-            "test_cycle": {"id": cycle_id},
-        }
+        payload = self._test_run_payload(cycle_id, test_case_id, test_name)
 
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = self.session.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             return response.json()["id"]
         except requests.exceptions.RequestException as e:
             print(f"⚠️ Failed to create test run for {test_name}: {e}")
             return None
 
+    @api_timer("qtest")
     def update_test_run_status(
         self, run_id, status, execution_time, error_message="", attachments=None
     ):
         """Update test run with execution results"""
         endpoint = f"{self.api_url}/projects/{self.project_id}/test-runs/{run_id}/auto-test-logs"
 
-        # Map Tosca status to qTest status
-        status_mapping = {
-            "Passed": "PASSED",
-            "Failed": "FAILED",
-            "Skipped": "INCOMPLETE",
-            "Blocked": "BLOCKED",
-        }
-
-        qtest_status = status_mapping.get(status, "FAILED")
-
-        payload = {
-            "exe_start_date": datetime.now().isoformat(),
-            "exe_end_date": datetime.now().isoformat(),
-            "status": qtest_status,
-            "note": error_message if error_message else "Test executed successfully",
-            "execution_time": execution_time,
-        }
+        qtest_status = QTEST_STATUSES.get(status, "FAILED")
+        payload = self._test_log_payload(qtest_status, execution_time, error_message)
 
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = self.session.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
 
             # Upload attachments if provided
@@ -100,75 +173,475 @@ class QTestIntegration:
             print(f"⚠️ Failed to update test run {run_id}: {e}")
             return False
 
+    @api_timer("qtest")
     def upload_attachments(self, run_id, attachments):
         """Upload screenshots and logs to test run"""
         endpoint = (
             f"{self.api_url}/projects/{self.project_id}/test-runs/{run_id}/attachments"
         )
 
-        for attachment_path in attachments:
-            if not Path(attachment_path).exists():
-                continue
-
+        # Content-Type is set by the uploader for the multipart body
+        headers = {"Authorization": self.headers["Authorization"]}
+        target = f"qtest:{self.api_url}:{self.project_id}:{run_id}"
+
+        for attachment_path, outcome, error in self.uploader.upload(
+            target, endpoint, attachments, headers=headers
+        ):
+            self._report_attachment(attachment_path, outcome, error)
+
+    def _report_attachment(self, attachment_path, outcome, error):
+        record_attachment("qtest", attachment_path, outcome)
+        if outcome == "uploaded":
+            print(f"  📎 Uploaded attachment: {Path(attachment_path).name}")
+        elif outcome == "cached":
+            print(f"  ♻️ Already uploaded: {Path(attachment_path).name}")
+        elif outcome == "failed":
+            print(f"  ⚠️ Failed to upload {attachment_path}: {error}")
+
+    @api_timer("qtest")
+    def submit_auto_test_logs(self, cycle_id, test_logs):
+        """Create test runs and their logs in one batch job and wait for it"""
+        endpoint = f"{self.api_url}/projects/{self.project_id}/auto-test-logs"
+
+        response = self.session.post(
+            endpoint,
+            headers=self.headers,
+            params={"type": "automation"},
+            json={"test_cycle": cycle_id, "test_logs": test_logs},
+        )
+        response.raise_for_status()
+        job = response.json()
+        if job.get("state") != "SUCCESS":
+            job = self.wait_for_queue_job(self._queue_job_id(job))
+        return job
+
+    @api_timer("qtest")
+    def wait_for_queue_job(self, job_id):
+        """Poll a queued batch job until qTest has processed it"""
+        endpoint = f"{self.api_url}/projects/queue-processing/{job_id}"
+        deadline = time.monotonic() + QUEUE_TIMEOUT
+
+        while True:
+            response = self.session.get(endpoint, headers=self.headers)
+            response.raise_for_status()
+            job = response.json()
+            if self._queue_job_done(job, job_id, deadline):
+                return job
+            time.sleep(QUEUE_POLL_INTERVAL)
+
+    @staticmethod
+    def _queue_job_id(job):
+        """ID of a queued batch job, to poll it by"""
+        job_id = job.get("id") if isinstance(job, dict) else None
+        if job_id is None:
+            raise RuntimeError(f"batch job response without an id: {job}")
+        return job_id
+
+    @staticmethod
+    def _failed_logs(job, count):
+        """Errors of the logs a finished batch job did not publish, by position.
+
+        A job reports SUCCESS once it has been processed, even when some of
+        its logs were rejected. Its content lists one entry per submitted
+        log, in order, and a rejected entry carries an "error". Logs the
+        content leaves out were not published either; a job without
+        per-log results is taken as having published every log.
+        """
+        content = job.get("content")
+        if isinstance(content, str):
             try:
-                with open(attachment_path, "rb") as f:
-                    files = {"file": f}
-                    # Remove Content-Type from headers for multipart upload
-                    headers = {"Authorization": self.headers["Authorization"]}
-                    response = requests.post(endpoint, headers=headers, files=files)
-                    response.raise_for_status()
-                    print(f"  📎 Uploaded attachment: {Path(attachment_path).name}")
-            except Exception as e:
-                print(f"  ⚠️ Failed to upload {attachment_path}: {e}")
+                content = json.loads(content)
+            except ValueError:
+                return {}
+        entries = content.get("test_logs") if isinstance(content, dict) else None
+        if not isinstance(entries, list):
+            return {}
+
+        failures = {}
+        for position in range(count):
+            if position >= len(entries):
+                failures[position] = "not reported by the batch job"
+            elif isinstance(entries[position], dict) and entries[position].get("error"):
+                failures[position] = entries[position]["error"]
+        return failures
+
+    @staticmethod
+    def _queue_job_done(job, job_id, deadline):
+        """True once a batch job succeeded; raise if it failed or timed out"""
+        state = job.get("state")
+        if state == "SUCCESS":
+            return True
+        if state == "FAILED":
+            raise RuntimeError(f"batch job {job_id} failed: {job.get('content')}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"batch job {job_id} still {state} after timeout")
+        return False
+
+    def _case_id(self, test):
+        """qTest test case ID for a test, resolved through the case index if set"""
+        if self.case_index is None:
+            return test.get("test_case_id")
+        return self.case_index.resolve(test)
+
+    def _test_cycle_payload(self, cycle_name, description):
+        return {
+            "name": cycle_name,
+            "description": description,
+            "start_date": datetime.now().isoformat(),
+            "end_date": datetime.now().isoformat(),
+        }
 
-    def publish_results(self, results_data, cycle_name):
-        """Main method to publish all test results"""
-        print("\n" + "=" * 60)
-        print("  Publishing Results to qTest")
-        print("=" * 60)
+    def _test_run_payload(self, cycle_id, test_case_id, test_name):
+        return {
+            "name": test_name,
+            "test_case": {"id": test_case_id},
+            "test_cycle": {"id": cycle_id},
+        }
 
-        # Create test cycle
-        cycle_id = self.create_test_cycle(
-            cycle_name,
-            f"Automated execution via Tosca CI/CD - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    def _test_log_payload(self, qtest_status, execution_time, error_message):
+        return {
+            "exe_start_date": datetime.now().isoformat(),
+            "exe_end_date": datetime.now().isoformat(),
+            "status": qtest_status,
+            "note": error_message if error_message else "Test executed successfully",
+            "execution_time": execution_time,
+        }
+
+    def _auto_test_log(self, test, skipped):
+        """Build one batch auto-test-log entry for a test result.
+
+        The log names the same qTest test case the sequential mode creates
+        its test run for. automation_content, which qTest requires on every
+        log, carries that ID as well, so a log is never matched to another
+        test case by automation content. Screenshots that cannot be inlined
+        are added to skipped as (path, error) pairs.
+        """
+        status = QTEST_STATUSES.get(test.get("status", "Failed"), "FAILED")
+        error = test.get("error_message", "")
+        now = datetime.now().isoformat()
+        test_case_id = self._case_id(test)
+
+        test_log = {
+            "name": test.get("name", "Unknown Test"),
+            "test_case": {"id": test_case_id},
+            "automation_content": str(test_case_id),
+            "status": status,
+            "exe_start_date": test.get("start_time") or now,
+            "exe_end_date": test.get("end_time") or now,
+            "note": error if error else "Test executed successfully",
+            "execution_time": test.get("duration", 0),
+        }
+        if test.get("module"):
+            test_log["module_names"] = [test["module"]]
+        if status == "FAILED":
+            attachments = self._encode_attachments(test.get("screenshots", []), skipped)
+            if attachments:
+                test_log["attachments"] = attachments
+        return test_log
+
+    def _encode_attachments(self, attachments, skipped):
+        """Inline attachments as base64 for a batch auto-test-log.
+
+        Files that cannot be read, or would take the log past
+        MAX_INLINE_BYTES, are left out and added to skipped.
+        """
+        encoded = []
+        inlined_bytes = 0
+        for attachment_path in attachments:
+            path = Path(attachment_path)
+            try:
+                size = path.stat().st_size
+                if inlined_bytes + size > MAX_INLINE_BYTES:
+                    raise ValueError(
+                        f"{size} bytes would exceed the {MAX_INLINE_BYTES} byte "
+                        "limit for attachments inlined into a batch log"
+                    )
+                data = self._read_base64(path)
+            except (OSError, ValueError) as e:
+                skipped.append((attachment_path, e))
+                continue
+            inlined_bytes += size
+            # Counted by _record_inlined once the batch outcome is known
+            content_type = mimetypes.guess_type(path.name)[0]
+            encoded.append(
+                {
+                    "name": path.name,
+                    "content_type": content_type or "application/octet-stream",
+                    "data": data,
+                }
+            )
+        return encoded
+
+    @staticmethod
+    def _read_base64(path):
+        """Base64 text of a file, encoded a chunk at a time"""
+        with open(path, "rb") as f:
+            chunks = iter(lambda: f.read(INLINE_READ_SIZE), b"")
+            return "".join(base64.b64encode(chunk).decode("ascii") for chunk in chunks)
+
+    def _publish_sequential_flow(self, cycle_id, tests, total, stats):
+        """Create and update the test run of every test"""
+
+        def publish(item):
+            idx, test = item
+            published = yield from self._publish_test_flow(cycle_id, idx, total, test)
+            return test, published
+
+        limit = self.max_in_flight if self._concurrent_runs else 1
+        yield self._drain(
+            self._ordered(publish, enumerate(tests, 1), limit),
+            lambda published: self._tally(stats, *published),
         )
 
-        if not cycle_id:
-            print("❌ Cannot proceed without a test cycle")
+    def _tally(self, stats, test, published):
+        stats["total"] += 1
+        if self._case_id(test):
+            stats["mapped"] += 1
+        if published:
+            stats["published"] += 1
+
+    def _publish_test_flow(self, cycle_id, idx, total, test):
+        """Create and update the test run for one test, True if it was published"""
+        test_name = test.get("name", "Unknown Test")
+        test_case_id = self._case_id(test)
+        status = test.get("status", "Failed")
+        duration = test.get("duration", 0)
+        error = test.get("error_message", "")
+        screenshots = test.get("screenshots", [])
+
+        print(f"\n[{idx}/{total}] {test_name}")
+
+        if not test_case_id:
+            print("  ⚠️ No qTest test case ID mapped - skipping")
             return False
 
-        # Process each test result
-        total = len(results_data.get("test_results", []))
-        successful_updates = 0
+        key = self._test_keys[id(test)]
+        if self.checkpoint.done("log", key):
+            print(f"  ⏭️ Already published (Status: {status})")
+            return True
 
-        print(f"\n📊 Processing {total} test results...")
+        # Create test run, unless an earlier run already did
+        run_id = self.checkpoint.get("run", key)
+        if not run_id:
+            run_id = yield self.create_test_run(cycle_id, test_case_id, test_name)
+            if run_id:
+                self.checkpoint.record("run", key, run_id)
 
-        for idx, test in enumerate(results_data.get("test_results", []), 1):
+        if run_id:
+            # Update with results
+            if (
+                yield self.update_test_run_status(
+                    run_id, status, duration, error, screenshots
+                )
+            ):
+                self.checkpoint.record("log", key)
+                print(f"  ✅ Updated test run (Status: {status})")
+                return True
+
+        return False
+
+    def _publish_batched_flow(self, cycle_id, tests, total, stats):
+        """Submit test runs in batch jobs.
+
+        Per-test lines are printed in the same order and wording as the
+        sequential mode once the batch holding the test has been processed.
+        """
+
+        def submit(segment):
+            batch = [(idx, test) for idx, test, queued in segment if queued]
+            skipped = {idx: [] for idx, _ in batch}
+            if not batch:
+                return segment, {}, skipped
+            test_logs = []
+            try:
+                test_logs = [
+                    self._auto_test_log(test, skipped[idx]) for idx, test in batch
+                ]
+                job = yield self.submit_auto_test_logs(cycle_id, test_logs)
+            except self.errors + (RuntimeError, OSError, ValueError) as e:
+                self._record_inlined(test_logs, range(len(test_logs)))
+                return segment, {idx: e for idx, _ in batch}, skipped
+            return segment, self._record_batch(batch, test_logs, job), skipped
+
+        yield self._drain(
+            self._ordered(submit, self._segments(tests), self.max_in_flight),
+            lambda submitted: self._report_segment(*submitted, total, stats),
+        )
+
+    def _record_batch(self, batch, test_logs, job):
+        """Checkpoint the logs a batch job published, return the others' errors.
+
+        batch holds (idx, test) pairs; the errors are keyed by idx.
+        """
+        failures = self._failed_logs(job, len(batch))
+        self._record_inlined(test_logs, failures)
+        keys = [
+            self._test_keys[id(test)]
+            for position, (_, test) in enumerate(batch)
+            if position not in failures
+        ]
+        self.checkpoint.record_many("log", keys)
+        return {batch[position][0]: error for position, error in failures.items()}
+
+    @staticmethod
+    def _record_inlined(test_logs, failed):
+        """Count the attachments inlined in batch logs, by log outcome.
+
+        failed holds the positions of the logs that were not published.
+        """
+        for position, test_log in enumerate(test_logs):
+            outcome = "failed" if position in failed else "uploaded"
+            for attachment in test_log.get("attachments", ()):
+                data = attachment["data"]
+                size = len(data) // 4 * 3 - data[-2:].count("=")
+                record_attachment("qtest", attachment["name"], outcome, size)
+
+    def _segments(self, tests):
+        """Split the record stream into runs holding up to batch_size new test logs.
+
+        Yields lists of (idx, test, queued), where queued marks mapped tests
+        not published yet. Unmapped and already published tests ride along
+        so their lines print in order.
+        """
+        segment = []
+        queued_count = 0
+        for idx, test in enumerate(tests, 1):
+            queued = bool(self._case_id(test)) and not self.checkpoint.done(
+                "log", self._test_keys[id(test)]
+            )
+            segment.append((idx, test, queued))
+            queued_count += queued
+            # Long stretches of skipped tests are cut off to bound memory
+            if (
+                queued_count == self.batch_size
+                or len(segment) >= self.batch_size * SEGMENT_SPAN
+            ):
+                yield segment
+                segment = []
+                queued_count = 0
+        if segment:
+            yield segment
+
+    def _report_segment(self, segment, errors, skipped, total, stats):
+        """Print per-test lines for a processed segment and tally them.
+
+        errors maps the idx of every submitted test that was not published
+        to the reason; skipped maps idx to the attachments left out of its
+        log, with the reason.
+        """
+        for idx, test, queued in segment:
             test_name = test.get("name", "Unknown Test")
-            test_case_id = test.get("test_case_id")  # Must be mapped from Tosca
             status = test.get("status", "Failed")
-            duration = test.get("duration", 0)
-            error = test.get("error_message", "")
-            screenshots = test.get("screenshots", [])
-
             print(f"\n[{idx}/{total}] {test_name}")
 
-            if not test_case_id:
+            published = False
+            if not self._case_id(test):
                 print("  ⚠️ No qTest test case ID mapped - skipping")
-                continue
+            elif not queued:
+                # Published by an earlier run of this checkpoint
+                published = True
+                print(f"  ⏭️ Already published (Status: {status})")
+            elif idx not in errors:
+                published = True
+                print(f"  ✅ Updated test run (Status: {status})")
+            else:
+                print(f"⚠️ Failed to create test run for {test_name}: {errors[idx]}")
+            for attachment_path, error in skipped.get(idx, ()):
+                self._report_attachment(attachment_path, "failed", error)
+
+            self._tally(stats, test, published)
 
-            # Create test run
-            run_id = self.create_test_run(cycle_id, test_case_id, test_name)
+    def publish_results(self, results_data, cycle_name):
+        """Main method to publish all test results"""
+        return self._run(self._publish_results_flow(results_data, cycle_name))
 
-            if run_id:
-                # Update with results
-                if self.update_test_run_status(
-                    run_id, status, duration, error, screenshots
-                ):
-                    successful_updates += 1
-                    print(f"  ✅ Updated test run (Status: {status})")
+    def _publish_results_flow(self, results_data, cycle_name):
+        with timer("tracker_publish_seconds", tracker="qtest"):
+            print("\n" + "=" * 60)
+            print("  Publishing Results to qTest")
+            print("=" * 60)
+
+            cycle_id = yield from self._open_test_cycle_flow(cycle_name)
+            if not cycle_id:
+                print("❌ Cannot proceed without a test cycle")
+                self.checkpoint.close()
+                return False
+
+            # Process each test result
+            total = summary_count(results_data, "total")
+
+            print(f"\n📊 Processing {total} test results...")
+
+            stats = Counter()
+            try:
+                yield from self._publish_tests_flow(
+                    cycle_id, results_data.get("test_results", []), total, stats
+                )
+            except ResultsFileError as e:
+                return self.abandon_publishing(e)
+
+            return self.finish_publishing(stats)
+
+    def open_test_cycle(self, cycle_name):
+        """Get ready to publish into a test cycle, return its ID or None.
+
+        Refreshes the test case index and creates the cycle, unless the
+        checkpoint holds the one a previous run created.
+        """
+        return self._run(self._open_test_cycle_flow(cycle_name))
+
+    def _open_test_cycle_flow(self, cycle_name):
+        if self.checkpoint.resumed:
+            print(
+                f"♻️ Checkpoint has {self.checkpoint.resumed} completed operations "
+                "- publishing the remainder"
+            )
+
+        if self.case_index is not None and (yield self._refresh_case_index()):
+            print(f"🗂️ Test case index: {len(self.case_index)} qTest test cases")
+
+        # Create test cycle, or reuse the one a previous run created
+        cycle_id = self.checkpoint.get("cycle", cycle_name)
+        if cycle_id:
+            print(f"♻️ Resuming test cycle: {cycle_name} (ID: {cycle_id})")
+        else:
+            cycle_id = yield self.create_test_cycle(
+                cycle_name, self._cycle_description()
+            )
+            if cycle_id:
+                self.checkpoint.record("cycle", cycle_name, cycle_id)
+        return cycle_id
+
+    def publish_tests(self, cycle_id, tests, total, stats, seen=None):
+        """Publish a stream of test records to a test cycle, tallying stats.
+
+        seen carries key occurrence counts from earlier calls, so records
+        published over several calls keep distinct checkpoint keys.
+        """
+        return self._run(self._publish_tests_flow(cycle_id, tests, total, stats, seen))
+
+    def _publish_tests_flow(self, cycle_id, tests, total, stats, seen=None):
+        self._test_keys = {}
+        tests = stream_test_keys(tests, self._test_keys, seen)
+        if self.batch:
+            yield from self._publish_batched_flow(cycle_id, tests, total, stats)
+        else:
+            yield from self._publish_sequential_flow(cycle_id, tests, total, stats)
+
+    def finish_publishing(self, stats):
+        """Print the summary and settle the checkpoint, True if all tests landed"""
+        self._print_summary(stats["total"], stats["published"])
+        self._finish_checkpoint(stats["published"] == stats["mapped"])
+
+        return stats["published"] == stats["total"]
+
+    def _cycle_description(self):
+        return (
+            "Automated execution via Tosca CI/CD - "
+            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        )
 
-        # Summary
+    def _print_summary(self, total, successful_updates):
         print("\n" + "=" * 60)
         print(f"  SUMMARY")
         print("=" * 60)
@@ -182,37 +655,345 @@ class QTestIntegration:
         )
         print("=" * 60 + "\n")
 
-        return successful_updates == total
+    def abandon_publishing(self, error):
+        """Stop at an unreadable test record, keeping what was published"""
+        print(f"\n❌ Failed to read test results: {error}")
+        self._finish_checkpoint(False)
+        return False
+
+    def _finish_checkpoint(self, complete):
+        """Drop the checkpoint if every mapped test was published, else keep it"""
+        self.uploader.cache.save()
+
+        checkpoint = self.checkpoint
+        if complete:
+            checkpoint.finish()
+        else:
+            checkpoint.close()
+            if checkpoint.path:
+                print(
+                    f"💾 Checkpoint kept at {checkpoint.path} "
+                    "- re-run to publish the remainder"
+                )
+
+
+class AsyncQTestIntegration(QTestIntegration):
+    """asyncio variant of QTestIntegration.
+
+    Runs the sync client's publishing flows; only the network methods and
+    the I/O hooks differ, so publish_results, open_test_cycle and
+    publish_tests return coroutines. Requests go through an AsyncHttpClient,
+    with max_in_flight bounding concurrent test runs or batch jobs.
+    """
+
+    def __init__(
+        self,
+        api_url,
+        token,
+        project_id,
+        client,
+        batch=False,
+        batch_size=QTEST_BATCH_SIZE,
+        max_in_flight=1,
+        checkpoint=None,
+        attachment_cache=None,
+        upload_workers=DEFAULT_UPLOAD_WORKERS,
+        case_index=None,
+    ):
+        super().__init__(
+            api_url,
+            token,
+            project_id,
+            batch=batch,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            checkpoint=checkpoint,
+            uploader=AttachmentUploader(None, attachment_cache, upload_workers),
+            case_index=case_index,
+        )
+        self.client = client
+        self.errors = request_errors()
+
+    _run = staticmethod(run_flow_async)
+    _map = staticmethod(gather_ordered)
+    _concurrent_runs = True
+
+    @staticmethod
+    async def _drain(results, consume):
+        async for result in results:
+            consume(result)
 
+    def _refresh_case_index(self):
+        return self.case_index.refresh_async(
+            self.client, self.api_url, self.headers, self.project_id, self.errors
+        )
 
-def load_results(results_file):
-    """Load test results from JSON file"""
-    try:
-        with open(results_file, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"❌ Failed to load results file: {e}")
-        sys.exit(1)
+    async def _post(self, endpoint, payload, **kwargs):
+        response = await self.client.post(
+            endpoint, headers=self.headers, json=payload, **kwargs
+        )
+        response.raise_for_status()
+        return response
+
+    @api_timer("qtest")
+    async def create_test_cycle(self, cycle_name, description=""):
+        """Create a new test cycle in qTest"""
+        endpoint = f"{self.api_url}/projects/{self.project_id}/test-cycles"
+        payload = self._test_cycle_payload(cycle_name, description)
+
+        try:
+            cycle_data = (await self._post(endpoint, payload)).json()
+            print(f"✅ Created test cycle: {cycle_name} (ID: {cycle_data['id']})")
+            return cycle_data["id"]
+        except self.errors as e:
+            print(f"❌ Failed to create test cycle: {e}")
+            return None
+
+    @api_timer("qtest")
+    async def create_test_run(self, cycle_id, test_case_id, test_name):
+        """Create a test run within a cycle"""
+        endpoint = f"{self.api_url}/projects/{self.project_id}/test-runs"
+        payload = self._test_run_payload(cycle_id, test_case_id, test_name)
+
+        try:
+            return (await self._post(endpoint, payload)).json()["id"]
+        except self.errors as e:
+            print(f"⚠️ Failed to create test run for {test_name}: {e}")
+            return None
+
+    @api_timer("qtest")
+    async def update_test_run_status(
+        self, run_id, status, execution_time, error_message="", attachments=None
+    ):
+        """Update test run with execution results"""
+        endpoint = (
+            f"{self.api_url}/projects/{self.project_id}"
+            f"/test-runs/{run_id}/auto-test-logs"
+        )
+
+        qtest_status = QTEST_STATUSES.get(status, "FAILED")
+        payload = self._test_log_payload(qtest_status, execution_time, error_message)
+
+        try:
+            await self._post(endpoint, payload)
+
+            # Upload attachments if provided
+            if attachments and qtest_status == "FAILED":
+                await self.upload_attachments(run_id, attachments)
+
+            return True
+        except self.errors as e:
+            print(f"⚠️ Failed to update test run {run_id}: {e}")
+            return False
+
+    @api_timer("qtest")
+    async def upload_attachments(self, run_id, attachments):
+        """Upload screenshots and logs to test run"""
+        endpoint = (
+            f"{self.api_url}/projects/{self.project_id}/test-runs/{run_id}/attachments"
+        )
+
+        # aiohttp sets Content-Type for the multipart body
+        headers = {"Authorization": self.headers["Authorization"]}
+        target = f"qtest:{self.api_url}:{self.project_id}:{run_id}"
+        async for attachment_path, outcome, error in self.uploader.upload_async(
+            self.client, target, endpoint, attachments, headers
+        ):
+            self._report_attachment(attachment_path, outcome, error)
+
+    @api_timer("qtest")
+    async def submit_auto_test_logs(self, cycle_id, test_logs):
+        """Create test runs and their logs in one batch job and wait for it"""
+        endpoint = f"{self.api_url}/projects/{self.project_id}/auto-test-logs"
+
+        response = await self._post(
+            endpoint,
+            {"test_cycle": cycle_id, "test_logs": test_logs},
+            params={"type": "automation"},
+        )
+        job = response.json()
+        if job.get("state") != "SUCCESS":
+            job = await self.wait_for_queue_job(self._queue_job_id(job))
+        return job
+
+    @api_timer("qtest")
+    async def wait_for_queue_job(self, job_id):
+        """Poll a queued batch job until qTest has processed it"""
+        endpoint = f"{self.api_url}/projects/queue-processing/{job_id}"
+        deadline = time.monotonic() + QUEUE_TIMEOUT
+
+        while True:
+            response = await self.client.get(endpoint, headers=self.headers)
+            response.raise_for_status()
+            job = response.json()
+            if self._queue_job_done(job, job_id, deadline):
+                return job
+            await asyncio.sleep(QUEUE_POLL_INTERVAL)
+
+
+async def publish_results_async(args, results, checkpoint, case_index):
+    """Run AsyncQTestIntegration.publish_results with a scoped HTTP client"""
+    async with AsyncHttpClient(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    ) as client:
+        qtest = AsyncQTestIntegration(
+            args.api_url,
+            args.token,
+            args.project_id,
+            client,
+            batch=args.batch,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+            checkpoint=checkpoint,
+            attachment_cache=AttachmentCache(args.attachment_cache),
+            upload_workers=args.upload_workers,
+            case_index=case_index,
+        )
+        try:
+            return await qtest.publish_results(results, args.test_cycle)
+        finally:
+            # Everything recorded so far stays on disk for a resumed run
+            qtest.checkpoint.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Publish Tosca results to qTest")
-    parser.add_argument("--results", required=True, help="Path to results JSON file")
+    parser.add_argument(
+        "--results", required=True, help="Path to results JSON/NDJSON file"
+    )
     parser.add_argument("--api-url", required=True, help="qTest API URL")
     parser.add_argument("--token", required=True, help="qTest API token")
     parser.add_argument("--project-id", required=True, help="qTest project ID")
     parser.add_argument("--test-cycle", required=True, help="Test cycle name")
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Keep-alive connections per host",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=None,
+        help="Maximum requests per second per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Retries for throttled (429/503) requests",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit test runs through batch auto-test-log jobs",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=QTEST_BATCH_SIZE,
+        help="Test logs per batch submission (with --batch)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1,
+        help="Batch submissions (or test runs with --async) processed at once",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=DEFAULT_UPLOAD_WORKERS,
+        help="Parallel attachment uploads per test run",
+    )
+    parser.add_argument(
+        "--upload-budget-mb",
+        type=int,
+        default=DEFAULT_UPLOAD_BUDGET // (1024 * 1024),
+        help="Attachment bytes in flight at once, in MB",
+    )
+    parser.add_argument(
+        "--attachment-cache",
+        help="File remembering attachments already uploaded to each test run",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for resuming an interrupted run",
+    )
+    parser.add_argument(
+        "--case-index",
+        help="Local index of qTest test cases; map tests by qTest PID or name "
+        "unless their test case ID is marked qtest:<id>",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Publish with the asyncio client (requires aiohttp)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write timings, retries and upload bytes here "
+        "(Prometheus text format for .prom/.txt, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write cProfile stats of the publishing stage to this file "
+        "(worker threads included)",
+    )
 
     args = parser.parse_args()
 
     # Load results
     results = load_results(args.results)
 
+    checkpoint = None
+    if args.checkpoint:
+        scope = f"qtest|{args.api_url}|{args.project_id}|{args.test_cycle}"
+        checkpoint = PublishCheckpoint(args.checkpoint, scope)
+    case_index = QTestCaseIndex(args.case_index) if args.case_index else None
+
+    if args.use_async:
+        try:
+            with profiled(args.profile):
+                success = asyncio.run(
+                    publish_results_async(args, results, checkpoint, case_index)
+                )
+        except KeyboardInterrupt:
+            print("\n⚠️ Interrupted - re-run with the same checkpoint to resume")
+            sys.exit(130)
+        finally:
+            save_metrics(args.metrics_file)
+        sys.exit(0 if success else 1)
+
+    session = get_shared_session(
+        args.pool_size, max_rps=args.max_rps, max_retries=args.max_retries
+    )
+    uploader = AttachmentUploader(
+        session,
+        AttachmentCache(args.attachment_cache),
+        max_workers=args.upload_workers,
+        max_bytes=args.upload_budget_mb * 1024 * 1024,
+    )
+
     # Initialize qTest integration
-    qtest = QTestIntegration(args.api_url, args.token, args.project_id)
+    qtest = QTestIntegration(
+        args.api_url,
+        args.token,
+        args.project_id,
+        session=session,
+        batch=args.batch,
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+        checkpoint=checkpoint,
+        uploader=uploader,
+        case_index=case_index,
+    )
 
     # Publish results
-    success = qtest.publish_results(results, args.test_cycle)
+    with profiled(args.profile):
+        success = qtest.publish_results(results, args.test_cycle)
+    save_metrics(args.metrics_file)
 
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,194 @@
+"""
+qTest Test Case Index for Integration Scripts
+Local index of a project's qTest test cases, so Tosca tests are mapped to qTest
+IDs without maintaining mappings by hand or searching once per test
+"""
+
+import json
+import os
+
+import requests
+
+from io_flow import run_flow, run_flow_async
+
+# Test cases fetched per page of the project test-case listing
+TEST_CASE_PAGE_SIZE = 500
+
+# Marks a test_case_id that is a qTest test case ID, e.g. "qtest:4231"
+QTEST_ID_PREFIX = "qtest:"
+
+
+def normalize_name(name):
+    """Case- and whitespace-insensitive form of a test case name"""
+    return " ".join(str(name or "").split()).casefold()
+
+
+class QTestCaseIndex:
+    """qTest PID / test case name -> test case ID, persisted to a local JSON file.
+
+    refresh() pages through the project's test cases and keeps each page's
+    ETag and Last-Modified. The next refresh sends them back, so pages the
+    server answers with 304 Not Modified are reused from the file instead of
+    being downloaded again. If the listing fails, the last saved index is
+    used as is.
+
+    Names shared by several test cases are not indexed, so such tests are
+    reported as unmapped instead of being published to a guessed test case.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.scope = None
+        self.pages = []
+        self.ids = {}
+        self.pids = {}
+        self.names = {}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                self.scope = saved.get("scope")
+                self.pages = saved.get("pages", [])
+            except (OSError, ValueError, AttributeError):
+                self.pages = []
+        self._build()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def refresh(self, session, api_url, headers, project_id):
+        """Reload the project's test cases from qTest, return True on success"""
+        errors = (requests.exceptions.RequestException,)
+        return run_flow(
+            self._refresh_flow(session.get, api_url, headers, project_id, errors)
+        )
+
+    def refresh_async(self, client, api_url, headers, project_id, errors):
+        """refresh() for an AsyncHttpClient; errors are its request exceptions"""
+        return run_flow_async(
+            self._refresh_flow(client.get, api_url, headers, project_id, errors)
+        )
+
+    def _refresh_flow(self, get, api_url, headers, project_id, errors):
+        """Page through the listing, yielding each get() for the client to run"""
+        endpoint, cached = self._listing(api_url, project_id)
+        pages = []
+        try:
+            while True:
+                number = len(pages) + 1
+                response = yield get(
+                    endpoint,
+                    headers=self._page_headers(headers, cached, number),
+                    params=self._page_params(number),
+                )
+                page = self._read_page(response, cached, number)
+                pages.append(page)
+                if len(page["cases"]) < TEST_CASE_PAGE_SIZE:
+                    break
+        except errors + (ValueError, KeyError) as e:
+            print(f"⚠️ Failed to refresh test case index, using cached copy: {e}")
+            return False
+
+        self._replace(f"{api_url}|{project_id}", pages)
+        return True
+
+    def _listing(self, api_url, project_id):
+        """Listing endpoint plus the saved pages usable for conditional requests"""
+        endpoint = f"{api_url}/projects/{project_id}/test-cases"
+        # An index saved for another project cannot validate this one's pages
+        cached = self.pages if self.scope == f"{api_url}|{project_id}" else []
+        return endpoint, cached
+
+    @staticmethod
+    def _page_params(number):
+        return {
+            "page": number,
+            "size": TEST_CASE_PAGE_SIZE,
+            "expandProps": "false",
+            "expandSteps": "false",
+        }
+
+    @staticmethod
+    def _page_headers(headers, cached, number):
+        """Request headers, with the saved validators of this page if any"""
+        if number > len(cached):
+            return headers
+        page = cached[number - 1]
+        headers = dict(headers)
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    @staticmethod
+    def _read_page(response, cached, number):
+        """One page as {"etag", "last_modified", "cases": [[id, pid, name]]}"""
+        if response.status_code == 304 and number <= len(cached):
+            return cached[number - 1]
+        response.raise_for_status()
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "cases": [
+                [case["id"], case.get("pid"), case.get("name")]
+                for case in response.json()
+            ],
+        }
+
+    def _replace(self, scope, pages):
+        self.scope = scope
+        self.pages = pages
+        self._build()
+        self.save()
+
+    def _build(self):
+        """Rebuild the lookup tables from the saved pages"""
+        self.ids = {}
+        self.pids = {}
+        self.names = {}
+        ambiguous = set()
+
+        for page in self.pages:
+            for case_id, pid, name in page.get("cases", []):
+                self.ids[str(case_id)] = case_id
+                if pid:
+                    self.pids[str(pid).upper()] = case_id
+                key = normalize_name(name)
+                if not key or key in ambiguous:
+                    continue
+                if key in self.names and self.names[key] != case_id:
+                    del self.names[key]
+                    ambiguous.add(key)
+                else:
+                    self.names[key] = case_id
+
+    def resolve(self, test):
+        """qTest test case ID for a test record, or None if it has none.
+
+        The record's test_case_id is looked up as a qTest PID, then the test
+        by name. A Tosca ID is never taken for a qTest ID, as the two can
+        collide; only a test_case_id marked with QTEST_ID_PREFIX is used as
+        one. With an empty index the record's test_case_id is returned
+        unchanged, less any marker.
+        """
+        test_case_id = str(test.get("test_case_id") or "")
+        if test_case_id.lower().startswith(QTEST_ID_PREFIX):
+            qtest_id = test_case_id[len(QTEST_ID_PREFIX) :].strip()
+            return self.ids.get(qtest_id) if self.ids else qtest_id
+        if not self.ids:
+            return test.get("test_case_id")
+
+        case_id = self.pids.get(test_case_id.upper()) if test_case_id else None
+        if case_id is not None:
+            return case_id
+        return self.names.get(normalize_name(test.get("name")))
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"scope": self.scope, "pages": self.pages}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,196 @@
+"""
+Request Scheduler for Integration Scripts
+Paces outbound API calls per host and retries throttled requests with backoff
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+from pipeline_metrics import inc
+
+# Responses that mean "slow down and try again"
+RETRY_STATUSES = (429, 503)
+
+# Methods safe to resend after a connection dropped mid-request
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+DEFAULT_MAX_RETRIES = 5
+
+# Seconds for the first backoff step, and the cap for any single wait
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 60.0
+
+# Longest Retry-After the scheduler will honor before giving up on a request
+RETRY_AFTER_MAX = 300.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second.
+
+    A rate of None leaves requests unpaced but still honors pause_until, so
+    a Retry-After from one call holds back every caller sharing the bucket.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate or 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token if one is available, else return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self.paused_until - now
+            if wait > 0:
+                return wait
+            if not self.rate:
+                return 0
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold back every caller for at least `seconds`"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class RequestScheduler:
+    """Sends requests through per-host token buckets, retrying 429/503 responses"""
+
+    def __init__(self, max_rps=None, max_retries=DEFAULT_MAX_RETRIES):
+        self.max_rps = max_rps
+        self.max_retries = max_retries
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.max_rps)
+            return self._buckets[host]
+
+    def send(self, method, url, send_request, rewind=None):
+        """Call send_request() until it is not throttled or retries run out.
+
+        rewind is called before every retry so file bodies are re-sent from
+        the start. The last response is returned either way; callers keep
+        handling errors through raise_for_status().
+
+        A dropped connection is retried only if resending cannot duplicate
+        work: for idempotent methods, or when the connection was never
+        established. A POST whose connection broke after it was sent is
+        raised to the caller, whose checkpoint or defect index decides
+        whether it needs sending again.
+        """
+        bucket = self.bucket(url)
+        attempt = 0
+
+        while True:
+            bucket.acquire()
+            try:
+                response = send_request()
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.max_retries or not self.resendable(method, e):
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+                response.close()
+                bucket.pause(delay)
+
+            attempt += 1
+            self.count_retry(url)
+            time.sleep(delay)
+            if rewind:
+                rewind()
+
+    def retry_delay(self, response, attempt):
+        """Seconds to wait before retrying a response, or None to return it"""
+        if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        delay = retry_after(response)
+        if delay is None:
+            return self.backoff(attempt)
+        if delay > RETRY_AFTER_MAX:
+            return None
+        return delay
+
+    @staticmethod
+    def resendable(method, error):
+        """True if a request that failed with a ConnectionError may be resent"""
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        # requests wraps urllib3's MaxRetryError, whose reason is the failure;
+        # NewConnectionError (refused, unreachable) is a ConnectTimeoutError
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, "reason", reason)
+        return isinstance(reason, ConnectTimeoutError)
+
+    def count_retry(self, url):
+        """Count a request about to be resent, for url's host"""
+        with self._lock:
+            self.retries += 1
+        inc("tracker_http_retries_total", host=urlsplit(url).netloc)
+
+    @staticmethod
+    def backoff(attempt):
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def retry_after(response):
+    """Seconds requested by a Retry-After header, or None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
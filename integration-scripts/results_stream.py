@@ -0,0 +1,235 @@
+"""
+Results Stream for Integration Scripts
+Reads parsed results files incrementally, so publishing starts right away and
+memory does not grow with the number of test records
+"""
+
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+# Characters read from a results file at a time
+READ_SIZE = 1024 * 1024
+
+# Bytes searched at the end of a file for a summary written after the records
+TAIL_SIZE = 64 * 1024
+
+# Summary counters the integrations print before they see any test record
+SUMMARY_KEYS = ("total", "passed", "failed", "skipped", "blocked")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ResultsFileError(ValueError):
+    """A test record in a results file could not be decoded"""
+
+
+def load_results(results_file):
+    """Load a JSON or NDJSON results file.
+
+    Returns the summary values with "test_results" as a one-pass iterator
+    that reads the test records from disk as it is consumed. A record that
+    does not decode raises ResultsFileError from the iterator.
+    """
+    try:
+        if results_file.endswith(".ndjson"):
+            return load_ndjson_results(results_file)
+        return load_json_results(results_file)
+    except Exception as e:
+        print(f"❌ Failed to load results file: {e}")
+        sys.exit(1)
+
+
+def load_ndjson_results(results_file):
+    """Load the summary sidecar of an NDJSON results file plus its record stream"""
+    summary_file = os.path.splitext(results_file)[0] + ".summary.json"
+    with open(summary_file, "r") as f:
+        results = json.load(f)
+
+    results["test_results"] = iter_ndjson_records(results_file)
+    return results
+
+
+def iter_ndjson_records(results_file):
+    """Yield test records from an NDJSON results file one line at a time"""
+    with open(results_file, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ResultsFileError(f"{results_file}:{number}: {e}") from e
+
+
+def load_json_results(results_file):
+    """Load the summary of a results JSON document plus its record stream"""
+    reader = JsonResultsReader(results_file)
+    results = dict(reader.read_summary())
+
+    # parse-results.py --stream-output writes the summary after the records
+    if not all(key in results for key in SUMMARY_KEYS):
+        results.update(trailing_summary(results_file))
+
+    results["test_results"] = reader.records()
+    return results
+
+
+def trailing_summary(results_file):
+    """Summary values of a document that keeps them after its test records"""
+    summary = _read_tail_summary(results_file)
+    if summary is not None and all(key in summary for key in SUMMARY_KEYS):
+        return summary
+
+    # Unknown layout: read the records once, without keeping them
+    reader = JsonResultsReader(results_file)
+    reader.read_summary()
+    counts = Counter()
+    for test in reader.records():
+        counts["total"] += 1
+        counts[str(test.get("status", "")).lower()] += 1
+
+    summary = {key: counts[key] for key in SUMMARY_KEYS}
+    summary.update(reader.summary)
+    return summary
+
+
+def _read_tail_summary(results_file):
+    """Values after the closing bracket of a one-record-per-line array, or None"""
+    with open(results_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - TAIL_SIZE))
+        tail = f.read().decode("utf-8", errors="replace")
+
+    # Records are written one per line, so only the array's end starts a line
+    end = tail.rfind("\n]")
+    if end < 0:
+        return None
+    rest = tail[end + 2 :].strip()
+    if rest.startswith(","):
+        rest = rest[1:]
+    try:
+        summary = json.loads("{" + rest)
+    except ValueError:
+        return None
+    return summary if isinstance(summary, dict) else None
+
+
+def summary_count(results_data, key):
+    """A summary counter, counted from in-memory records when it is missing"""
+    if key in results_data:
+        return results_data[key]
+    tests = results_data.get("test_results", [])
+    if not isinstance(tests, list):
+        return 0
+    if key == "total":
+        return len(tests)
+    return sum(1 for test in tests if str(test.get("status", "")).lower() == key)
+
+
+class JsonResultsReader:
+    """Incremental reader for a results JSON document.
+
+    Top-level values other than "test_results" are collected in summary;
+    test records are decoded one at a time as records() is iterated, so only
+    the current record and the read buffer are held in memory.
+    """
+
+    def __init__(self, results_file):
+        self.results_file = results_file
+        self._file = open(results_file, "r", encoding="utf-8")
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._members = 0
+        self._at_records = False
+        self.summary = {}
+
+    def read_summary(self):
+        """Read top-level values up to the test records and return them"""
+        self._expect("{")
+        while self._next_member():
+            key = self._decode()
+            self._expect(":")
+            if key == "test_results":
+                self._at_records = True
+                break
+            self.summary[key] = self._decode()
+        return self.summary
+
+    def records(self):
+        """Yield the test records, then read any values that follow them"""
+        try:
+            if not self._at_records:
+                return
+            self._expect("[")
+            if self._peek() == "]":
+                self._pos += 1
+            else:
+                while True:
+                    yield self._decode()
+                    separator = self._peek()
+                    self._pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError("expected ',' or ']' in test_results")
+
+            while self._next_member():
+                key = self._decode()
+                self._expect(":")
+                self.summary[key] = self._decode()
+        except ValueError as e:
+            raise ResultsFileError(f"{self.results_file}: {e}") from e
+        finally:
+            self._file.close()
+
+    def _next_member(self):
+        """Move to the next top-level key, False at the end of the document"""
+        if self._peek() == "}":
+            self._pos += 1
+            return False
+        if self._members:
+            self._expect(",")
+        self._members += 1
+        return True
+
+    def _decode(self):
+        """Decode the JSON value at the read position"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number running up to the buffer's end may continue after it
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _peek(self):
+        """Skip whitespace and return the next character, "" at end of file"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ""
+            self._fill()
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} but found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def _fill(self):
+        chunk = self._file.read(READ_SIZE)
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        if not chunk:
+            self._eof = True
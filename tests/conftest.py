@@ -0,0 +1,76 @@
+"""
+Shared fixtures for the CI/CD and integration script tests
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT_DIR / "ci-cd" / "scripts"
+INTEGRATION_DIR = ROOT_DIR / "integration-scripts"
+
+# The integration scripts import their helper modules by plain name
+sys.path.insert(0, str(INTEGRATION_DIR))
+
+
+def load_script(name: str, path: Path):
+    """Import a script whose file name is not importable by name, once"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def benchmark_parser():
+    # Loads parse-results.py as parse_results, shared with parser_module
+    return load_script("benchmark_parser", SCRIPTS_DIR / "benchmark-parser.py")
+
+
+@pytest.fixture(scope="session")
+def parser_module(benchmark_parser):
+    return benchmark_parser.parser_module
+
+
+@pytest.fixture(scope="session")
+def generator_module(benchmark_parser):
+    return benchmark_parser.generator_module
+
+
+@pytest.fixture(scope="session")
+def history_module():
+    return load_script("results_history", SCRIPTS_DIR / "results-history.py")
+
+
+@pytest.fixture(scope="session")
+def benchmark_publish():
+    # Loads the mock server and both integrations, shared with the fixtures
+    return load_script("benchmark_publish", SCRIPTS_DIR / "benchmark-publish.py")
+
+
+@pytest.fixture(scope="session")
+def qtest_module(benchmark_publish):
+    return benchmark_publish.qtest_module
+
+
+@pytest.fixture(scope="session")
+def jira_module(benchmark_publish):
+    return benchmark_publish.jira_module
+
+
+@pytest.fixture
+def mock_server(benchmark_publish):
+    with benchmark_publish.mock_module.MockTrackerServer(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def results_factory(benchmark_publish):
+    """Deterministic parsed-results documents, as benchmark-publish uses"""
+    return benchmark_publish.synthetic_results
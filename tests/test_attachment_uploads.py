@@ -0,0 +1,115 @@
+"""
+Attachment upload cache: claims, waiting on in-flight uploads and eviction
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import async_http
+from async_http import AsyncHttpClient
+from attachment_uploads import AttachmentCache, AttachmentUploader
+from http_session import create_session
+
+
+def claim_in_thread(cache, target, digest):
+    """Start claim() on another thread, return (thread, result list)"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(cache.claim(target, digest)))
+    thread.start()
+    return thread, result
+
+
+def test_waiter_sees_a_completed_upload_as_cached():
+    cache = AttachmentCache()
+    assert cache.claim("BANK-1", "abc")
+    thread, result = claim_in_thread(cache, "BANK-1", "abc")
+    time.sleep(0.05)
+    assert result == []
+
+    cache.complete("BANK-1", "abc")
+    thread.join(timeout=5)
+
+    assert result == [False]
+
+
+def test_waiter_claims_a_released_upload():
+    cache = AttachmentCache()
+    assert cache.claim("BANK-1", "abc")
+    thread, result = claim_in_thread(cache, "BANK-1", "abc")
+
+    cache.release("BANK-1", "abc")
+    thread.join(timeout=5)
+
+    assert result == [True]
+
+
+def test_async_waiter_claims_a_released_upload():
+    cache = AttachmentCache()
+
+    async def run():
+        assert await cache.claim_async("BANK-1", "abc")
+        waiter = asyncio.ensure_future(cache.claim_async("BANK-1", "abc"))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        cache.release("BANK-1", "abc")
+        return await waiter
+
+    assert asyncio.run(run())
+
+
+def test_save_drops_expired_and_least_recently_used_targets(tmp_path):
+    path = tmp_path / "attachments.json"
+    cache = AttachmentCache(str(path), max_age=3600, max_targets=2)
+    for target in ("BANK-1", "BANK-2", "BANK-3", "BANK-4"):
+        assert cache.claim(target, "abc")
+        cache.complete(target, "abc")
+    cache.used["BANK-1"] = time.time() - 7200
+    cache.used["BANK-2"] = time.time() - 60
+    cache.save()
+
+    assert sorted(json.loads(path.read_text())) == ["BANK-3", "BANK-4"]
+    assert not AttachmentCache(str(path)).claim("BANK-4", "abc")
+
+
+def test_same_file_twice_is_uploaded_once(mock_server, tmp_path):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 1000)
+    endpoint = f"{mock_server.url}/rest/api/2/issue/BANK-1/attachments"
+    session = create_session()
+
+    outcomes = [
+        outcome
+        for _, outcome, _ in AttachmentUploader(session, max_workers=2).upload(
+            "BANK-1", endpoint, [str(screenshot), str(screenshot)]
+        )
+    ]
+    session.close()
+
+    assert outcomes == ["uploaded", "cached"]
+    assert mock_server.trackers.summary()["attachments"] == 1
+
+
+def test_async_upload_closes_the_file_when_the_request_fails(tmp_path, monkeypatch):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 1000)
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(async_http, "open", tracking_open, raising=False)
+
+    async def run():
+        async with AsyncHttpClient() as client:
+            # Rejected before aiohttp builds the request that would own the form
+            uploads = AttachmentUploader(None).upload_async(
+                client, "BANK-1", "http:///attachments", [str(screenshot)]
+            )
+            return [outcome async for _, outcome, _ in uploads]
+
+    assert asyncio.run(run()) == ["failed"]
+    assert len(opened) == 1
+    assert opened[0].closed
@@ -0,0 +1,76 @@
+"""
+Synthetic exports from generate-results.py parse to what was requested
+"""
+
+import contextlib
+import io
+import re
+from collections import Counter
+
+import pytest
+
+RESULT = re.compile(r'<TestCase Name="([^"]+)"|<Result Status="([^"]+)"/>')
+
+
+def generated_statuses(xml_files):
+    """Status the generator wrote for each test, read from the raw exports"""
+    statuses = {}
+    name = None
+    for xml_file in xml_files:
+        for test_name, status in RESULT.findall(xml_file.read_text()):
+            if test_name:
+                name = test_name
+            else:
+                statuses.setdefault(name, status)
+    return statuses
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["dom", "streaming"])
+@pytest.mark.parametrize("depth", [1, 4])
+def test_generated_exports_parse_to_the_requested_tests(
+    parser_module, generator_module, tmp_path, depth, streaming
+):
+    xml_files = generator_module.write_synthetic_results(
+        tmp_path / "res", 250, files=3, depth=depth, screenshots=2
+    )
+    parser = parser_module.ToscaResultsParser(tmp_path / "res", streaming=streaming)
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records()
+
+    assert [path.name for path in xml_files] == [
+        f"synthetic-results-{number:03d}.xml" for number in range(3)
+    ]
+    assert [test.name for test in parser.records] == [
+        f"TC_{idx:06d}" for idx in range(250)
+    ]
+    assert {test.name: test.status for test in parser.records} == (
+        generated_statuses(xml_files)
+    )
+    statuses = Counter(test.status for test in parser.records)
+    assert set(statuses) == set(generator_module.STATUSES)
+    assert parser.summary["total"] == 250
+    for status in ("passed", "failed", "skipped", "blocked"):
+        assert parser.summary[status] == statuses[status.capitalize()]
+
+    for idx, test in enumerate(parser.records):
+        assert test.xray_test_key == f"BANK-{idx}"
+        if test.status == "Failed":
+            assert test.error_message.startswith("Verification of Value_1 failed")
+            assert len(test.screenshots) == 2
+        else:
+            assert not test.screenshots and test.error_message == ""
+
+
+def test_generation_is_reproducible(generator_module, tmp_path):
+    first = generator_module.write_synthetic_results(tmp_path / "a", 40, files=2)
+    second = generator_module.write_synthetic_results(tmp_path / "b", 40, files=2)
+    other_seed = generator_module.write_synthetic_results(
+        tmp_path / "c", 40, files=2, seed=7
+    )
+
+    assert [path.read_bytes() for path in first] == [
+        path.read_bytes() for path in second
+    ]
+    assert [path.read_bytes() for path in first] != [
+        path.read_bytes() for path in other_seed
+    ]
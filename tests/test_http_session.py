@@ -0,0 +1,65 @@
+"""
+Shared keep-alive sessions of the integration clients
+"""
+
+import contextlib
+import io
+
+import pytest
+import http_session
+from http_session import close_shared_sessions, create_session, get_shared_session
+
+
+@pytest.fixture(autouse=True)
+def no_shared_sessions():
+    close_shared_sessions()
+    yield
+    close_shared_sessions()
+
+
+def test_integrations_share_one_session_by_default(jira_module, qtest_module):
+    jira = jira_module.JiraXrayIntegration("http://jira", "user", "token", "BANK")
+    qtest = qtest_module.QTestIntegration("http://qtest/api/v3", "token", "1")
+    session = get_shared_session()
+
+    assert jira.session is qtest.session is session
+    assert jira.uploader.session is qtest.uploader.session is session
+    # Another pool or retry configuration gets a session of its own
+    assert get_shared_session(max_retries=0) is not session
+    assert get_shared_session(max_retries=0) is get_shared_session(max_retries=0)
+
+
+def test_a_passed_session_is_used_as_is(jira_module, qtest_module):
+    session = create_session()
+    jira = jira_module.JiraXrayIntegration(
+        "http://jira", "user", "token", "BANK", session=session
+    )
+    qtest = qtest_module.QTestIntegration(
+        "http://qtest/api/v3", "token", "1", session=session
+    )
+
+    assert jira.session is qtest.session is session
+    assert http_session._sessions == {}
+    session.close()
+
+
+def test_clients_reuse_the_shared_connection(
+    jira_module, qtest_module, mock_server, results_factory
+):
+    results = results_factory(10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(2):
+            qtest = qtest_module.QTestIntegration(
+                f"{mock_server.url}/api/v3", "token", "1"
+            )
+            assert qtest.publish_results(results, "Cycle")
+            jira = jira_module.JiraXrayIntegration(
+                mock_server.url, "user", "token", "BANK"
+            )
+            jira.process_results(results, "42")
+
+    adapter = get_shared_session().get_adapter(mock_server.url)
+    pool = adapter.poolmanager.connection_from_url(mock_server.url)
+    # Every request of all four clients went over one keep-alive connection
+    assert pool.num_requests > 40
+    assert pool.num_connections == 1
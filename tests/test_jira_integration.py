@@ -0,0 +1,242 @@
+"""
+JiraXrayIntegration and its asyncio variant against the mock tracker server
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+
+import pytest
+from async_http import AsyncHttpClient
+from defect_index import DefectIndex
+from http_session import create_session
+from publish_checkpoint import PublishCheckpoint
+from results_stream import load_results
+
+
+def publish(jira_module, server, results, max_retries=2, **options):
+    """Publish results with a fresh sync client, return (success, output)"""
+    session = create_session(max_retries=max_retries)
+    jira = jira_module.JiraXrayIntegration(
+        server.url, "user", "token", "BANK", session=session, **options
+    )
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = jira.process_results(results, "42")
+    session.close()
+    return success, output.getvalue()
+
+
+def publish_async(jira_module, server, results, max_retries=2, **options):
+    """publish() with AsyncJiraXrayIntegration"""
+
+    async def run():
+        async with AsyncHttpClient(max_retries=max_retries) as client:
+            jira = jira_module.AsyncJiraXrayIntegration(
+                server.url, "user", "token", "BANK", client, **options
+            )
+            return await jira.process_results(results, "42")
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = asyncio.run(run())
+    return success, output.getvalue()
+
+
+@pytest.fixture(params=["sync", "async"])
+def publisher(request, jira_module):
+    run = publish if request.param == "sync" else publish_async
+    return lambda *args, **options: run(jira_module, *args, **options)
+
+
+@pytest.fixture
+def slow_server(benchmark_publish):
+    """A mock server slow enough for concurrent requests to overlap"""
+    server = benchmark_publish.mock_module.MockTrackerServer(latency_ms=20, seed=1)
+    with server:
+        yield server
+
+
+def test_concurrent_failures_with_one_fingerprint_file_one_defect(
+    publisher, slow_server, results_factory, tmp_path
+):
+    results = results_factory(1)
+    failure = dict(results["test_results"][0], status="Failed", error_message="Timeout")
+    # Data-driven runs of one test, all failing the same way
+    results.update(total=8, failed=8, passed=0, skipped=0, blocked=0)
+    results["test_results"] = [dict(failure) for _ in range(8)]
+
+    publisher(
+        slow_server,
+        results,
+        max_workers=4,
+        defect_index=DefectIndex(str(tmp_path / "defects.json")),
+    )
+
+    summary = slow_server.trackers.summary()
+    assert summary["issues"].get("Bug") == 1
+    assert summary["comments"] == 7
+
+
+def test_unreadable_record_stops_publishing_and_keeps_the_checkpoint(
+    publisher, mock_server, results_factory, tmp_path
+):
+    results = results_factory(10)
+    tests = results.pop("test_results")
+    for test in tests:
+        test["status"] = "Failed"
+    results_file = tmp_path / "results.ndjson"
+    (tmp_path / "results.summary.json").write_text(json.dumps(results))
+    lines = [json.dumps(test) for test in tests]
+    lines[6] = lines[6][:20]
+    results_file.write_text("\n".join(lines) + "\n")
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+
+    success, output = publisher(
+        mock_server,
+        load_results(str(results_file)),
+        max_workers=3,
+        checkpoint=PublishCheckpoint(str(checkpoint_file), "build-42"),
+    )
+
+    assert not success
+    assert "results.ndjson:7:" in output
+    checkpoint = PublishCheckpoint(str(checkpoint_file), "build-42")
+    defects = [key for op, key in checkpoint.state if op == "defect"]
+    checkpoint.close()
+    assert len(defects) == 6
+    assert mock_server.trackers.summary()["issues"]["Bug"] == 6
+
+
+def reject_tests(trackers, names):
+    """Answer 400 to defects and status updates for the named tests"""
+    create_issue, update_status = trackers.create_issue, trackers.update_status
+
+    def guarded_create_issue(params, query, body, headers):
+        summary = json.loads(body)["fields"]["summary"]
+        if any(name in summary for name in names):
+            return 400, {"errorMessages": ["Rejected"]}, []
+        return create_issue(params, query, body, headers)
+
+    def guarded_update_status(params, query, body, headers):
+        if json.loads(body)["testKey"] in names:
+            return 400, {"errorMessages": ["Rejected"]}, []
+        return update_status(params, query, body, headers)
+
+    replacements = {
+        create_issue: guarded_create_issue,
+        update_status: guarded_update_status,
+    }
+    trackers.routes = [
+        (method, pattern, replacements.get(handler, handler))
+        for method, pattern, handler in trackers.routes
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [10, 45])
+def test_bulk_import_sends_statuses_in_chunks(
+    publisher, mock_server, results_factory, chunk_size
+):
+    results = results_factory(45)
+
+    success, output = publisher(
+        mock_server, results, bulk=True, bulk_chunk_size=chunk_size
+    )
+
+    assert success
+    summary = mock_server.trackers.summary()
+    assert summary["requests"]["import_execution"] == -(-45 // chunk_size)
+    assert "update_status" not in summary["requests"]
+    assert summary["xray_statuses"] == 45
+    assert summary["issues"]["Bug"] == results["failed"]
+
+
+def test_throttled_requests_are_retried_after_retry_after(
+    publisher, benchmark_publish, results_factory
+):
+    results = results_factory(30)
+    server = benchmark_publish.mock_module.MockTrackerServer(
+        throttle_rate=0.2, retry_after=0.01, seed=1
+    )
+
+    with server:
+        success, output = publisher(server, results, max_retries=8, max_workers=4)
+
+    assert success
+    summary = server.trackers.summary()
+    assert summary["responses"]["429"] > 0
+    assert summary["xray_statuses"] == results["passed"] + results["failed"]
+    assert summary["issues"]["Bug"] == results["failed"]
+
+
+def test_resume_after_a_torn_checkpoint_line_files_each_defect_once(
+    publisher, mock_server, results_factory, tmp_path
+):
+    results = results_factory(30)
+    tests = results["test_results"]
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    trackers = mock_server.trackers
+    routes = trackers.routes
+
+    def run(rejected):
+        trackers.routes = routes
+        reject_tests(
+            trackers,
+            {t[field] for t in rejected for field in ("name", "xray_test_key")},
+        )
+        checkpoint = PublishCheckpoint(str(checkpoint_file), "build-42")
+        publisher(mock_server, results, max_workers=3, checkpoint=checkpoint)
+        return checkpoint_file.exists()
+
+    # Interrupted twice, the first time mid-way through writing an entry
+    assert run(tests[10:])
+    with open(checkpoint_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "status", "ke')
+    assert run(tests[20:])
+    assert not run([])
+
+    summary = trackers.summary()
+    assert summary["issues"]["Bug"] == results["failed"]
+    assert summary["xray_statuses"] == results["passed"] + results["failed"]
+
+
+def end_state(trackers):
+    """What a publishing run left on the tracker, independent of key order"""
+    return {
+        "issues": sorted(
+            (issue["type"], issue["summary"]) for issue in trackers.issues.values()
+        ),
+        "statuses": {test: status for (_, test), status in trackers.statuses.items()},
+        "comments": sum(trackers.comments.values()),
+        "attachments": sum(trackers.attachments.values()),
+    }
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_async_client_leaves_the_same_end_state_as_sync(
+    jira_module, mock_server, results_factory, tmp_path, bulk
+):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 250)
+    results = results_factory(60, screenshot=str(screenshot))
+    states = []
+
+    for run in (publish, publish_async):
+        mock_server.trackers.reset()
+        # Publishing again comments on the defects the first run filed
+        index = DefectIndex(str(tmp_path / f"{run.__name__}.json"))
+        for _ in range(2):
+            assert run(
+                jira_module,
+                mock_server,
+                results,
+                bulk=bulk,
+                max_workers=4,
+                defect_index=index,
+            )[0]
+        states.append(end_state(mock_server.trackers))
+
+    assert states[0] == states[1]
+    assert states[0]["comments"] == results["failed"]
+    assert states[0]["attachments"] == results["failed"]
@@ -0,0 +1,107 @@
+"""
+Ordered thread pool and asyncio execution with in-order console output
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from ordered_executor import gather_ordered, run_ordered
+
+
+def test_run_ordered_keeps_results_and_output_in_order(capsys):
+    def work(n):
+        time.sleep(random.random() / 100)
+        print(f"item {n}")
+        return n * n
+
+    original = sys.stdout
+    assert list(run_ordered(work, range(20), max_workers=4)) == [
+        n * n for n in range(20)
+    ]
+    # The buffering proxy is only installed while the run lasts
+    assert sys.stdout is original
+    assert capsys.readouterr().out == "".join(f"item {n}\n" for n in range(20))
+
+
+def test_nested_runs_restore_stdout_once_all_finish(capsys):
+    def inner(n):
+        print(f"  inner {n}")
+        return n
+
+    def outer(n):
+        print(f"outer {n}")
+        return sum(run_ordered(inner, range(3), max_workers=2))
+
+    original = sys.stdout
+    assert list(run_ordered(outer, range(4), max_workers=3)) == [3] * 4
+    assert sys.stdout is original
+    expected = "".join(
+        f"outer {n}\n" + "".join(f"  inner {i}\n" for i in range(3)) for n in range(4)
+    )
+    assert capsys.readouterr().out == expected
+
+
+def test_errors_propagate_and_stdout_is_restored():
+    def work(n):
+        if n == 3:
+            raise ValueError("boom")
+        return n
+
+    original = sys.stdout
+    results = []
+    try:
+        for result in run_ordered(work, range(10), max_workers=4):
+            results.append(result)
+    except ValueError:
+        pass
+    assert results == [0, 1, 2]
+    assert sys.stdout is original
+
+
+def test_gather_ordered_restores_stdout(capsys):
+    async def work(n):
+        await asyncio.sleep(random.random() / 100)
+        print(f"task {n}")
+        return n
+
+    async def collect():
+        return [result async for result in gather_ordered(work, range(10), 4)]
+
+    original = sys.stdout
+    assert asyncio.run(collect()) == list(range(10))
+    assert sys.stdout is original
+    assert capsys.readouterr().out == "".join(f"task {n}\n" for n in range(10))
+
+
+def failing_source(count):
+    yield from range(count)
+    raise ValueError("bad record")
+
+
+def test_source_error_is_raised_after_queued_calls_finish():
+    results = []
+    try:
+        for result in run_ordered(lambda n: n, failing_source(5), max_workers=4):
+            results.append(result)
+    except ValueError as e:
+        assert str(e) == "bad record"
+    assert results == list(range(5))
+
+
+def test_gather_ordered_finishes_started_calls_before_a_source_error():
+    async def work(n):
+        await asyncio.sleep(0.01)
+        return n
+
+    async def run():
+        results = []
+        try:
+            async for result in gather_ordered(work, failing_source(5), 4):
+                results.append(result)
+        except ValueError as e:
+            assert str(e) == "bad record"
+        return results
+
+    assert asyncio.run(run()) == list(range(5))
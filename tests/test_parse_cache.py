@@ -0,0 +1,100 @@
+"""
+ParseCache reuse and invalidation of per-file parse results
+"""
+
+import contextlib
+import io
+import os
+import re
+
+import pytest
+
+EXECUTION_DATE = re.compile(rb'"execution_date": "[^"]*"')
+
+
+@pytest.fixture
+def results_dir(tmp_path, generator_module):
+    results_dir = tmp_path / "res"
+    generator_module.write_synthetic_results(results_dir, 40, files=2)
+    return results_dir
+
+
+def cached_run(parser_module, results_dir, cache_dir, output_file=None):
+    """Parse with the cache and return the parser, optionally saving results"""
+    parser = parser_module.ToscaResultsParser(results_dir, cache_dir=str(cache_dir))
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records()
+        if output_file is not None:
+            parser.save_results(str(output_file))
+    return parser
+
+
+def test_unchanged_files_are_served_from_the_cache(
+    parser_module, results_dir, tmp_path
+):
+    cold = cached_run(parser_module, results_dir, tmp_path / "cache")
+    warm = cached_run(parser_module, results_dir, tmp_path / "cache")
+
+    assert (cold.cache.hits, cold.cache.misses) == (0, 2)
+    assert (warm.cache.hits, warm.cache.misses) == (2, 0)
+    assert warm.records == cold.records
+
+
+def test_cold_and_warm_runs_save_identical_results(
+    parser_module, results_dir, tmp_path
+):
+    outputs = []
+    for run in ("cold", "warm"):
+        output_file = tmp_path / f"{run}.json"
+        cached_run(parser_module, results_dir, tmp_path / "cache", output_file)
+        outputs.append(EXECUTION_DATE.sub(b"", output_file.read_bytes()))
+
+    assert outputs[0] == outputs[1]
+
+
+def test_a_file_that_changed_size_is_parsed_again(
+    parser_module, generator_module, results_dir, tmp_path
+):
+    cached_run(parser_module, results_dir, tmp_path / "cache")
+    changed = sorted(results_dir.glob("*.xml"))[0]
+    generator_module.write_synthetic_export(changed, 5, seed=7)
+
+    parser = cached_run(parser_module, results_dir, tmp_path / "cache")
+
+    assert (parser.cache.hits, parser.cache.misses) == (1, 1)
+    assert parser.summary["total"] == 25
+
+
+def test_a_touched_file_is_checked_by_content(parser_module, results_dir, tmp_path):
+    cached_run(parser_module, results_dir, tmp_path / "cache")
+    touched, edited = sorted(results_dir.glob("*.xml"))
+    for xml_file in (touched, edited):
+        stat = xml_file.stat()
+        os.utime(xml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    # Same size and a new mtime, but different content
+    content = edited.read_bytes()
+    edited.write_bytes(re.sub(rb'Name="[^"]', b'Name="~', content, count=1))
+    os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert len(edited.read_bytes()) == len(content)
+
+    parser = cached_run(parser_module, results_dir, tmp_path / "cache")
+    assert (parser.cache.hits, parser.cache.misses) == (1, 1)
+    assert any(test.name.startswith("~") for test in parser.records)
+
+    # The hash matched for the touched file, so its new mtime is recorded
+    again = cached_run(parser_module, results_dir, tmp_path / "cache")
+    assert again.cache._read_entry(touched)["mtime_ns"] == touched.stat().st_mtime_ns
+    assert (again.cache.hits, again.cache.misses) == (2, 0)
+
+
+def test_bumping_the_parser_version_invalidates_entries(
+    parser_module, results_dir, tmp_path, monkeypatch
+):
+    cached_run(parser_module, results_dir, tmp_path / "cache")
+    monkeypatch.setattr(parser_module, "PARSER_VERSION", "2")
+
+    parser = cached_run(parser_module, results_dir, tmp_path / "cache")
+    assert (parser.cache.hits, parser.cache.misses) == (0, 2)
+
+    again = cached_run(parser_module, results_dir, tmp_path / "cache")
+    assert (again.cache.hits, again.cache.misses) == (2, 0)
@@ -0,0 +1,206 @@
+"""
+ToscaResultsParser results document and record types
+"""
+
+import contextlib
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def parse(parser_module, results_dir, **options):
+    parser = parser_module.ToscaResultsParser(results_dir, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = parser.parse_xml_results()
+    return parser, results
+
+
+def test_results_hold_plain_dicts(parser_module, generator_module, tmp_path):
+    generator_module.write_synthetic_results(tmp_path / "res", 50)
+    parser, results = parse(parser_module, tmp_path / "res")
+
+    assert results["total"] == 50
+    assert all(type(test) is dict for test in results["test_results"])
+    # Downstream consumers copy and serialise the records as they are
+    first = results["test_results"][0]
+    assert dict(first) == first.copy() == parser.records[0].to_dict()
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_saved_json_matches_results(parser_module, generator_module, tmp_path):
+    generator_module.write_synthetic_results(tmp_path / "res", 50, files=2)
+    parser, results = parse(parser_module, tmp_path / "res")
+    output_file = tmp_path / "results.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.save_results(str(output_file))
+
+    assert json.loads(output_file.read_text()) == results
+
+
+def test_record_sink_keeps_only_the_summary(parser_module, generator_module, tmp_path):
+    generator_module.write_synthetic_results(tmp_path / "res", 20)
+    parser = parser_module.ToscaResultsParser(tmp_path / "res")
+    received = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records(record_sink=received.append)
+
+    assert len(received) == parser.summary["total"] == 20
+    assert parser.records == []
+    assert parser.results["test_results"] == []
+
+
+def test_streaming_sink_gets_records_while_the_file_is_parsed(
+    parser_module, generator_module, tmp_path
+):
+    generator_module.write_synthetic_results(tmp_path / "res", 5)
+    parser = parser_module.ToscaResultsParser(tmp_path / "res", streaming=True)
+    log = []
+    iterparse = parser.backend.iterparse
+
+    def logged_iterparse(xml_file):
+        for event, elem in iterparse(xml_file):
+            if event == "end" and elem.tag == "TestCase":
+                log.append(("parsed", elem.get("Name")))
+            yield event, elem
+
+    parser.backend.iterparse = logged_iterparse
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records(record_sink=lambda test: log.append(("sink", test.name)))
+
+    names = [name for event, name in log if event == "parsed"]
+    assert len(names) == parser.summary["total"] == 5
+    # Each record reaches the sink before the next TestCase is read
+    assert log == [(event, name) for name in names for event in ("parsed", "sink")]
+
+
+def write_streamed(parser_module, results_dir, writer):
+    """Parse into a writer and close it with a summary that still carries
+    a "test_results" key, as the results document does"""
+    parser = parser_module.ToscaResultsParser(results_dir, streaming=True)
+    records = []
+
+    def sink(test):
+        records.append(test.to_dict())
+        writer.write(test)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records(record_sink=sink)
+    writer.close({**parser.summary, "test_results": ["stale"]})
+    return parser.summary, records
+
+
+def test_ndjson_writer_keeps_the_summary_in_a_sidecar(
+    parser_module, generator_module, tmp_path
+):
+    generator_module.write_synthetic_results(tmp_path / "res", 20, files=2)
+    writer = parser_module.NdjsonResultsWriter(str(tmp_path / "out" / "r.ndjson"))
+    summary, records = write_streamed(parser_module, tmp_path / "res", writer)
+
+    lines = writer.output_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == records
+    assert writer.summary_path == tmp_path / "out" / "r.summary.json"
+    # The leftover record list never reaches the sidecar
+    assert json.loads(writer.summary_path.read_text()) == summary
+    assert summary["total"] == 20
+
+
+def test_json_writer_puts_the_summary_after_the_records(
+    parser_module, generator_module, tmp_path
+):
+    generator_module.write_synthetic_results(tmp_path / "res", 20, files=2)
+    output_file = tmp_path / "out" / "results.json"
+    writer = parser_module.JsonResultsWriter(str(output_file), "2024-01-01T00:00:00")
+    summary, records = write_streamed(parser_module, tmp_path / "res", writer)
+
+    text = output_file.read_text(encoding="utf-8")
+    lines = text.splitlines()
+    # Header, one record per line, then the summary counters
+    assert lines[0] == '{"execution_date": "2024-01-01T00:00:00",'
+    assert lines[1] == '"test_results": ['
+    assert [json.loads(line.rstrip(",")) for line in lines[2:22]] == records
+    assert lines[22] == "]," and lines[-1].endswith("}")
+    assert text.count('"test_results"') == 1
+
+    document = json.loads(text)
+    assert document == {
+        **summary,
+        "execution_date": "2024-01-01T00:00:00",
+        "test_results": records,
+    }
+    assert list(document)[:2] == ["execution_date", "test_results"]
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "feather"])
+def test_columnar_output_has_typed_columns(
+    parser_module, generator_module, tmp_path, output_format
+):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    generator_module.write_synthetic_results(tmp_path / "res", 20)
+    parser, _ = parse(parser_module, tmp_path / "res")
+    output_file = tmp_path / f"results.{output_format}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.save_results(str(output_file), output_format)
+
+    frame = getattr(pd, f"read_{output_format}")(output_file)
+    assert list(frame.columns) == [
+        "execution_date",
+        *parser_module.TestResult.__slots__,
+    ]
+    assert len(frame) == 20
+    for field in parser_module.CATEGORICAL_FIELDS:
+        assert isinstance(frame[field].dtype, pd.CategoricalDtype)
+    assert frame["duration"].dtype == "int64"
+    assert pd.api.types.is_numeric_dtype(frame["execution_time"])
+    for field in ("execution_date", "start_time", "end_time"):
+        assert pd.api.types.is_datetime64_any_dtype(frame[field])
+    assert str(frame["start_time"].dt.tz) == "UTC"
+    assert list(frame["name"]) == [test.name for test in parser.records]
+
+    summary_file = parser_module.summary_path_for(output_file)
+    assert json.loads(summary_file.read_text()) == parser.summary
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "feather"])
+def test_columnar_output_without_pyarrow_says_so(
+    parser_module, generator_module, tmp_path, monkeypatch, output_format
+):
+    pytest.importorskip("pandas")
+    generator_module.write_synthetic_results(tmp_path / "res", 5)
+    parser, _ = parse(parser_module, tmp_path / "res")
+    # A None entry makes the import fail as if the package were missing
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "fastparquet", None)
+    output_file = tmp_path / f"results.{output_format}"
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        parser.save_results(str(output_file), output_format)
+
+    assert f"❌ Cannot write {output_format}:" in output.getvalue()
+    assert "pyarrow" in output.getvalue()
+    assert not output_file.exists()
+    assert not parser_module.summary_path_for(output_file).exists()
+
+
+def test_json_output_does_not_import_pandas(parser_module, generator_module, tmp_path):
+    generator_module.write_synthetic_results(tmp_path / "res", 5)
+    script = parser_module.__file__
+    check = (
+        "import runpy, sys\n"
+        f"sys.argv = ['parse-results.py', '--results-dir', {str(tmp_path / 'res')!r},"
+        f" '--output-file', {str(tmp_path / 'results.json')!r}]\n"
+        "try:\n"
+        f"    runpy.run_path({str(script)!r}, run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+
+    assert completed.stdout.splitlines()[-1] == "False"
+    assert json.loads((tmp_path / "results.json").read_text())["total"] == 5
@@ -0,0 +1,192 @@
+"""
+Parity of the XML parser backends: stdlib and lxml, DOM and streaming, must
+save byte-identical results
+"""
+
+import contextlib
+import io
+import re
+
+import pytest
+
+EXECUTION_DATE = re.compile(rb'"execution_date": "[^"]*"')
+
+
+def saved_results(parser_module, results_dir, tmp_path, backend, streaming, workers=1):
+    """save_results output for a results directory, minus the run timestamp"""
+    parser = parser_module.ToscaResultsParser(
+        results_dir, streaming=streaming, backend=backend, workers=workers
+    )
+    output_file = tmp_path / f"{backend}-{streaming}-{workers}.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_xml_results()
+        parser.save_results(str(output_file))
+    return EXECUTION_DATE.sub(b'"execution_date": ""', output_file.read_bytes())
+
+
+@pytest.fixture(params=["stdlib", "lxml"])
+def backend(request, parser_module):
+    if request.param == "lxml" and parser_module.lxml_etree is None:
+        pytest.skip("lxml is not installed")
+    return request.param
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path, benchmark_parser):
+    """The benchmark's edge-case exports: nested and root TestCases, comments,
+    entities, CDATA, nested custom fields and a truncated file"""
+    fixtures_dir = tmp_path / "fixtures"
+    fixtures_dir.mkdir()
+    for name, content in benchmark_parser.PARITY_FIXTURES.items():
+        (fixtures_dir / name).write_text(content, encoding="utf-8")
+    return fixtures_dir
+
+
+@pytest.fixture
+def synthetic_dir(tmp_path, generator_module):
+    """Exports with nested step folders, extra custom fields and failures"""
+    synthetic_dir = tmp_path / "synthetic"
+    generator_module.write_synthetic_results(
+        synthetic_dir,
+        300,
+        files=2,
+        depth=4,
+        custom_fields=6,
+        screenshots=2,
+        error_size=300,
+    )
+    return synthetic_dir
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["dom", "streaming"])
+def test_edge_cases_match_stdlib_dom(
+    parser_module, fixtures_dir, tmp_path, backend, streaming
+):
+    expected = saved_results(parser_module, fixtures_dir, tmp_path, "stdlib", False)
+    output = saved_results(parser_module, fixtures_dir, tmp_path, backend, streaming)
+
+    assert output == expected
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["dom", "streaming"])
+def test_synthetic_exports_match_stdlib_dom(
+    parser_module, synthetic_dir, tmp_path, backend, streaming
+):
+    expected = saved_results(parser_module, synthetic_dir, tmp_path, "stdlib", False)
+    output = saved_results(parser_module, synthetic_dir, tmp_path, backend, streaming)
+
+    assert output == expected
+
+
+def test_nested_test_cases_and_custom_fields(parser_module, fixtures_dir, backend):
+    parser = parser_module.ToscaResultsParser(fixtures_dir, backend=backend)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = parser.parse_xml_results()
+
+    tests = {test["name"]: test for test in results["test_results"]}
+    # Nested TestCases are records of their own, in document order
+    names = [test["name"] for test in results["test_results"]]
+    assert names.index("Outer") + 1 == names.index("Inner")
+    assert tests["Outer"]["status"] == "Failed"
+    assert tests["Outer"]["error_message"] == "outer failed"
+    assert tests["Inner"]["status"] == "Passed"
+    # The first JIRA_Test_Key field under CustomFields wins, however deep
+    assert tests["Verification"]["xray_test_key"] == "BANK-7"
+    assert tests["Entities & ünicode"]["xray_test_key"] == ""
+    assert tests["Entities & ünicode"]["error_message"] == "<b>raw</b> & markup"
+    assert tests["Commented"]["screenshots"] == ["a.png"]
+
+
+@pytest.fixture
+def external_entity_dir(tmp_path, benchmark_parser):
+    """An export whose error message references a file through an entity"""
+    secret = tmp_path / "secret.txt"
+    secret.write_text("SECRET", encoding="utf-8")
+    entity_dir = tmp_path / "entity"
+    entity_dir.mkdir()
+    (entity_dir / "nested.xml").write_text(
+        benchmark_parser.PARITY_FIXTURES["nested.xml"], encoding="utf-8"
+    )
+    (entity_dir / "entity.xml").write_text(
+        f"""<?xml version="1.0"?>
+<!DOCTYPE ExecutionResults [<!ENTITY x SYSTEM "{secret.as_uri()}">]>
+<ExecutionResults>
+  <TestCase Name="Leak"><Result Status="Failed"/><ErrorMessage>&x;</ErrorMessage>
+  </TestCase>
+</ExecutionResults>""",
+        encoding="utf-8",
+    )
+    return entity_dir
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["dom", "streaming"])
+def test_files_with_external_entities_are_skipped(
+    parser_module, external_entity_dir, tmp_path, backend, streaming
+):
+    expected = saved_results(
+        parser_module, external_entity_dir, tmp_path, "stdlib", False
+    )
+    output = saved_results(
+        parser_module, external_entity_dir, tmp_path, backend, streaming
+    )
+
+    assert output == expected
+    assert b"Leak" not in output
+    assert b"SECRET" not in output
+
+
+def test_pull_parser_rejects_external_entities(
+    parser_module, external_entity_dir, backend
+):
+    pull_parser = parser_module.get_backend(backend).pull_parser()
+
+    with pytest.raises(SyntaxError):
+        pull_parser.feed((external_entity_dir / "entity.xml").read_bytes())
+        list(pull_parser.read_events())
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["dom", "streaming"])
+def test_worker_processes_match_sequential_parsing(
+    parser_module, synthetic_dir, tmp_path, backend, streaming
+):
+    expected = saved_results(parser_module, synthetic_dir, tmp_path, backend, False)
+    output = saved_results(
+        parser_module, synthetic_dir, tmp_path, backend, streaming, workers=2
+    )
+
+    assert output == expected
+
+
+def test_worker_processes_skip_files_they_cannot_read(
+    parser_module, synthetic_dir, tmp_path
+):
+    expected = saved_results(parser_module, synthetic_dir, tmp_path, "stdlib", False)
+    (synthetic_dir / "000-missing.xml").symlink_to(tmp_path / "does-not-exist.xml")
+    (synthetic_dir / "001-truncated.xml").write_text("<ExecutionResults><TestCase")
+
+    parser = parser_module.ToscaResultsParser(synthetic_dir, workers=4)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        parser.parse_records()
+
+    assert "Parsing across 4 worker process(es)" in output.getvalue()
+    assert "Error processing" in output.getvalue()
+    assert "000-missing.xml" in output.getvalue()
+    assert "Failed to parse" in output.getvalue()
+    assert "001-truncated.xml" in output.getvalue()
+    assert parser.summary["total"] == 300
+    output_file = tmp_path / "workers.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.save_results(str(output_file))
+    assert EXECUTION_DATE.sub(b'"execution_date": ""', output_file.read_bytes()) == (
+        expected
+    )
+
+
+def test_zero_workers_means_one_per_cpu_core(parser_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(parser_module.os, "cpu_count", lambda: 6)
+
+    assert parser_module.ToscaResultsParser(tmp_path, workers=0).workers == 6
+    assert parser_module.ToscaResultsParser(tmp_path, workers=1).workers == 1
+    with pytest.raises(ValueError, match="workers must be 0 or more"):
+        parser_module.ToscaResultsParser(tmp_path, workers=-1)
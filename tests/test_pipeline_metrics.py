@@ -0,0 +1,27 @@
+"""
+Profiling and metrics helpers
+"""
+
+import contextlib
+import io
+import pstats
+
+from ordered_executor import run_ordered
+from pipeline_metrics import profiled
+
+
+def busy_worker(n):
+    return sum(range(n * 1000))
+
+
+def test_profile_includes_worker_threads(tmp_path):
+    path = str(tmp_path / "publish.prof")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with profiled(path):
+            assert len(list(run_ordered(busy_worker, range(20), max_workers=4))) == 20
+
+    calls = {
+        function: stat[1] for (_, _, function), stat in pstats.Stats(path).stats.items()
+    }
+    assert calls.get("busy_worker") == 20
@@ -0,0 +1,59 @@
+"""
+Resuming from the publish checkpoint log
+"""
+
+from publish_checkpoint import PublishCheckpoint
+
+
+def crash(checkpoint, torn):
+    """Simulate a crash after writing part of one more line"""
+    checkpoint._file.write(torn)
+    checkpoint.close()
+
+
+def test_resume_keeps_entries_written_after_a_torn_line(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = PublishCheckpoint(path, "build-1")
+    checkpoint.record("defect", "a", "BANK-1")
+    crash(checkpoint, '{"op": "defect", "keys": ["b"], "val')
+
+    checkpoint = PublishCheckpoint(path, "build-1")
+    assert checkpoint.resumed == 1
+    checkpoint.record("defect", "c", "BANK-3")
+    crash(checkpoint, '{"op": "defect", "ke')
+
+    checkpoint = PublishCheckpoint(path, "build-1")
+    assert checkpoint.resumed == 2
+    assert checkpoint.get("defect", "a") == "BANK-1"
+    assert checkpoint.get("defect", "c") == "BANK-3"
+    assert not checkpoint.done("defect", "b")
+    checkpoint.close()
+
+
+def test_resume_skips_undecodable_lines(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        '{"scope": "build-1"}\n'
+        '{"op": "status", "keys": ["a"], "val{"op": "status"\n'
+        '{"op": "status", "keys": ["b"], "value": "PASSED"}'
+    )
+
+    checkpoint = PublishCheckpoint(str(path), "build-1")
+    checkpoint.record("status", "c", "FAILED")
+    checkpoint.close()
+
+    checkpoint = PublishCheckpoint(str(path), "build-1")
+    assert sorted(key for _, key in checkpoint.state) == ["b", "c"]
+    checkpoint.close()
+
+
+def test_log_for_another_scope_is_replaced(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = PublishCheckpoint(path, "build-1")
+    checkpoint.record("defect", "a", "BANK-1")
+    checkpoint.close()
+
+    checkpoint = PublishCheckpoint(path, "build-2")
+    assert checkpoint.resumed == 0
+    assert not checkpoint.done("defect", "a")
+    checkpoint.finish()
@@ -0,0 +1,110 @@
+"""
+QTestCaseIndex lookups and its paged refresh against the mock tracker server
+"""
+
+import asyncio
+import contextlib
+import io
+
+from async_http import AsyncHttpClient, request_errors
+from http_session import create_session
+from qtest_case_index import TEST_CASE_PAGE_SIZE, QTestCaseIndex
+
+CASES = [
+    {"id": 7001, "pid": "TC-1", "name": "Login works"},
+    {"id": 7002, "pid": "TC-2", "name": "Logout works"},
+    {"id": 100000, "pid": "TC-3", "name": "Transfer funds"},
+]
+
+
+def index_of(cases, path=None):
+    index = QTestCaseIndex(path)
+    index._replace(
+        "scope", [{"cases": [[c["id"], c["pid"], c["name"]] for c in cases]}]
+    )
+    return index
+
+
+def test_tosca_id_is_not_taken_for_a_qtest_id():
+    index = index_of(CASES)
+
+    # 100000 is also a qTest ID, but of another test case
+    test = {"test_case_id": "100000", "name": "Login works"}
+    assert index.resolve(test) == 7001
+
+
+def test_resolves_by_pid_then_name():
+    index = index_of(CASES)
+
+    assert index.resolve({"test_case_id": "tc-2", "name": "Login works"}) == 7002
+    assert index.resolve({"test_case_id": "", "name": " logout  WORKS"}) == 7002
+    assert index.resolve({"test_case_id": "TC-9", "name": "Unknown"}) is None
+
+
+def test_marked_qtest_ids_are_used_as_ids():
+    index = index_of(CASES)
+
+    assert index.resolve({"test_case_id": "qtest:100000", "name": "x"}) == 100000
+    assert index.resolve({"test_case_id": "qtest:5", "name": "Login works"}) is None
+    assert QTestCaseIndex(None).resolve({"test_case_id": "qtest:5"}) == "5"
+    assert QTestCaseIndex(None).resolve({"test_case_id": "100000"}) == "100000"
+
+
+def refresh(index, server):
+    session = create_session()
+    with contextlib.redirect_stdout(io.StringIO()):
+        refreshed = index.refresh(session, f"{server.url}/api/v3", {}, "1")
+    session.close()
+    return refreshed
+
+
+def refresh_async(index, server):
+    async def run():
+        async with AsyncHttpClient() as client:
+            return await index.refresh_async(
+                client, f"{server.url}/api/v3", {}, "1", request_errors()
+            )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(run())
+
+
+def test_sync_and_async_refresh_read_the_same_pages(mock_server, tmp_path):
+    count = TEST_CASE_PAGE_SIZE + 10
+    mock_server.trackers.add_test_cases(
+        [{"id": 1 + n, "pid": f"TC-{n}", "name": f"Case {n}"} for n in range(count)]
+    )
+    sync_index = QTestCaseIndex(str(tmp_path / "sync.json"))
+    async_index = QTestCaseIndex(str(tmp_path / "async.json"))
+
+    assert refresh(sync_index, mock_server)
+    assert refresh_async(async_index, mock_server)
+
+    assert len(sync_index) == len(async_index) == count
+    assert sync_index.pages == async_index.pages
+    assert async_index.resolve({"test_case_id": f"TC-{count - 1}"}) == count
+
+
+def test_unchanged_pages_are_revalidated_not_downloaded(mock_server, tmp_path):
+    mock_server.trackers.add_test_cases(
+        [{"id": 1 + n, "pid": f"TC-{n}", "name": f"Case {n}"} for n in range(20)]
+    )
+    path = str(tmp_path / "cases.json")
+    assert refresh(QTestCaseIndex(path), mock_server)
+    mock_server.trackers.responses.clear()
+
+    assert refresh_async(QTestCaseIndex(path), mock_server)
+
+    assert mock_server.trackers.summary()["responses"] == {"304": 1}
+
+
+def test_failed_refresh_keeps_the_saved_index(benchmark_publish, tmp_path):
+    path = str(tmp_path / "cases.json")
+    index_of(CASES, path).save()
+    server = benchmark_publish.mock_module.MockTrackerServer(error_rate=1.0, seed=1)
+
+    with server:
+        assert not refresh(QTestCaseIndex(path), server)
+        assert not refresh_async(QTestCaseIndex(path), server)
+
+    assert len(QTestCaseIndex(path)) == len(CASES)
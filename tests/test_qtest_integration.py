@@ -0,0 +1,225 @@
+"""
+QTestIntegration against the mock tracker server
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+
+import pytest
+from async_http import AsyncHttpClient
+from http_session import create_session
+from pipeline_metrics import REGISTRY
+
+
+def publish(qtest_module, server, results, **options):
+    """Publish results with a fresh sync client, return (success, output)"""
+    session = create_session(max_retries=2)
+    qtest = qtest_module.QTestIntegration(
+        f"{server.url}/api/v3", "token", "1", session=session, **options
+    )
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = qtest.publish_results(results, "Cycle")
+    session.close()
+    return success, output.getvalue()
+
+
+def publish_async(qtest_module, server, results, **options):
+    """publish() with AsyncQTestIntegration"""
+
+    async def run():
+        async with AsyncHttpClient(max_retries=2) as client:
+            qtest = qtest_module.AsyncQTestIntegration(
+                f"{server.url}/api/v3", "token", "1", client, **options
+            )
+            return await qtest.publish_results(results, "Cycle")
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = asyncio.run(run())
+    return success, output.getvalue()
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 3])
+def test_batch_links_the_same_test_cases_as_sequential(
+    qtest_module, mock_server, results_factory, max_in_flight
+):
+    results = results_factory(120)
+
+    assert publish(qtest_module, mock_server, results)[0]
+    sequential = dict(mock_server.trackers.linked_cases)
+    mock_server.trackers.reset()
+    assert publish(
+        qtest_module,
+        mock_server,
+        results,
+        batch=True,
+        batch_size=25,
+        max_in_flight=max_in_flight,
+    )[0]
+
+    assert mock_server.trackers.linked_cases == sequential
+    assert len(sequential) == 120
+
+
+def test_batch_reports_rejected_logs_like_sequential(
+    qtest_module, mock_server, results_factory
+):
+    results = results_factory(40)
+    # Only every other test case exists, so half the logs are rejected
+    mock_server.trackers.add_test_cases(
+        [{"id": test["test_case_id"]} for test in results["test_results"][::2]]
+    )
+
+    success, output = publish(
+        qtest_module, mock_server, results, batch=True, batch_size=15
+    )
+
+    assert not success
+    assert output.count("✅ Updated test run") == 20
+    for test in results["test_results"][1::2]:
+        assert f"⚠️ Failed to create test run for {test['name']}: " in output
+    assert "Successfully Updated: 20" in output
+    assert len(mock_server.trackers.test_logs) == 20
+
+
+def test_batch_job_without_id_is_reported(qtest_module, mock_server, results_factory):
+    results = results_factory(10)
+    trackers = mock_server.trackers
+
+    def submit_test_logs(*args):
+        return 201, {"state": "IN_WAITING"}, []
+
+    trackers.routes = [
+        (
+            (method, pattern, submit_test_logs)
+            if handler == trackers.submit_test_logs
+            else (method, pattern, handler)
+        )
+        for method, pattern, handler in trackers.routes
+    ]
+
+    success, output = publish(qtest_module, mock_server, results, batch=True)
+
+    assert not success
+    assert output.count("batch job response without an id") == 10
+
+
+def test_inlined_attachments_count_only_for_published_logs(
+    qtest_module, mock_server, results_factory, tmp_path
+):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 250)
+    results = results_factory(40, screenshot=str(screenshot))
+    failed = [t for t in results["test_results"] if t["status"] == "Failed"]
+    # Only the first failed test case exists, so the other logs are rejected
+    mock_server.trackers.add_test_cases([{"id": failed[0]["test_case_id"]}])
+    REGISTRY.reset()
+
+    publish(qtest_module, mock_server, results, batch=True, batch_size=15)
+
+    counters = REGISTRY.to_dict()["counters"]
+    assert counters["tracker_upload_bytes_total"] == [
+        {"labels": {"tracker": "qtest"}, "value": 1000}
+    ]
+    outcomes = {
+        sample["labels"]["outcome"]: sample["value"]
+        for sample in counters["tracker_attachments_total"]
+    }
+    assert outcomes == {"uploaded": 1, "failed": len(failed) - 1}
+
+
+def test_batch_logs_leave_out_screenshots_they_cannot_inline(
+    qtest_module, mock_server, results_factory, tmp_path, monkeypatch
+):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 250)
+    large = tmp_path / "large.png"
+    large.write_bytes(b"\x89PNG" * 250)
+    missing = tmp_path / "missing.png"
+    results = results_factory(30)
+    failed = [t for t in results["test_results"] if t["status"] == "Failed"]
+    for test in failed:
+        test["screenshots"] = [str(missing), str(screenshot), str(large)]
+    # Room for one of the two screenshots per log
+    monkeypatch.setattr(qtest_module, "MAX_INLINE_BYTES", 1500)
+    trackers = mock_server.trackers
+    batches = []
+
+    def submit_test_logs(params, query, body, headers):
+        batches.append(json.loads(body))
+        return trackers.submit_test_logs(params, query, body, headers)
+
+    trackers.routes = [
+        (
+            (method, pattern, submit_test_logs)
+            if handler == trackers.submit_test_logs
+            else (method, pattern, handler)
+        )
+        for method, pattern, handler in trackers.routes
+    ]
+    REGISTRY.reset()
+
+    success, output = publish(
+        qtest_module, mock_server, results, batch=True, batch_size=15
+    )
+
+    assert success
+    assert len(trackers.test_logs) == 30
+    inlined = [
+        attachment["name"]
+        for batch in batches
+        for test_log in batch["test_logs"]
+        for attachment in test_log.get("attachments", ())
+    ]
+    assert inlined == ["failure.png"] * len(failed)
+    assert output.count(f"⚠️ Failed to upload {missing}: ") == len(failed)
+    assert output.count(f"⚠️ Failed to upload {large}: ") == len(failed)
+    # Reported under the line of the test they belong to
+    first = output.index(f"] {failed[0]['name']}\n")
+    assert (
+        first
+        < output.index(f"Failed to upload {missing}")
+        < output.index(f"] {failed[1]['name']}\n")
+    )
+
+    counters = REGISTRY.to_dict()["counters"]
+    outcomes = {
+        sample["labels"]["outcome"]: sample["value"]
+        for sample in counters["tracker_attachments_total"]
+    }
+    assert outcomes == {"uploaded": len(failed), "failed": 2 * len(failed)}
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_async_client_leaves_the_same_end_state_as_sync(
+    qtest_module, mock_server, results_factory, tmp_path, batch
+):
+    screenshot = tmp_path / "failure.png"
+    screenshot.write_bytes(b"\x89PNG" * 250)
+    results = results_factory(60, screenshot=str(screenshot))
+    trackers = mock_server.trackers
+    states = []
+
+    for run in (publish, publish_async):
+        trackers.reset()
+        assert run(
+            qtest_module,
+            mock_server,
+            results,
+            batch=batch,
+            batch_size=25,
+            max_in_flight=3,
+        )[0]
+        states.append(
+            (
+                dict(trackers.linked_cases),
+                dict(trackers.test_logs),
+                sum(trackers.attachments.values()),
+            )
+        )
+
+    assert states[0] == states[1]
+    assert len(states[0][1]) == 60
@@ -0,0 +1,68 @@
+"""
+Retries of dropped connections in the request scheduler
+"""
+
+import socket
+import threading
+
+import pytest
+import requests
+
+from http_session import create_session
+
+
+@pytest.fixture
+def dropping_server():
+    """A server that reads each request and closes without answering"""
+    listener = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                received.append(conn.recv(65536))
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}", received
+    listener.close()
+    thread.join(timeout=5)
+
+
+def test_post_dropped_after_sending_is_not_resent(dropping_server):
+    url, received = dropping_server
+    session = create_session(max_retries=3)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.post(f"{url}/issue", json={"summary": "x"})
+
+    assert len(received) == 1
+    assert session.scheduler.retries == 0
+
+
+def test_get_dropped_after_sending_is_resent(dropping_server, monkeypatch):
+    url, received = dropping_server
+    session = create_session(max_retries=2)
+    monkeypatch.setattr(session.scheduler, "backoff", lambda attempt: 0)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(f"{url}/issue")
+
+    assert len(received) == 3
+    assert session.scheduler.retries == 2
+
+
+def test_post_refused_before_connecting_is_resent(monkeypatch):
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+    session = create_session(max_retries=2)
+    monkeypatch.setattr(session.scheduler, "backoff", lambda attempt: 0)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.post(f"http://127.0.0.1:{port}/issue", json={})
+
+    assert session.scheduler.retries == 2
@@ -0,0 +1,127 @@
+"""
+ResultsHistory ingest and the flaky-test and duration queries
+"""
+
+import contextlib
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def history(history_module, tmp_path):
+    history = history_module.ResultsHistory(str(tmp_path / "history.db"))
+    yield history
+    history.close()
+
+
+def record(name, status="Passed", duration=1, module="Payments"):
+    return {"name": name, "status": status, "duration": duration, "module": module}
+
+
+def ingest(history, build, tests):
+    summary = {
+        "total": len(tests),
+        "passed": sum(test["status"] == "Passed" for test in tests),
+        "failed": sum(test["status"] == "Failed" for test in tests),
+    }
+    history.ingest(summary, tests, build, f"2024-01-{int(build):02d}T00:00:00")
+
+
+def counts(history):
+    query = "SELECT (SELECT COUNT(*) FROM builds), (SELECT COUNT(*) FROM test_results)"
+    return tuple(history.conn.execute(query).fetchone())
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_ingest_reads_parsed_results_files(
+    history_module, parser_module, generator_module, history, tmp_path, output_format
+):
+    generator_module.write_synthetic_results(tmp_path / "res", 30)
+    parser = parser_module.ToscaResultsParser(tmp_path / "res")
+    results_file = str(tmp_path / f"results.{output_format}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_records()
+        parser.save_results(results_file, output_format)
+        history_module.ingest_results_file(history, results_file, "41")
+
+    build = history.conn.execute("SELECT * FROM builds").fetchone()
+    assert build["build"] == "41"
+    assert build["executed_at"] == parser.summary["execution_date"]
+    assert (build["total"], build["passed"], build["failed"]) == (
+        parser.summary["total"],
+        parser.summary["passed"],
+        parser.summary["failed"],
+    )
+    stored = history.conn.execute(
+        "SELECT name, status FROM test_results ORDER BY rowid"
+    ).fetchall()
+    assert [tuple(row) for row in stored] == [
+        (test.name, test.status) for test in parser.records
+    ]
+
+
+def test_reingesting_a_build_replaces_it(history):
+    ingest(history, "1", [record("A"), record("B", "Failed")])
+    first = counts(history)
+    ingest(history, "1", [record("A"), record("B", "Failed")])
+
+    assert counts(history) == first == (1, 2)
+    ingest(history, "1", [record("A")])
+    assert counts(history) == (1, 1)
+    assert history.failure_rates() == []
+
+
+def test_unreadable_record_stores_nothing(history_module, history, tmp_path):
+    results_file = tmp_path / "results.ndjson"
+    results_file.write_text(json.dumps(record("A")) + "\n{not json\n")
+    (tmp_path / "results.summary.json").write_text('{"total": 2}')
+
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(SystemExit):
+        history_module.ingest_results_file(history, str(results_file), "1")
+    assert counts(history) == (0, 0)
+
+
+def test_failure_rates_flag_tests_that_also_passed(history):
+    ingest(history, "1", [record("Flaky", "Failed"), record("Old", "Failed")])
+    for build in ("2", "3", "4"):
+        ingest(history, build, [record("Flaky"), record("Broken", "Failed")])
+    ingest(history, "5", [record("Flaky", "Failed"), record("Broken", "Failed")])
+
+    rows = {row["test_key"]: row for row in history.failure_rates(last_builds=4)}
+
+    # Build 1 is outside the window, so "Old" has no failures in it
+    assert set(rows) == {"Flaky", "Broken"}
+    assert rows["Broken"]["failure_rate"] == 100.0
+    assert rows["Broken"]["flaky"] is False
+    assert (rows["Flaky"]["runs"], rows["Flaky"]["failures"]) == (4, 1)
+    assert rows["Flaky"]["failure_rate"] == 25.0
+    assert rows["Flaky"]["flaky"] is True
+    assert [row["test_key"] for row in history.failure_rates(last_builds=4)] == [
+        "Broken",
+        "Flaky",
+    ]
+
+
+def test_duration_percentiles_use_the_nearest_rank(history):
+    ingest(
+        history,
+        "1",
+        [record(f"Pay {n}", duration=n) for n in range(1, 11)]
+        + [record(f"Login {n}", duration=n * 100, module="Login") for n in (1, 2)],
+    )
+    ingest(history, "2", [record("Pay 11", duration=1000)])
+
+    assert history.duration_percentiles(0.95, last_builds=1) == [
+        {"module": "Payments", "runs": 1, "duration": 1000}
+    ]
+    assert history.duration_percentiles(0.5, last_builds=2) == [
+        {"module": "Login", "runs": 2, "duration": 100},
+        {"module": "Payments", "runs": 11, "duration": 6},
+    ]
+    assert history.duration_percentiles(0.9, last_builds=2)[1] == {
+        "module": "Payments",
+        "runs": 11,
+        "duration": 10,
+    }
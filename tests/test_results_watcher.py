@@ -0,0 +1,81 @@
+"""
+ResultsWatcher following result files while they are written
+"""
+
+import contextlib
+import io
+
+import pytest
+
+
+@pytest.fixture
+def export(generator_module, tmp_path):
+    """Bytes of a finished export with 200 test cases"""
+    source = generator_module.write_synthetic_results(tmp_path / "source", 200)[0]
+    return source.name, source.read_bytes()
+
+
+def watch(parser_module, results_dir, backend):
+    parser = parser_module.ToscaResultsParser(results_dir, backend=backend)
+    return parser, parser_module.ResultsWatcher(parser)
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "lxml"])
+def test_file_written_in_pieces_is_converted_once(
+    parser_module, export, tmp_path, backend, monkeypatch
+):
+    if backend == "lxml" and parser_module.lxml_etree is None:
+        pytest.skip("lxml is not installed")
+    name, content = export
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    parser, watcher = watch(parser_module, results_dir, backend)
+    converted = []
+    convert = parser._convert_test_cases
+
+    def counting_convert(elements):
+        tests = convert(elements)
+        converted.extend(tests)
+        return tests
+
+    monkeypatch.setattr(parser, "_convert_test_cases", counting_convert)
+
+    names = []
+    with open(results_dir / name, "wb") as f:
+        for start in range(0, len(content), 997):
+            f.write(content[start : start + 997])
+            f.flush()
+            names.extend(test.name for test in watcher.poll())
+            if start + 997 < len(content):
+                assert watcher.incomplete_files() == [results_dir / name]
+
+    expected = [test["name"] for test in parse_all(parser_module, results_dir)]
+    assert names == expected
+    assert len(converted) == len(expected) == 200
+    assert watcher.incomplete_files() == []
+    assert parser.summary["total"] == 200
+
+
+def test_replaced_file_skips_records_already_taken(parser_module, export, tmp_path):
+    name, content = export
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    path = results_dir / name
+    parser, watcher = watch(parser_module, results_dir, "stdlib")
+
+    path.write_bytes(content[: len(content) // 2])
+    first = watcher.poll()
+    path.write_bytes(content[: len(content) // 3])
+    assert watcher.poll() == []
+    path.write_bytes(content)
+    rest = watcher.poll()
+
+    assert [test.name for test in first + rest] == [
+        test["name"] for test in parse_all(parser_module, results_dir)
+    ]
+
+
+def parse_all(parser_module, results_dir):
+    parser = parser_module.ToscaResultsParser(results_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser.parse_xml_results()["test_results"]